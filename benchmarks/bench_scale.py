@@ -0,0 +1,151 @@
+"""Benchmarks for Firefly with a beamline's worth of devices.
+
+A simulated IOC (``iocs/scale_ioc.py``) publishes many motors, ion
+chambers and cameras, all updating at a steady rate. The matching
+Firefly windows are opened (offscreen with ``QT_QPA_PLATFORM=offscreen``)
+and, while the updates keep coming, we record:
+
+- how late the GUI event loop runs (max and 95th percentile lag),
+- CPU use (fraction of one core) and resident memory (MB),
+- how long a single PV change takes to be painted on screen.
+
+The size of the simulated beamline is controlled by the environment
+variables described in ``iocs/scale_ioc.py``, and the length of each
+measurement by ``FIREFLY_SCALE_DURATION`` (seconds, default 5).
+
+"""
+import os
+import statistics
+from pathlib import Path
+
+import pytest
+from epics import caput
+import haven
+from haven.simulated_ioc import simulated_ioc
+from haven.instrument import motor
+
+from firefly.main_window import FireflyMainWindow
+from firefly.application import ui_dir
+from firefly.profiling import EventLoopMonitor, RepaintProbe, ResourceSampler
+
+
+ioc_file = Path(__file__).parent / "iocs" / "scale_ioc.py"
+
+scale_defaults = {
+    "FIREFLY_SCALE_MOTORS": "200",
+    "FIREFLY_SCALE_ION_CHAMBERS": "16",
+    "FIREFLY_SCALE_CAMERAS": "8",
+    "FIREFLY_SCALE_RATE": "10",
+}
+
+measure_time = float(os.environ.get("FIREFLY_SCALE_DURATION", 5))
+
+
+def scale(name: str) -> int:
+    return int(os.environ[f"FIREFLY_SCALE_{name}"])
+
+
+@pytest.fixture(scope="session")
+def ioc_scale():
+    # The IOC reads its size from the environment
+    for key, val in scale_defaults.items():
+        os.environ.setdefault(key, val)
+    with simulated_ioc(fp=ioc_file) as pvdb:
+        yield pvdb
+
+
+@pytest.fixture()
+def scale_devices(ioc_scale, sim_registry):
+    motor.load_ioc_motors(prefix="scale_ioc", num_motors=scale("MOTORS"))
+    for num in range(1, scale("ION_CHAMBERS") + 1):
+        sim_registry.register(haven.IonChamber(
+            prefix="scale_ioc:scaler1", ch_num=num, preamp_prefix=f"scale_ioc:preamp{num}",
+            name=f"IC{num}", labels={"ion_chambers"}))
+    for num in range(1, scale("CAMERAS") + 1):
+        sim_registry.register(haven.Camera(prefix=f"scale_ioc:cam{num}:",
+                                           name=f"Camera {num}", labels={"cameras"}))
+    return sim_registry
+
+
+def measure_load(name: str, benchmark_recorder, qtbot):
+    """Record event loop lag, CPU and memory while PVs keep updating."""
+    monitor = EventLoopMonitor()
+    sampler = ResourceSampler()
+    monitor.start()
+    sampler.start()
+    qtbot.wait(int(measure_time * 1000))
+    usage = sampler.stop()
+    monitor.stop()
+    benchmark_recorder.record(f"scale.{name}.loop_lag_max", monitor.max_lag)
+    benchmark_recorder.record(f"scale.{name}.loop_lag_p95", monitor.percentile(95))
+    benchmark_recorder.record(f"scale.{name}.cpu", usage["cpu"])
+    benchmark_recorder.record(f"scale.{name}.rss_mb", usage["rss"] / 1e6)
+
+
+def open_window(ffapp, display_file, name, qtbot, macros={}):
+    window = ffapp.show_window(FireflyMainWindow, ui_dir / display_file,
+                               name=f"scale_{name}", macros=macros,
+                               hide_on_close=False)
+    qtbot.waitExposed(window)
+    return window
+
+
+def close_window(ffapp, window, name, qtbot):
+    window.close()
+    qtbot.waitUntil(lambda: f"scale_{name}" not in ffapp.windows.keys())
+
+
+@pytest.mark.parametrize("name,display_file", [
+    ("status", "status.py"),
+    ("voltmeters", "voltmeters.py"),
+    ("cameras", "cameras.py"),
+])
+def test_window_under_load(name, display_file, benchmark_recorder, ffapp, scale_devices, qtbot):
+    """Open a window and measure how it copes with constant updates."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    with benchmark_recorder.timer(f"scale.{name}.open"):
+        window = open_window(ffapp, display_file, name, qtbot)
+    measure_load(name, benchmark_recorder, qtbot)
+    close_window(ffapp, window, name, qtbot)
+
+
+def test_motor_menus(benchmark_recorder, ffapp, scale_devices, qtbot):
+    """Time building the motor menus and searching for a motor."""
+    ffapp.setup_window_actions()
+    with benchmark_recorder.timer("scale.motors.refresh_menus"):
+        ffapp.refresh_device_menus()
+    with benchmark_recorder.timer("scale.motors.search"):
+        ffapp.motor_index.search("m1")
+    # A motor window, while all the others keep moving
+    name = "motor"
+    window = open_window(ffapp, "motor.py", name, qtbot,
+                         macros={"PREFIX": "scale_ioc:m2"})
+    measure_load(name, benchmark_recorder, qtbot)
+    close_window(ffapp, window, name, qtbot)
+
+
+def test_voltmeter_repaint_latency(benchmark_recorder, ffapp, scale_devices, qtbot):
+    """Time from changing a voltage PV to painting the new current."""
+    ffapp.setup_window_actions()
+    window = open_window(ffapp, "voltmeters.py", "voltmeters", qtbot)
+    # The first ion chamber isn't updated by the IOC
+    embedded = window.display_widget()._ion_chamber_displays[0]
+    qtbot.waitUntil(lambda: embedded.embedded_widget is not None, timeout=10000)
+    label = embedded.embedded_widget.ui.ion_chamber_current
+    # Wait for the gain to arrive so that currents can be drawn
+    qtbot.waitUntil(lambda: label.text() != "", timeout=10000)
+    expected = {}
+    probe = RepaintProbe(label, predicate=lambda lbl: lbl.text().startswith(expected["text"]))
+    latencies = []
+    for num in range(1, 21):
+        voltage = 1 + num / 8  # Exact in binary, so the text is predictable
+        # Gain is 1 pA/V
+        expected["text"] = f"({voltage}"
+        t0 = probe.arm()
+        caput("scale_ioc:scaler1_calc1.VAL", voltage, wait=True)
+        qtbot.waitUntil(probe.fired, timeout=5000)
+        latencies.append(probe.paint_time - t0)
+    benchmark_recorder.record("scale.voltmeters.repaint_latency_median", statistics.median(latencies))
+    benchmark_recorder.record("scale.voltmeters.repaint_latency_max", max(latencies))
+    close_window(ffapp, window, "voltmeters", qtbot)
@@ -0,0 +1,86 @@
+"""Benchmarks for starting Firefly and opening its windows.
+
+Each window is opened cold (compiled UI files cleared) and warm (UI
+files already compiled, window re-created).
+
+"""
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+from qtpy import QtWidgets
+import haven
+from haven.instrument import motor
+from haven.instrument.monochromator import load_monochromator
+from haven.instrument.energy_positioner import load_energy_positioner
+
+from firefly import display
+from firefly.main_window import FireflyMainWindow, PlanMainWindow
+from firefly.application import ui_dir
+
+
+def test_launcher_startup(benchmark_recorder):
+    """Time the launcher until the first window is painted."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-m", "firefly.launcher", "--exit-after-startup"],
+        capture_output=True, text=True, env=env, timeout=300)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    benchmark_recorder.record("launcher.first_paint", timings["first_paint"])
+    benchmark_recorder.record("launcher.instrument_loaded", timings["instrument_loaded"])
+
+
+def test_load_instrument(benchmark_recorder, ffapp, sim_registry, qtbot):
+    """Time loading all the devices on a background thread."""
+    ffapp.prepare_queue_client = mock.MagicMock()
+    with benchmark_recorder.timer("load_instrument"):
+        with qtbot.waitSignal(ffapp.instrument_loaded, timeout=300000):
+            ffapp.load_instrument()
+    del ffapp.prepare_queue_client
+    # Clean up windows for later benchmarks
+    for window in list(ffapp.windows.values()):
+        window.hide_on_close = False
+        window.close()
+
+
+@pytest.fixture()
+def devices(ioc_motor, ioc_mono, sim_registry):
+    motor.load_ioc_motors(prefix="vme_crate_ioc", num_motors=3)
+    load_monochromator(config={"monochromator": {"ioc": "mono_ioc"}})
+    load_energy_positioner()
+    sim_registry.register(haven.IonChamber(prefix="eggs_ioc", ch_num=2, name="I0",
+                                           labels={"ion_chambers"}))
+    sim_registry.register(haven.Camera(prefix="camera_ioc:", name="Camera A",
+                                       labels={"cameras"}))
+    return sim_registry
+
+
+windows = [
+    ("status", FireflyMainWindow, "status.py", {}),
+    ("energy", PlanMainWindow, "energy.py", {}),
+    ("voltmeters", FireflyMainWindow, "voltmeters.py", {}),
+    ("cameras", FireflyMainWindow, "cameras.py", {}),
+    ("xafs_scan", PlanMainWindow, "xafs_scan.py", {}),
+    ("motor", FireflyMainWindow, "motor.py", {"PREFIX": "vme_crate_ioc:m1"}),
+]
+
+
+@pytest.mark.parametrize("name,WindowClass,display_file,macros", windows)
+def test_show_window(name, WindowClass, display_file, macros, benchmark_recorder, ffapp, devices, qtbot):
+    """Time opening each window, cold and warm."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    for temperature in ["cold", "warm"]:
+        if temperature == "cold":
+            display._ui_cache.clear()
+        with benchmark_recorder.timer(f"show_window.{name}.{temperature}"):
+            window = ffapp.show_window(WindowClass, ui_dir / display_file,
+                                       name=f"benchmark_{name}", macros=macros,
+                                       hide_on_close=False)
+            qtbot.waitExposed(window)
+        # Destroy the window so it gets created again
+        window.close()
+        qtbot.waitUntil(lambda: f"benchmark_{name}" not in ffapp.windows.keys())
@@ -0,0 +1,30 @@
+"""Fixtures for benchmarking Firefly.
+
+Run the benchmarks with ``pytest benchmarks/bench_*.py``. Results
+are added to the history file given by the
+``FIREFLY_BENCHMARK_HISTORY`` environment variable (default:
+``benchmarks/history.json``), and can be checked for regressions with
+``python -m firefly.benchmark compare``.
+
+The application, IOC and registry fixtures are shared with the tests
+in the top-level ``conftest.py``.
+
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from firefly.benchmark import BenchmarkRecorder
+
+
+history_file = Path(os.environ.get("FIREFLY_BENCHMARK_HISTORY",
+                                   Path(__file__).parent / "history.json"))
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder():
+    recorder = BenchmarkRecorder()
+    yield recorder
+    if len(recorder.results) > 0:
+        recorder.save(history_file)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""A simulated IOC with many devices, for testing Firefly at scale.
+
+The number of devices and how fast they update are set with
+environment variables:
+
+- ``FIREFLY_SCALE_MOTORS``: number of motor records (default 200)
+- ``FIREFLY_SCALE_ION_CHAMBERS``: number of scaler channels (default 16)
+- ``FIREFLY_SCALE_CAMERAS``: number of area detectors (default 8)
+- ``FIREFLY_SCALE_RATE``: updates per second for every device (default 10)
+- ``FIREFLY_SCALE_IMAGE_SIZE``: width and height of camera images (default 256)
+
+The first device of each kind is never updated by the IOC, so it can
+be used to measure how long a single PV change takes to show up.
+
+"""
+import os
+
+import numpy as np
+from caproto import ChannelType
+from caproto.server import PVGroup, ioc_arg_parser, pvproperty, run
+
+
+num_motors = int(os.environ.get("FIREFLY_SCALE_MOTORS", 200))
+num_ion_chambers = int(os.environ.get("FIREFLY_SCALE_ION_CHAMBERS", 16))
+num_cameras = int(os.environ.get("FIREFLY_SCALE_CAMERAS", 8))
+update_rate = float(os.environ.get("FIREFLY_SCALE_RATE", 10))
+image_size = int(os.environ.get("FIREFLY_SCALE_IMAGE_SIZE", 256))
+
+gain_values = ["1", "2", "5", "10", "20", "50", "100", "200", "500"]
+gain_units = ["pA/V", "nA/V", "uA/V", "mA/V"]
+# areaDetector DetectorState_RBV values
+detector_states = ["Idle", "Acquire", "Readout", "Correct", "Saving", "Aborting", "Error"]
+
+
+def motor_pvs(num: int) -> dict:
+    return {
+        f"m{num}": pvproperty(value=0.0, name=f"m{num}", record="motor", precision=3,
+                              doc=f"Scale motor {num}"),
+    }
+
+
+def ion_chamber_pvs(num: int) -> dict:
+    return {
+        f"name{num}": pvproperty(value=f"IC{num}", name=f"scaler1.NM{num}",
+                                 dtype=ChannelType.STRING),
+        f"voltage{num}": pvproperty(value=1.0, name=f"scaler1_calc{num}.VAL", precision=4),
+        f"gain{num}": pvproperty(value=gain_values[0], name=f"preamp{num}:sens_num.VAL",
+                                 dtype=ChannelType.ENUM, enum_strings=gain_values),
+        f"gain_unit{num}": pvproperty(value=gain_units[2], name=f"preamp{num}:sens_unit.VAL",
+                                      dtype=ChannelType.ENUM, enum_strings=gain_units),
+    }
+
+
+def camera_pvs(num: int) -> dict:
+    cam, image = f"cam{num}:cam1:", f"cam{num}:image1:"
+    pixels = image_size * image_size
+    return {
+        f"acquire{num}": pvproperty(value=1, name=f"{cam}Acquire", dtype=ChannelType.ENUM,
+                                    enum_strings=["Done", "Acquire"]),
+        f"state{num}": pvproperty(value=detector_states[1], name=f"{cam}DetectorState_RBV",
+                                  dtype=ChannelType.ENUM, enum_strings=detector_states,
+                                  read_only=True),
+        f"gain_auto{num}": pvproperty(value=0, name=f"{cam}GainAuto", dtype=ChannelType.ENUM,
+                                      enum_strings=["Off", "Once", "Continuous"]),
+        f"exposure_auto{num}": pvproperty(value=0, name=f"{cam}ExposureAuto", dtype=ChannelType.ENUM,
+                                          enum_strings=["Off", "Once", "Continuous"]),
+        f"max_x{num}": pvproperty(value=image_size, name=f"{cam}MaxSizeX_RBV", read_only=True),
+        f"max_y{num}": pvproperty(value=image_size, name=f"{cam}MaxSizeY_RBV", read_only=True),
+        f"ndims{num}": pvproperty(value=2, name=f"{image}NDimensions_RBV", read_only=True),
+        f"size0_{num}": pvproperty(value=image_size, name=f"{image}ArraySize0_RBV", read_only=True),
+        f"size1_{num}": pvproperty(value=image_size, name=f"{image}ArraySize1_RBV", read_only=True),
+        f"size2_{num}": pvproperty(value=0, name=f"{image}ArraySize2_RBV", read_only=True),
+        f"image{num}": pvproperty(value=[0] * pixels, name=f"{image}ArrayData",
+                                  dtype=ChannelType.CHAR, max_length=pixels, read_only=True),
+    }
+
+
+async def tick(group, instance, async_lib):
+    """Give every device (except the first of each kind) a new value."""
+    rng = group.rng
+    for num in range(2, num_motors + 1):
+        motor = getattr(group, f"m{num}")
+        position = motor.value + rng.normal(scale=0.01)
+        await motor.write(position)
+        await motor.field_inst.user_readback_value.write(position)
+    for num in range(2, num_ion_chambers + 1):
+        await getattr(group, f"voltage{num}").write(rng.uniform(0.1, 5.0))
+    for num in range(2, num_cameras + 1):
+        frame = rng.integers(0, 256, size=image_size * image_size, dtype=np.uint8)
+        await getattr(group, f"image{num}").write(frame)
+
+
+def make_ioc_class():
+    attrs = {}
+    for num in range(1, num_motors + 1):
+        attrs.update(motor_pvs(num))
+    for num in range(1, num_ion_chambers + 1):
+        attrs.update(ion_chamber_pvs(num))
+    for num in range(1, num_cameras + 1):
+        attrs.update(camera_pvs(num))
+    ticker = pvproperty(value=0, name="ticker", read_only=True,
+                        doc="Drives the updates for all the devices")
+    attrs["ticker"] = ticker.scan(period=1 / update_rate)(tick)
+    attrs["rng"] = np.random.default_rng(seed=0)
+    return type("ScaleIOC", (PVGroup,), attrs)
+
+
+if __name__ == "__main__":
+    ioc_options, run_options = ioc_arg_parser(
+        default_prefix="scale_ioc:",
+        desc="Many simulated motors, ion chambers and cameras.")
+    ioc = make_ioc_class()(**ioc_options)
+    run(ioc.pvdb, **run_options)
@@ -1,7 +1,58 @@
+from pathlib import Path
+
 import pytest
+
+from haven.simulated_ioc import simulated_ioc
+from haven import registry
+
 from firefly.application import FireflyApplication
 
 
+ioc_dir = Path(__file__).parent.parent.resolve() / "haven" / "tests" / "iocs"
+
+
 @pytest.fixture(scope="session")
 def qapp_cls():
     return FireflyApplication
+
+
+@pytest.fixture(autouse=True)
+def edge_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the X-ray edge cache out of the user's home directory."""
+    cache_dir = tmp_path_factory.getbasetemp() / "xray_edges"
+    monkeypatch.setattr("firefly.xray_edges.default_cache_dir", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture()
+def ffapp(qapp):
+    yield qapp
+    if hasattr(qapp, "_queue_thread"):
+        qapp._queue_thread.quit()
+
+
+@pytest.fixture(scope="session")
+def ioc_motor():
+    with simulated_ioc(fp=ioc_dir / "motor.py") as pvdb:
+        yield pvdb
+
+
+@pytest.fixture(scope="session")
+def ioc_simple():
+    with simulated_ioc(fp=ioc_dir / "simple.py") as pvdb:
+        yield pvdb
+
+@pytest.fixture(scope="session")
+def ioc_mono():
+    with simulated_ioc(fp=ioc_dir / "mono.py") as pvdb:
+        yield pvdb
+
+@pytest.fixture
+def sim_registry():
+    # Clean the registry so we can restore it later
+    components = registry.components
+    registry.clear()
+    # Run the test
+    yield registry
+    # Restore the previous registry components
+    registry.components = components
@@ -1,9 +1,9 @@
 import logging
 from pathlib import Path
 from dataclasses import dataclass, field
+from collections import OrderedDict
 from typing import Optional, Union, Mapping, Sequence
 from functools import partial
-import subprocess
 
 from qtpy import QtWidgets, QtCore
 from qtpy.QtWidgets import QAction
@@ -14,13 +14,22 @@ from pydm.application import PyDMApplication
 from pydm.display import load_file
 from pydm.utilities.stylesheet import apply_stylesheet
 from bluesky_queueserver_api import BPlan
-from bluesky_queueserver_api.zmq import REManagerAPI
+from bluesky_queueserver_api.zmq.aio import REManagerAPI
 from haven.exceptions import ComponentNotFound
-from haven import HavenMotor, registry, load_config
+from haven import HavenMotor, registry
 import haven
 
 from .main_window import FireflyMainWindow, PlanMainWindow
 from .queue_client import QueueClient, QueueClientThread
+from .queue_state import QueueState
+from .instrument_loader import InstrumentLoader
+from .motor_index import MotorIndex
+from .motor_palette import MotorPalette
+from .tracing import traced
+from .config import config_service, get_config
+from .external_tools import tool_launcher
+from .log_model import log_model
+from .camera import prewarm_imagej
 
 generator = type((x for x in []))
 
@@ -49,27 +58,69 @@ class FireflyApplication(PyDMApplication):
     # Actions for showing window
     show_status_window_action: QtWidgets.QAction
     launch_queuemonitor_action: QtWidgets.QAction
+    show_log_viewer_window_action: QtWidgets.QAction
+    show_sample_viewer_window_action: QtWidgets.QAction
+    show_xafs_scan_window_action: QtWidgets.QAction
+    show_voltmeters_window_action: QtWidgets.QAction
+    show_cameras_window_action: QtWidgets.QAction
+
+    # Menus shared by all the windows' menubars
+    menuPositioners: QtWidgets.QMenu = None
+    menuMotors: QtWidgets.QMenu = None
+    menuScans: QtWidgets.QMenu = None
+    menuDetectors: QtWidgets.QMenu = None
+
+    # Run engine actions, in order, for the windows' navbars
+    navbar_actions: Sequence = []
+
+    # Windows that are hidden instead of destroyed when closed
+    hide_on_close_windows = {"voltmeters", "cameras", "energy", "xafs_scan", "log_viewer"}
+    # How many hidden windows to keep alive at once
+    max_hidden_windows: int = 4
 
     # Keep track of motors
-    motor_actions: Sequence = []
-    motor_window_slots: Sequence = []
     motor_windows: Mapping = {}
+    _motor_palette = None
 
     # Signals for running plans on the queueserver
     queue_item_added = Signal(object)
+    queue_items_added = Signal(object)
 
     # Signals responding to queueserver changes
     queue_length_changed = Signal(int)
+    queue_batch_added = Signal(object)
+
+    # Signals for reporting progress loading the instrument
+    instrument_stage_started = Signal(str)
+    instrument_stage_finished = Signal(str, float)
+    instrument_loaded = Signal(float)
 
     def __init__(self, ui_file=None, use_main_window=False, *args, **kwargs):
         # Instantiate the parent class
         # (*ui_file* and *use_main_window* let us render the window here instead)
         super().__init__(ui_file=None, use_main_window=use_main_window, *args, **kwargs)
         self.windows = {}
+        self.hidden_windows = OrderedDict()
+        # Parse the config files once, and watch them for changes
+        self.config_service = config_service()
+        # Start keeping log messages for the log viewer
+        self.log_model = log_model()
+        # Motors, and the actions for opening their windows
+        self.motor_index = MotorIndex()
+        self._motor_entries = {}
+        # Motor sub-menus, keyed by their (hutch, IOC) path
+        self._motor_submenus = {}
+        self._motor_menu_flat = None
+        # Shared copy of the queueserver's state for all the windows
+        self.queue_state = QueueState(parent=self)
+        # Don't leave external tools (caQtDM, ImageJ, etc.) running
+        self.aboutToQuit.connect(tool_launcher().terminate_all)
 
     def __del__(self):
         if hasattr(self, "_queue_thread"):
             self._queue_thread.quit()
+        if hasattr(self, "_instrument_thread"):
+            self._instrument_thread.quit()
 
     def _setup_window_action(self, action_name: str, text: str, slot: QtCore.Slot):
         action = QtWidgets.QAction(self)
@@ -78,9 +129,16 @@ class FireflyApplication(PyDMApplication):
         action.triggered.connect(slot)
         setattr(self, action_name, action)
 
+    @traced(category="startup")
     def load_instrument(self):
-        # Define devices on the beamline
-        haven.load_instrument()
+        """Load the beamline's devices without blocking the GUI.
+
+        The beamline status window is shown right away, and devices
+        are loaded on a worker thread in stages (see
+        :py:class:`~firefly.instrument_loader.InstrumentLoader`). Menus
+        fill in as devices get registered.
+
+        """
         # Make actions for launching other windows
         self.setup_window_actions()
         # Actions for controlling the bluesky run engine
@@ -92,6 +150,51 @@ class FireflyApplication(PyDMApplication):
         # Set up the window to show list of PV connections
         pydm.utilities.shortcuts.install_connection_inspector(
             parent=self.windows["beamline_status"])
+        # Define devices on the beamline in a separate thread
+        loader = InstrumentLoader()
+        thread = QThread()
+        thread.setObjectName("instrument_loader")
+        loader.moveToThread(thread)
+        thread.started.connect(loader.load)
+        loader.stage_started.connect(self.instrument_stage_started)
+        loader.stage_finished.connect(self.instrument_stage_finished)
+        loader.stage_finished.connect(self.handle_instrument_stage)
+        loader.finished.connect(self.instrument_loaded)
+        loader.finished.connect(thread.quit)
+        thread.start()
+        # Save references so they don't get garbage collected
+        self._instrument_loader = loader
+        self._instrument_thread = thread
+
+    @QtCore.Slot(str, float)
+    def handle_instrument_stage(self, stage: str, duration: float):
+        """Update the application once a loading stage has finished."""
+        for window in self.windows.values():
+            window.statusBar().showMessage(f"Loaded {stage} ({duration:.1f} s)", 5000)
+        if stage == "registry":
+            self.refresh_device_menus()
+            # Reload the status window now that its devices exist
+            if (window := self.windows.get("beamline_status")) is not None:
+                window.open(str(ui_dir / "status.py"))
+            # Get ImageJ going now so camera viewers open quickly later
+            has_cameras = len(registry.findall(label="cameras", allow_none=True)) > 0
+            if has_cameras and get_config().get("camera", {}).get("imagej_prewarm", False):
+                prewarm_imagej()
+
+    def refresh_device_menus(self):
+        """Update the shared menus for devices that have been registered.
+
+        Since all the windows share the same menus, they only need to
+        be updated once.
+
+        """
+        self.prepare_motor_windows()
+        # Only allow detector windows if there are detectors
+        if self.menuDetectors is not None:
+            self.show_voltmeters_window_action.setEnabled(
+                len(registry.findall(label="ion_chambers", allow_none=True)) > 0)
+            self.show_cameras_window_action.setEnabled(
+                len(registry.findall(label="cameras", allow_none=True)) > 0)
 
     def setup_window_actions(self):
         """Create QActions for clicking on menu items, shortcuts, etc.
@@ -100,7 +203,6 @@ class FireflyApplication(PyDMApplication):
         windows. Window-specific actions belong with the window.
 
         """
-        self.prepare_motor_windows()
         # Action for showing the beamline status window
         self.show_status_window_action = QtWidgets.QAction(self)
         self.show_status_window_action.setObjectName(f"show_status_window_action")
@@ -113,15 +215,61 @@ class FireflyApplication(PyDMApplication):
         self.launch_queuemonitor_action.triggered.connect(self.launch_queuemonitor)
         # Launch energy window
         self._setup_window_action(action_name="show_energy_window_action", text="Energy", slot=self.show_energy_window)
+        # Build the menus that all windows share
+        self.setup_menus()
+        self.refresh_device_menus()
+
+    def _setup_menu(self, menu_name: str, title: str) -> QtWidgets.QMenu:
+        menu = QtWidgets.QMenu()
+        menu.setObjectName(menu_name)
+        menu.setTitle(title)
+        setattr(self, menu_name, menu)
+        return menu
+
+    def setup_menus(self):
+        """Build the menus that are shared by all the windows.
+
+        Each window adds these same QMenu objects to its menubar, so
+        the menus are only built once, and changes show up in every
+        window.
+
+        """
+        if self.menuPositioners is not None:
+            # Already built
+            return
+        # Actions for showing windows from the menus
+        self._setup_window_action(action_name="show_log_viewer_window_action", text="Logs", slot=self.show_log_viewer_window)
+        self._setup_window_action(action_name="show_sample_viewer_window_action", text="Sample", slot=self.show_sample_viewer_window)
+        self._setup_window_action(action_name="show_xafs_scan_window_action", text="XAFS Scan", slot=self.show_xafs_scan_window)
+        self._setup_window_action(action_name="show_voltmeters_window_action", text="Ion Chambers", slot=self.show_voltmeters_window)
+        self._setup_window_action(action_name="show_cameras_window_action", text="Cameras", slot=self.show_cameras_window)
+        # Positioners menu
+        positioners = self._setup_menu("menuPositioners", "Positioners")
+        positioners.addAction(self.show_sample_viewer_window_action)
+        motors = self._setup_menu("menuMotors", "Motors")
+        positioners.addAction(motors.menuAction())
+        self._setup_window_action(action_name="find_motor_action", text="Find Motor…", slot=self.show_motor_palette)
+        self.find_motor_action.setShortcut("Ctrl+Shift+M")
+        self.find_motor_action.setShortcutContext(QtCore.Qt.ApplicationShortcut)
+        positioners.addAction(self.show_energy_window_action)
+        # Scans menu
+        scans = self._setup_menu("menuScans", "Scans")
+        scans.addAction(self.show_xafs_scan_window_action)
+        # Detectors menu
+        detectors = self._setup_menu("menuDetectors", "Detectors")
+        detectors.addAction(self.show_voltmeters_window_action)
+        detectors.addAction(self.show_cameras_window_action)
+        self.update_motor_menu()
 
     def launch_queuemonitor(self):
-        config = load_config()["queueserver"]
+        config = get_config()["queueserver"]
         zmq_info_addr = f"tcp://{config['info_host']}:{config['info_port']}"
         zmq_ctrl_addr = f"tcp://{config['control_host']}:{config['control_port']}"
         cmds = ['queue-monitor',
                 '--zmq-control-addr', zmq_ctrl_addr,
                 '--zmq-info-addr', zmq_info_addr]
-        subprocess.Popen(cmds)
+        tool_launcher().launch("queue-monitor", cmds,
+                               macros={"info": zmq_info_addr, "control": zmq_ctrl_addr})
 
     def setup_runengine_actions(self):
         """Create QActions for controlling the bluesky runengine."""
@@ -142,48 +290,209 @@ class FireflyApplication(PyDMApplication):
             action.setIcon(icon)
             setattr(self, name, action)
             # action.triggered.connect(slot)
+        # Shared list of actions for the windows' navbars
+        def separator():
+            action = QtWidgets.QAction(self)
+            action.setSeparator(True)
+            return action
+        self.navbar_actions = [
+            self.start_queue_action,
+            separator(),
+            self.pause_runengine_action,
+            self.pause_runengine_now_action,
+            separator(),
+            self.resume_runengine_action,
+            self.stop_runengine_action,
+            self.abort_runengine_action,
+            self.halt_runengine_action,
+        ]
 
     def prepare_motor_windows(self):
-        """Prepare the support for opening motor windows."""
+        """Prepare the support for opening motor windows.
+
+        Builds the index of motors. Menu actions are only created when
+        they are first needed, and re-used for motors that are already
+        known, so this can be called again whenever the registry
+        changes.
+
+        """
         # Get active motors
         try:
-            motors = sorted(registry.findall(label="motors"), key=lambda x: x.name)
+            motors = registry.findall(label="motors")
         except ComponentNotFound:
             log.warning("No motors found, [Positioners] -> [Motors] menu will be empty.")
             motors = []
-        # Create menu actions for each motor
-        self.motor_actions = []
-        self.motor_window_slots = []
-        self.motor_windows = {}
-        for motor in motors:
+        self.motor_index = MotorIndex(motors)
+        # Discard actions for motors that are gone
+        current = {entry.name: entry.motor for entry in self.motor_index}
+        for name, (motor, action, slot) in list(self._motor_entries.items()):
+            if current.get(name) is not motor:
+                del self._motor_entries[name]
+                action.deleteLater()
+        self.update_motor_menu()
+        if self._motor_palette is not None:
+            self._motor_palette.set_index(self.motor_index)
+
+    def motor_action(self, motor) -> QAction:
+        """The action for opening *motor*'s window, created on first use."""
+        entry = self._motor_entries.get(motor.name)
+        if entry is None or entry[0] is not motor:
             action = QtWidgets.QAction(self)
             action.setObjectName(f"actionShow_Motor_{motor.name}")
             action.setText(motor.name)
-            self.motor_actions.append(action)
             # Create a slot for opening the motor window
             slot = partial(self.show_motor_window, motor=motor)
             action.triggered.connect(slot)
-            self.motor_window_slots.append(slot)
+            entry = self._motor_entries[motor.name] = (motor, action, slot)
+        return entry[1]
+
+    @property
+    def motor_actions(self) -> list:
+        """Actions for opening every motor's window, sorted by name."""
+        return [self.motor_action(entry.motor) for entry in self.motor_index]
+
+    @property
+    def motor_window_slots(self) -> list:
+        """Slots for opening every motor's window, sorted by name."""
+        self.motor_actions  # Make sure the actions and slots exist
+        return [self._motor_entries[entry.name][2] for entry in self.motor_index]
+
+    def update_motor_menu(self):
+        """Update the shared motors menu to match *motor_index*.
+
+        Motors are grouped into sub-menus by hutch and IOC. Sub-menus
+        are only filled in the first time they are shown. After that,
+        only the sub-menus and actions that changed are added or
+        removed, so the menus don't get rebuilt each time the registry
+        changes.
+
+        """
+        menu = self.menuMotors
+        if menu is None:
+            return
+        if self.find_motor_action not in menu.actions():
+            menu.addAction(self.find_motor_action)
+            menu.addSeparator()
+        # No need for a separate level for just one hutch
+        groups = self.motor_index.groups()
+        flat = len(groups) <= 1
+        if flat != self._motor_menu_flat:
+            for path in [path for path in self._motor_submenus if len(path) == 1]:
+                self._remove_motor_submenu(menu, path)
+            self._motor_menu_flat = flat
+        if flat:
+            iocs = next(iter(groups.values()), {})
+            self._sync_motor_submenus(menu, (), list(iocs.keys()))
+        else:
+            self._sync_motor_submenus(menu, (), list(groups.keys()))
+        # Update the sub-menus that have already been filled in
+        for path, submenu in sorted(self._motor_submenus.items(), key=lambda item: len(item[0])):
+            if path in self._motor_submenus and not submenu.isEmpty():
+                self._update_motor_submenu(submenu, path)
+
+    def _motor_submenu_contents(self, path: tuple):
+        """The IOC names (for a hutch menu) or motor entries (for an IOC menu)."""
+        groups = self.motor_index.groups()
+        if self._motor_menu_flat:
+            iocs = next(iter(groups.values()), {})
+            return iocs.get(path[0], [])
+        elif len(path) == 1:
+            return list(groups.get(path[0], {}).keys())
+        else:
+            return groups.get(path[0], {}).get(path[1], [])
+
+    def _sync_motor_submenus(self, parent: QtWidgets.QMenu, path: tuple, titles: Sequence):
+        """Add and remove the sub-menus of *parent* to match *titles*."""
+        for key in [key for key in self._motor_submenus if key[:-1] == path]:
+            if key[-1] not in titles:
+                self._remove_motor_submenu(parent, key)
+        for idx, title in enumerate(titles):
+            key = (*path, title)
+            if key in self._motor_submenus:
+                continue
+            submenu = QtWidgets.QMenu(title, parent)
+            # Keep the sub-menus in order
+            later = [self._motor_submenus.get((*path, t)) for t in titles[idx + 1:]]
+            before = next((m.menuAction() for m in later if m is not None), None)
+            if before is None:
+                parent.addMenu(submenu)
+            else:
+                parent.insertMenu(before, submenu)
+            submenu.aboutToShow.connect(partial(self._populate_motor_submenu, submenu, key))
+            self._motor_submenus[key] = submenu
+
+    def _remove_motor_submenu(self, parent: QtWidgets.QMenu, path: tuple):
+        submenu = self._motor_submenus.pop(path)
+        parent.removeAction(submenu.menuAction())
+        # Also forget any sub-menus nested inside this one
+        for key in [key for key in self._motor_submenus if key[:len(path)] == path]:
+            del self._motor_submenus[key]
+        submenu.deleteLater()
+
+    def _populate_motor_submenu(self, menu: QtWidgets.QMenu, path: tuple):
+        if menu.isEmpty():
+            self._update_motor_submenu(menu, path)
+
+    def _update_motor_submenu(self, menu: QtWidgets.QMenu, path: tuple):
+        contents = self._motor_submenu_contents(path)
+        if not self._motor_menu_flat and len(path) == 1:
+            self._sync_motor_submenus(menu, path, contents)
+            return
+        # Only add or remove the actions for motors that changed
+        actions = [self.motor_action(entry.motor) for entry in contents]
+        for action in menu.actions():
+            if action not in actions:
+                menu.removeAction(action)
+        for idx, action in enumerate(actions):
+            current = menu.actions()
+            if idx < len(current) and current[idx] is action:
+                continue
+            if idx < len(current):
+                menu.insertAction(current[idx], action)
+            else:
+                menu.addAction(action)
+
+    def show_motor_palette(self):
+        """Show a type-ahead dialog for opening motor windows."""
+        if self._motor_palette is None:
+            self._motor_palette = MotorPalette(index=self.motor_index)
+            self._motor_palette.motor_selected.connect(
+                lambda motor: self.show_motor_window(motor=motor))
+        palette = self._motor_palette
+        palette.show()
+        palette.raise_()
+        palette.activateWindow()
 
     def prepare_queue_client(self, api=None):
+        api_factory = None
         if api is None:
-            config = load_config()["queueserver"]
+            # The async API gets created inside the client's event loop
+            config = get_config()["queueserver"]
             ctrl_addr = f"tcp://{config['control_host']}:{config['control_port']}"
             info_addr = f"tcp://{config['info_host']}:{config['info_port']}"
-            api = REManagerAPI(zmq_control_addr=ctrl_addr, zmq_info_addr=info_addr)
-        client = QueueClient(api=api)
+            api_factory = partial(REManagerAPI, zmq_control_addr=ctrl_addr, zmq_info_addr=info_addr)
+        # The client's slots don't block, so it stays in this thread
+        # and schedules its requests on the queue thread's event loop
+        client = QueueClient(api=api, api_factory=api_factory)
         thread = QueueClientThread(client=client)
-        client.moveToThread(thread)
         # Connect actions to slots for controlling the queueserver
         self.pause_runengine_action.triggered.connect(
             partial(client.request_pause, defer=True))        
         self.pause_runengine_now_action.triggered.connect(
             partial(client.request_pause, defer=False))
+        self.resume_runengine_action.triggered.connect(client.resume_runengine)
+        self.stop_runengine_action.triggered.connect(client.stop_runengine)
+        self.abort_runengine_action.triggered.connect(client.abort_runengine)
+        self.halt_runengine_action.triggered.connect(client.halt_runengine)
         self.start_queue_action.triggered.connect(client.start_queue)
         # Connect signals to slots for executing plans on queueserver
         self.queue_item_added.connect(client.add_queue_item)
+        self.queue_items_added.connect(client.add_queue_items)
         # Connect signals/slots for queueserver state changes
         client.length_changed.connect(self.queue_length_changed)
+        client.items_added.connect(self.queue_batch_added)
+        client.status_changed.connect(self.queue_state.update_status)
+        client.queue_changed.connect(self.queue_state.update_queue)
         # Start the thread
         thread.start()
         # Save references to the thread and runner
@@ -195,43 +504,77 @@ class FireflyApplication(PyDMApplication):
         log.debug(f"Application received item to add to queue: {item}")
         self.queue_item_added.emit(item)
 
-    def connect_menu_signals(self, window):
-        """Connects application-level signals to the associated slots.
-        
-        These signals should generally be applicable to multiple
-        windows. If the signal and/or slot is specific to a given
-        window, then it should be in that widnow's class definition
-        and setup code.
-        
+    def add_queue_items(self, items):
+        """Add several items to the queue in one request.
+
+        The outcome is emitted on *queue_batch_added* as a
+        :py:class:`~firefly.queue_client.BatchResult`.
+
         """
-        window.actionShow_Log_Viewer.triggered.connect(self.show_log_viewer_window)
-        window.actionShow_Xafs_Scan.triggered.connect(self.show_xafs_scan_window)
-        window.actionShow_Voltmeters.triggered.connect(self.show_voltmeters_window)
-        window.actionShow_Sample_Viewer.triggered.connect(self.show_sample_viewer_window)
-        window.actionShow_Cameras.triggered.connect(self.show_cameras_window)
+        items = list(items)
+        log.debug(f"Application received {len(items)} items to add to queue.")
+        self.queue_items_added.emit(items)
+
+    def show_window(self, WindowClass, ui_file, name=None, macros={}, hide_on_close=None):
+        """Show a window, creating it if necessary.
+
+        Parameters
+        ==========
+        WindowClass
+          The main window class to use for the window.
+        ui_file
+          The display file to show in the window, relative to *ui_dir*.
+        name
+          Key for keeping track of this window.
+        macros
+          Macros to pass to the display.
+        hide_on_close
+          If true, closing the window will only hide it, so that
+          re-opening it is fast. Defaults to whether *name* is in
+          *hide_on_close_windows*. At most *max_hidden_windows* are
+          kept alive, least recently used first to go.
 
-    def show_window(self, WindowClass, ui_file, name=None, macros={}):
+        """
         # Come up with the default key for saving in the windows dictionary
         if name is None:
             name = f"{WindowClass.__name__}_{ui_file.name}"
+        if hide_on_close is None:
+            hide_on_close = name in self.hide_on_close_windows
         # Check if the window has already been created
         if (w := self.windows.get(name)) is None:
             # Window is not yet created, so create one
             w = self.create_window(WindowClass, ui_dir / ui_file, macros=macros)
             self.windows[name] = w
+            w.hide_on_close = hide_on_close
             # Connect signals to remove the window when it closes
             w.destroyed.connect(partial(self.forget_window, name=name))
+            w.window_hidden.connect(partial(self.remember_hidden_window, name=name))
         else:
             # Window already exists so just bring it to the front
+            self.hidden_windows.pop(name, None)
             w.show()
             w.activateWindow()
         return w
 
+    def remember_hidden_window(self, name):
+        """Keep a closed window around, discarding old ones if necessary."""
+        self.hidden_windows[name] = self.windows[name]
+        self.hidden_windows.move_to_end(name)
+        while len(self.hidden_windows) > self.max_hidden_windows:
+            old_name, old_window = self.hidden_windows.popitem(last=False)
+            log.debug(f"Destroying hidden window: {old_name}")
+            old_window.hide_on_close = False
+            old_window.close()
+            old_window.deleteLater()
+
     def forget_window(self, obj, name):
         """Forget this window exists."""
         if hasattr(self, 'windows'):
             del self.windows[name]
+        if hasattr(self, 'hidden_windows'):
+            self.hidden_windows.pop(name, None)
 
+    @traced(category="windows")
     def create_window(self, WindowClass, ui_file, macros={}):
         # Create and save this window
         main_window = WindowClass(hide_menu_bar=self.hide_menu_bar,
@@ -241,7 +584,6 @@ class FireflyApplication(PyDMApplication):
         main_window.update_tools_menu()
         # Load the UI file for this window
         display = main_window.open(str(ui_file.resolve()), macros=macros)
-        self.connect_menu_signals(window=main_window)
         # Show the display
         if self.fullscreen:
             main_window.enter_fullscreen()
@@ -264,7 +606,7 @@ class FireflyApplication(PyDMApplication):
 
     @QtCore.Slot()
     def show_log_viewer_window(self):
-        self.show_window(FireflyMainWindow, ui_dir / "log_viewer.ui", name="log_viewer")
+        self.show_window(FireflyMainWindow, ui_dir / "log_viewer.py", name="log_viewer")
 
     @QtCore.Slot()
     def show_xafs_scan_window(self):
@@ -276,7 +618,7 @@ class FireflyApplication(PyDMApplication):
 
     @QtCore.Slot()
     def show_sample_viewer_window(self):
-        self.show_window(FireflyMainWindow, ui_dir / "sample_viewer.ui", name="sample_viewer")
+        self.show_window(FireflyMainWindow, ui_dir / "sample_viewer.py", name="sample_viewer")
 
     @QtCore.Slot()
     def show_cameras_window(self):
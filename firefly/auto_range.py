@@ -0,0 +1,190 @@
+"""Keep an ion chamber's pre-amp gain matched to its signal.
+
+The scaler's voltage-to-frequency converter only works over a limited
+range of voltages. When auto-ranging is on, the pre-amp gain is
+stepped whenever the voltage stays outside that range, with:
+
+- hysteresis: the bands are far enough apart that one gain step
+  can't push the voltage from one band into the other,
+- a minimum dwell time between steps, so the pre-amp can settle,
+- no changes while the scaler is counting, so a measurement never
+  mixes two gains.
+
+"""
+import time
+import logging
+from typing import Optional
+
+from qtpy.QtCore import QObject, Signal
+
+from firefly.channels import SharedChannel
+
+
+log = logging.getLogger(__name__)
+
+
+# Pre-amp sensitivity steps, lowest (most gain) first
+num_gain_values = 9
+num_gain_units = 4
+max_level = num_gain_values * num_gain_units - 1
+
+
+class AutoRanger:
+    """Decide when to change the gain, based on a stream of voltages.
+
+    Parameters
+    ==========
+    lower
+      Voltage below which to increase the gain.
+    upper
+      Voltage above which to decrease the gain.
+    min_dwell
+      Seconds to wait after a gain change before changing it again.
+    settle_samples
+      Number of voltages in a row that must be out of range before
+      changing the gain.
+
+    """
+    counting: Optional[bool] = None
+    # Sensitivity level: gain unit index × 9 + gain value index
+    level: Optional[int] = None
+
+    def __init__(self, lower: float = 0.5, upper: float = 4.5,
+                 min_dwell: float = 2.0, settle_samples: int = 3):
+        # A gain step changes the voltage by up to 2.5×
+        if upper / lower <= 2.5:
+            raise ValueError(f"Auto-range bands ({lower}, {upper}) are too close together.")
+        self.lower = lower
+        self.upper = upper
+        self.min_dwell = min_dwell
+        self.settle_samples = settle_samples
+        self.last_change = -float("inf")
+        self._streak = 0
+
+    def reset(self):
+        self._streak = 0
+
+    def update(self, voltage: float, now: Optional[float] = None) -> int:
+        """Check a new voltage reading.
+
+        Returns
+        =======
+        step
+          +1 to increase the gain, -1 to decrease it, or 0 to leave
+          it alone.
+
+        """
+        now = time.monotonic() if now is None else now
+        # Only range when we know the scaler isn't counting
+        if self.counting is not False:
+            self.reset()
+            return 0
+        if voltage < self.lower:
+            direction = 1
+        elif voltage > self.upper:
+            direction = -1
+        else:
+            self.reset()
+            return 0
+        # Count how long the voltage has been out of range this way
+        self._streak = self._streak + direction if self._streak * direction > 0 else direction
+        if abs(self._streak) < self.settle_samples:
+            return 0
+        if now - self.last_change < self.min_dwell:
+            return 0
+        # Don't go past the ends of the pre-amp's range
+        if self.level is not None:
+            if (direction > 0 and self.level <= 0) or (direction < 0 and self.level >= max_level):
+                return 0
+        self.last_change = now
+        self.reset()
+        return direction
+
+
+class AutoRangeController(QObject):
+    """Watch an ion chamber and step its pre-amp gain automatically.
+
+    Parameters
+    ==========
+    device
+      The ion chamber, with *increase_gain* and *decrease_gain* methods.
+    voltage_address
+      PV address for the ion chamber's voltage.
+    count_address
+      PV address for the scaler's count (.CNT) field.
+    gain_address, unit_address
+      PV addresses for the pre-amp's sensitivity value and unit.
+
+    """
+    enabled: bool = False
+
+    # Emitted with +1 (more gain) or -1 (less gain) after each step
+    gain_stepped = Signal(int)
+
+    def __init__(self, device, voltage_address: str, count_address: str,
+                 gain_address: str, unit_address: str, ranger: Optional[AutoRanger] = None,
+                 parent=None):
+        super().__init__(parent=parent)
+        self.device = device
+        self.ranger = AutoRanger() if ranger is None else ranger
+        self._gain_idx = None
+        self._unit_idx = None
+        self._channels = [
+            SharedChannel(voltage_address, value_slot=self.update_voltage),
+            SharedChannel(count_address, value_slot=self.update_counting,
+                          connection_slot=self.update_count_connection),
+            SharedChannel(gain_address, value_slot=self.update_gain),
+            SharedChannel(unit_address, value_slot=self.update_unit),
+        ]
+
+    def channels(self):
+        return self._channels if self.enabled else []
+
+    def set_enabled(self, enabled: bool):
+        """Start or stop watching the ion chamber."""
+        enabled = bool(enabled)
+        if enabled == self.enabled:
+            return
+        if enabled:
+            self.enabled = True
+            self.ranger.reset()
+            for ch in self._channels:
+                ch.connect()
+        else:
+            for ch in self._channels:
+                ch.disconnect()
+            self.enabled = False
+            self.ranger.counting = None
+        log.info(f"Auto-ranging {'enabled' if enabled else 'disabled'} for {self.device}.")
+
+    def update_count_connection(self, connected: bool):
+        if not connected:
+            self.ranger.counting = None
+
+    def update_counting(self, count):
+        self.ranger.counting = bool(count)
+
+    def update_gain(self, gain_idx):
+        self._gain_idx = int(gain_idx)
+        self._update_level()
+
+    def update_unit(self, unit_idx):
+        self._unit_idx = int(unit_idx)
+        self._update_level()
+
+    def _update_level(self):
+        if None not in (self._gain_idx, self._unit_idx):
+            self.ranger.level = self._unit_idx * num_gain_values + self._gain_idx
+
+    def update_voltage(self, voltage):
+        if not self.enabled or self.device is None:
+            return
+        step = self.ranger.update(voltage)
+        if step > 0:
+            log.info(f"Auto-range: increasing gain on {self.device.name} ({voltage} V).")
+            self.device.increase_gain()
+        elif step < 0:
+            log.info(f"Auto-range: decreasing gain on {self.device.name} ({voltage} V).")
+            self.device.decrease_gain()
+        if step != 0:
+            self.gain_stepped.emit(step)
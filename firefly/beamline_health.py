@@ -0,0 +1,192 @@
+"""A summary of the beamline's health for the status window.
+
+Each PV is subscribed to once, and the overall states that operators
+care about (is beam available? can the hutch be searched? are any
+IOCs down?) are all derived in one place, at a bounded rate, instead
+of by individual widgets.
+
+"""
+import math
+import time
+import logging
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import partial
+from typing import Mapping, Optional, Sequence
+
+from qtpy.QtCore import QObject, QTimer, Signal
+
+from firefly.channels import SharedChannel
+
+
+log = logging.getLogger(__name__)
+
+
+class Severity(IntEnum):
+    OK = 0
+    WARNING = 1
+    ALARM = 2
+    DISCONNECTED = 3
+
+
+@dataclass(frozen=True)
+class StatusSignal:
+    """A PV that contributes to the beamline's health.
+
+    *kind* is one of "value", "ring_current", "permit", "shutter",
+    "vacuum" or "heartbeat". *role* marks signals needed for
+    beam ("beam"), and shutters that must be closed to search the
+    hutch ("hutch").
+
+    """
+    key: str
+    address: str
+    label: str
+    kind: str = "value"
+    role: str = ""
+    threshold: Optional[float] = None
+    units: str = ""
+
+
+@dataclass(frozen=True)
+class TileState:
+    key: str
+    label: str
+    text: str
+    severity: Severity
+
+
+class BeamlineHealth(QObject):
+    """Collect the status PVs and work out the beamline's health.
+
+    Parameters
+    ==========
+    signals
+      The PVs to watch.
+
+    """
+    # Most times per second to emit *states_changed*
+    max_refresh_rate: float = 2
+    # Seconds without a new heartbeat before an IOC counts as down
+    heartbeat_timeout: float = 10
+    # Ring current (mA) below which there is no beam
+    min_ring_current: float = 2
+
+    # Emitted with a {key: TileState} dict of the states that changed
+    states_changed = Signal(object)
+
+    def __init__(self, signals: Sequence[StatusSignal], parent=None):
+        super().__init__(parent=parent)
+        self.signals = {sig.key: sig for sig in signals}
+        self._values = {}
+        self._connected = {}
+        self._heartbeat_times = {}
+        self._states = {}
+        self._channels = [
+            SharedChannel(sig.address,
+                          value_slot=partial(self.update_value, sig.key),
+                          connection_slot=partial(self.update_connection, sig.key))
+            for sig in self.signals.values()
+        ]
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(1000 / self.max_refresh_rate))
+        self._timer.timeout.connect(self.refresh)
+
+    def channels(self):
+        return self._channels
+
+    def connect(self):
+        for ch in self._channels:
+            ch.connect()
+        self._timer.start()
+
+    def disconnect(self):
+        self._timer.stop()
+        for ch in self._channels:
+            ch.disconnect()
+
+    def update_value(self, key, value):
+        if self.signals[key].kind == "heartbeat" and self._values.get(key) != value:
+            self._heartbeat_times[key] = time.monotonic()
+        self._values[key] = value
+
+    def update_connection(self, key, connected):
+        self._connected[key] = bool(connected)
+
+    @property
+    def states(self) -> Mapping:
+        """The most recently emitted tile states."""
+        return self._states
+
+    def refresh(self):
+        """Work out the new states, and emit the ones that changed."""
+        states = self.evaluate()
+        changed = {key: state for key, state in states.items()
+                   if self._states.get(key) != state}
+        if len(changed) > 0:
+            self._states = states
+            self.states_changed.emit(changed)
+
+    def evaluate(self, now: Optional[float] = None) -> dict:
+        """The current state of every signal, and the derived states."""
+        now = time.monotonic() if now is None else now
+        states = {key: self.signal_state(sig, now) for key, sig in self.signals.items()}
+        states.update(self.derived_states(states))
+        return states
+
+    def _has_value(self, key) -> bool:
+        return self._connected.get(key, False) and key in self._values
+
+    def signal_state(self, sig: StatusSignal, now: float) -> TileState:
+        key = sig.key
+        if not self._has_value(key):
+            return TileState(key, sig.label, "Disconnected", Severity.DISCONNECTED)
+        value = self._values[key]
+        if sig.kind == "shutter":
+            text, severity = ("Open", Severity.OK) if value else ("Closed", Severity.WARNING)
+        elif sig.kind == "permit":
+            text, severity = ("Permitted", Severity.OK) if value else ("No permit", Severity.WARNING)
+        elif sig.kind == "heartbeat":
+            last_beat = self._heartbeat_times.get(key, -math.inf)
+            alive = now - last_beat < self.heartbeat_timeout
+            text, severity = ("Up", Severity.OK) if alive else ("Down", Severity.ALARM)
+        else:
+            text = f"{value:.4g}" if isinstance(value, float) else str(value)
+            text = f"{text} {sig.units}".strip()
+            severity = Severity.OK
+            if sig.kind == "ring_current" and value < self.min_ring_current:
+                severity = Severity.WARNING
+            elif sig.kind == "vacuum" and sig.threshold is not None and value > sig.threshold:
+                severity = Severity.ALARM
+        return TileState(key, sig.label, text, severity)
+
+    def derived_states(self, states: Mapping) -> dict:
+        """States that depend on several signals."""
+        derived = {}
+        # Beam is available if everything needed for beam is OK
+        beam_keys = [key for key, sig in self.signals.items() if sig.role == "beam"]
+        if len(beam_keys) > 0:
+            beam_ok = all(states[key].severity == Severity.OK for key in beam_keys)
+            derived["beam_available"] = TileState(
+                "beam_available", "Beam Available",
+                "Yes" if beam_ok else "No", Severity.OK if beam_ok else Severity.WARNING)
+        # The hutch can be searched if its shutters are known to be closed
+        hutch_keys = [key for key, sig in self.signals.items() if sig.role == "hutch"]
+        if len(hutch_keys) > 0:
+            if not all(self._has_value(key) for key in hutch_keys):
+                text, severity = "Unknown", Severity.DISCONNECTED
+            elif any(self._values[key] for key in hutch_keys):
+                text, severity = "No", Severity.WARNING
+            else:
+                text, severity = "Yes", Severity.OK
+            derived["hutch_searchable"] = TileState("hutch_searchable", "Hutch Searchable",
+                                                    text, severity)
+        # IOCs that have stopped responding
+        ioc_keys = [key for key, sig in self.signals.items() if sig.kind == "heartbeat"]
+        if len(ioc_keys) > 0:
+            down = [self.signals[key].label for key in ioc_keys
+                    if states[key].severity != Severity.OK]
+            derived["iocs_down"] = TileState(
+                "iocs_down", "IOCs Down", ", ".join(down) if down else "None",
+                Severity.ALARM if down else Severity.OK)
+        return derived
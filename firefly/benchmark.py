@@ -0,0 +1,160 @@
+"""Tools for tracking how long Firefly takes to do things.
+
+Timings are recorded with a :py:class:`BenchmarkRecorder`, and saved
+as runs in a JSON history file. The latest run can then be compared
+against earlier runs to look for regressions:
+
+.. code-block:: bash
+
+    $ python -m firefly.benchmark compare benchmarks/history.json --threshold 0.2
+
+"""
+import argparse
+import datetime as dt
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, Sequence, Optional
+
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline: float
+    latest: float
+
+    @property
+    def ratio(self) -> float:
+        return self.latest / self.baseline
+
+    def __str__(self):
+        return (f"{self.name}: {self.latest:.3f} s vs {self.baseline:.3f} s "
+                f"({self.ratio - 1:+.0%})")
+
+
+class BenchmarkRecorder:
+    """Collect timings for a single benchmark run."""
+
+    def __init__(self):
+        self.results = {}
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time the body of a ``with`` statement and save it as *name*."""
+        t0 = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - t0)
+
+    def record(self, name: str, duration: float):
+        log.info(f"Benchmark {name}: {duration:.3f} s")
+        self.results[name] = duration
+
+    def save(self, history_file: Path):
+        """Add the results of this run to a JSON history file."""
+        history = load_history(history_file)
+        history.append({
+            "timestamp": dt.datetime.now().isoformat(),
+            "commit": git_commit(),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "results": self.results,
+        })
+        history_file = Path(history_file)
+        history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(history_file, mode="w") as fd:
+            json.dump(history, fd, indent=2)
+
+
+def git_commit() -> Optional[str]:
+    """The git commit of the firefly source, if available."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                cwd=Path(__file__).parent, capture_output=True,
+                                text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def load_history(history_file: Path) -> list:
+    history_file = Path(history_file)
+    if not history_file.exists():
+        return []
+    with open(history_file, mode="r") as fd:
+        return json.load(fd)
+
+
+def compare(history: Sequence[Mapping], threshold: float = 0.2,
+            num_baseline: int = 5) -> list:
+    """Compare the latest run against the ones before it.
+
+    Parameters
+    ==========
+    history
+      Benchmark runs, oldest first, as saved by
+      :py:meth:`BenchmarkRecorder.save`.
+    threshold
+      Fractional slow-down that counts as a regression (0.2 → 20%
+      slower).
+    num_baseline
+      How many previous runs to use for the baseline. The baseline
+      is their median, so one noisy run doesn't hide a regression.
+
+    Returns
+    =======
+    regressions
+      A :py:class:`Regression` for each benchmark that got slower.
+
+    """
+    if len(history) < 2:
+        return []
+    *previous, latest = history
+    previous = previous[-num_baseline:]
+    regressions = []
+    for name, duration in latest["results"].items():
+        old_durations = [run["results"][name] for run in previous
+                         if name in run["results"]]
+        if len(old_durations) == 0:
+            continue
+        baseline = statistics.median(old_durations)
+        if duration > baseline * (1 + threshold):
+            regressions.append(Regression(name=name, baseline=baseline, latest=duration))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Firefly performance benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare_parser = subparsers.add_parser(
+        "compare", help="Check the latest benchmark run for regressions.")
+    compare_parser.add_argument("history_file", type=Path,
+                                help="JSON file with the benchmark history.")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="Fractional slow-down to report (default: 0.2).")
+    compare_parser.add_argument("--baseline-runs", type=int, default=5,
+                                help="Number of previous runs to compare against.")
+    args = parser.parse_args(argv)
+    history = load_history(args.history_file)
+    regressions = compare(history, threshold=args.threshold,
+                          num_baseline=args.baseline_runs)
+    if len(history) < 2:
+        print(f"Not enough benchmark runs in {args.history_file} to compare.")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if len(history) >= 2 and len(regressions) == 0:
+        print("No regressions found.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
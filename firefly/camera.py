@@ -1,22 +1,45 @@
 from enum import IntEnum
 from pathlib import Path
+from functools import partial
 import datetime as dt
-import subprocess
 import logging
 import os
 
-import haven
 # from pydm.data_plugins.epics_plugin import EPICSPlugin
-from pydm.widgets.channel import PyDMChannel
-from qtpy.QtGui import QColor
-from qtpy.QtCore import Slot
+from qtpy.QtGui import QColor, QPixmap
+from qtpy.QtCore import Qt, Slot
+from qtpy.QtWidgets import QLabel
 
 from firefly import display
+from firefly.channels import SharedChannel
+from firefly.config import get_config
+from firefly.external_tools import tool_launcher
+from firefly.image_processing import FrameDecoder, to_qimage
 
 
 log = logging.getLogger(__name__)
 
 
+def imagej_command() -> list:
+    return [get_config()["camera"]["imagej_command"]]
+
+
+def imagej_env() -> dict:
+    env = os.environ.copy()
+    env["EPICS_CA_ARRAY_MAX_BYTES"] = "10000000"
+    return env
+
+
+def prewarm_imagej():
+    """Start ImageJ in the background so the AD viewer opens faster.
+
+    Only useful if ImageJ's single-instance listener is enabled, so
+    that later launches are handed to this instance.
+
+    """
+    tool_launcher().prewarm("imagej", imagej_command(), env=imagej_env())
+
+
 class DetectorStates(IntEnum):
     IDLE = 0
     ACQUIRE = 1
@@ -36,6 +59,61 @@ class AcquireStates(IntEnum):
     ACQUIRE = 1
 
 
+class CameraThumbnail(QLabel):
+    """A small, live picture from an areaDetector image plugin.
+
+    Frames are decoded on a worker pool by a
+    :py:class:`~firefly.image_processing.FrameDecoder`, so frames are
+    dropped rather than piling up if the GUI falls behind.
+
+    Parameters
+    ==========
+    prefix
+      PV prefix of the areaDetector IOC, e.g. "25idgigeB:".
+    plugin
+      Name of the NDStdArrays plugin to watch.
+
+    """
+    _frame = None
+
+    def __init__(self, prefix: str, plugin: str = "image1", parent=None):
+        super().__init__(parent=parent)
+        self.setAlignment(Qt.AlignCenter)
+        self.setText("No image")
+        self._dimensions = 2
+        self._sizes = [0, 0, 0]
+        self.decoder = FrameDecoder(parent=self)
+        self.decoder.frame_ready.connect(self.show_frame)
+        pv = f"{prefix}{plugin}:"
+        self._channels = [
+            SharedChannel(f"{pv}NDimensions_RBV", value_slot=self.update_dimensions),
+            SharedChannel(f"{pv}ArraySize0_RBV", value_slot=partial(self.update_size, 0)),
+            SharedChannel(f"{pv}ArraySize1_RBV", value_slot=partial(self.update_size, 1)),
+            SharedChannel(f"{pv}ArraySize2_RBV", value_slot=partial(self.update_size, 2)),
+            SharedChannel(f"{pv}ArrayData", value_slot=self.update_frame),
+        ]
+
+    def channels(self):
+        # PyDM (dis)connects these along with the rest of the display
+        return self._channels
+
+    def update_dimensions(self, dimensions):
+        self._dimensions = int(dimensions)
+
+    def update_size(self, axis, size):
+        self._sizes[axis] = int(size)
+
+    def update_frame(self, data):
+        if min(self._sizes[:3 if self._dimensions == 3 else 2]) <= 0:
+            return
+        self.decoder.submit(data, dimensions=self._dimensions, sizes=self._sizes)
+
+    def show_frame(self, frame):
+        # Keep a reference since the QImage shares the frame's memory
+        self._frame = frame
+        self.setPixmap(QPixmap.fromImage(to_qimage(frame)))
+
+
 class CameraDisplay(display.FireflyDisplay):
     prefix: str = ""
     properties_file: Path = Path("~/EPICS_AD_Viewer.properties").expanduser()
@@ -50,7 +128,7 @@ class CameraDisplay(display.FireflyDisplay):
         for ch in byte.channels():
             ch.disconnect()
         # Channel for watching the detector state
-        self.detector_state = PyDMChannel(
+        self.detector_state = SharedChannel(
             address=self.camera_status_label.channel,
             connection_slot=self.update_camera_connection,
             value_slot=self.update_camera_state,
@@ -69,6 +147,9 @@ class CameraDisplay(display.FireflyDisplay):
     def customize_ui(self):
         self.imageJ_button.clicked.connect(self.launch_imageJ)
         self.caqtdm_button.clicked.connect(self.launch_caqtdm)
+        # Live picture from the camera
+        self.thumbnail = CameraThumbnail(prefix=self.prefix, parent=self)
+        self.ui.verticalLayout.addWidget(self.thumbnail)
 
     def launch_caqtdm(self):
         # Determine for which IOC to launch caQtDM panels
@@ -77,11 +158,20 @@ class CameraDisplay(display.FireflyDisplay):
         cmd = f"start_{prefix}_caqtdm"
         # Launch caQtDM for the given IOC
         log.info(f"Launching caQtDM: {cmd}")
-        self.caqtdm_process = subprocess.Popen(cmd)
+        self.caqtdm_process = tool_launcher().launch("caqtdm", [cmd], macros={"PREFIX": prefix})
 
     def launch_imageJ(self):
         # Set the imageJ properties file
         prefix = self.macros()["PREFIX"]
+        launcher = tool_launcher()
+        existing = launcher.find("imagej", macros={"PREFIX": prefix})
+        if existing is not None:
+            # Don't change the properties file under a running viewer.
+            # With a pre-started ImageJ, only the most recently launched
+            # camera is found here, since every camera shares that
+            # one process (and one properties file).
+            self.imagej_process = launcher.launch("imagej", existing.cmds, macros={"PREFIX": prefix})
+            return
         with open(self.properties_file, mode='w') as fd:
             fd.write("#EPICS_AD_Viewer Properties\n")
             # Write a line to match "#Fri Nov 04 15:44:30 CDT 2022"
@@ -91,12 +181,10 @@ class CameraDisplay(display.FireflyDisplay):
             prefix_str = prefix.replace(':', '\\:')
             fd.write(f"PVPrefix={prefix_str}image1\\:\n")
         # Launch ImageJ with AD viewer plugin
-        imagej_env = os.environ.copy()
-        imagej_env["EPICS_CA_ARRAY_MAX_BYTES"] = "10000000"
-        imagej_cmd = haven.load_config()["camera"]["imagej_command"]
-        cmds = [imagej_cmd, "--run", "EPICS_AD_Viewer"]
+        cmds = [*imagej_command(), "--run", "EPICS_AD_Viewer"]
         log.info(f"Launching ImageJ: {cmds}")
-        self.imagej_process = subprocess.Popen(cmds, env=imagej_env)
+        self.imagej_process = launcher.launch("imagej", cmds, macros={"PREFIX": prefix},
+                                              env=imagej_env())
 
     @Slot(int)
     def update_camera_state(self, new_state):
@@ -1,7 +1,10 @@
 import json
 import logging
+from collections import OrderedDict
 
 from pydm.widgets import PyDMEmbeddedDisplay
+from pydm.utilities import establish_widget_connections, close_widget_connections
+from qtpy.QtCore import QRect, QTimer
 import haven
 
 from firefly import display
@@ -10,12 +13,28 @@ from firefly import display
 log = logging.getLogger(__name__)
 
 class CamerasDisplay(display.FireflyDisplay):
+    """A scrolling list of all the cameras.
+
+    Camera displays are only loaded once they scroll into view, and
+    their channels are disconnected again when they scroll out of
+    view. At most *max_loaded_displays* camera displays are kept
+    loaded, beyond the ones that are currently visible.
+
+    """
     _camera_displays = []
+    _update_timer = None
+    # How many out-of-view camera displays to keep loaded
+    max_loaded_displays: int = 6
+    # Height to reserve for a camera whose display is not loaded
+    placeholder_height: int = 74
 
     def __init__(self, args=None, macros={}, **kwargs):
         self._camera_displays = []
+        # Indices of loaded camera displays, least recently seen first
+        self._loaded = OrderedDict()
+        self._visible = set()
         super().__init__(args=args, macros=macros, **kwargs)
-    
+
     def customize_ui(self):
         # Delete existing camera widgets
         for idx in reversed(range(self.cameras_layout.count())):
@@ -32,10 +51,87 @@ class CamerasDisplay(display.FireflyDisplay):
                 "PREFIX": cam.prefix,
                 "DESC": cam.description,
             })
-            disp.filename = 'camera.py'
+            # The file gets set once the camera scrolls into view
+            disp.setMinimumHeight(self.placeholder_height)
             # Add the Embedded Display to the Results Layout
             self.cameras_layout.addWidget(disp)
             self._camera_displays.append(disp)
+        self.cameras_layout.addStretch()
+        # Update which cameras are loaded as the user scrolls
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.update_visible_cameras)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_update)
+
+    def schedule_update(self):
+        """Update the loaded cameras once the event loop is free."""
+        if self._update_timer is not None:
+            self._update_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_update()
+
+    def visible_cameras(self) -> set:
+        """Indices of the camera displays that are scrolled into view."""
+        if not self.isVisible():
+            return set()
+        contents = self.scroll_area.widget()
+        viewport = self.scroll_area.viewport()
+        view_rect = QRect(-contents.x(), -contents.y(), viewport.width(), viewport.height())
+        return {idx for idx, disp in enumerate(self._camera_displays)
+                if disp.geometry().intersects(view_rect)}
+
+    def update_visible_cameras(self):
+        """Load cameras that are in view, and pause the rest."""
+        visible = self.visible_cameras()
+        for idx in sorted(visible):
+            self.load_camera(idx)
+        for idx in self._visible - visible:
+            self.pause_camera(idx)
+        self._visible = visible
+        # Unload the cameras that have been out of view the longest
+        max_loaded = len(visible) + self.max_loaded_displays
+        for idx in list(self._loaded.keys()):
+            if len(self._loaded) <= max_loaded:
+                break
+            if idx not in visible:
+                self.unload_camera(idx)
+
+    def load_camera(self, idx: int):
+        """Load a camera's display, or resume its channels."""
+        disp = self._camera_displays[idx]
+        if idx in self._loaded:
+            self._loaded.move_to_end(idx)
+            if idx not in self._visible and disp.embedded_widget is not None:
+                establish_widget_connections(disp.embedded_widget)
+        else:
+            log.debug(f"Loading camera display {idx}")
+            disp.filename = "camera.py"
+            self._loaded[idx] = disp
+
+    def pause_camera(self, idx: int):
+        """Disconnect the channels of a camera that is out of view."""
+        disp = self._camera_displays[idx]
+        if disp.embedded_widget is not None:
+            close_widget_connections(disp.embedded_widget)
+
+    def unload_camera(self, idx: int):
+        """Remove a camera's display, keeping its space in the list."""
+        log.debug(f"Unloading camera display {idx}")
+        disp = self._loaded.pop(idx)
+        # Keep the same size so the list doesn't jump around
+        disp.setMinimumHeight(disp.height())
+        disp.filename = ""
+
+    @property
+    def loaded_cameras(self) -> list:
+        """Indices of the camera displays that are currently loaded."""
+        return sorted(self._loaded.keys())
 
     def ui_filename(self):
         return "cameras.ui"
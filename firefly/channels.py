@@ -0,0 +1,180 @@
+"""Share one subscription per PV between all of Firefly's windows.
+
+A :py:class:`SharedChannel` is a drop-in replacement for
+:py:class:`pydm.widgets.channel.PyDMChannel`. Instead of connecting
+directly to the data plugin, it registers as a listener with the
+:py:data:`channel_registry`. The registry keeps one real channel per
+address, passes each new value on to every listener, and closes the
+real channel when the last listener disconnects.
+
+.. code-block:: python
+
+    from firefly.channels import SharedChannel
+
+    ch = SharedChannel("25idc:scaler1.S2", value_slot=self.update_value)
+    ch.connect()
+
+"""
+import time
+import logging
+from dataclasses import dataclass
+from functools import partial
+from typing import Mapping
+
+from pydm.widgets.channel import PyDMChannel
+
+
+log = logging.getLogger(__name__)
+
+
+# Slots on a PyDMChannel that get passed on to each listener
+slot_names = [
+    "connection_slot",
+    "value_slot",
+    "severity_slot",
+    "write_access_slot",
+    "enum_strings_slot",
+    "unit_slot",
+    "prec_slot",
+    "upper_ctrl_limit_slot",
+    "lower_ctrl_limit_slot",
+]
+
+
+@dataclass(frozen=True)
+class ChannelStats:
+    """A snapshot of the channels in the registry.
+
+    Parameters
+    ==========
+    num_pvs
+      How many PVs have an open subscription.
+    num_listeners
+      How many channels are listening to those PVs.
+    update_rate
+      Value updates per second for all the PVs since the last
+      snapshot.
+    pv_rates
+      Value updates per second for each PV, by address.
+
+    """
+    num_pvs: int
+    num_listeners: int
+    update_rate: float
+    pv_rates: Mapping[str, float]
+
+
+class _SharedSource:
+    """The one real channel for a given address."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.listeners = []
+        # Latest arguments for each slot, to catch up new listeners
+        self.latest = {}
+        self.num_updates = 0
+        slots = {name: partial(self.fan_out, name) for name in slot_names}
+        self.channel = PyDMChannel(address=address, **slots)
+
+    def fan_out(self, slot_name: str, *args):
+        self.latest[slot_name] = args
+        if slot_name == "value_slot":
+            self.num_updates += 1
+        for listener in list(self.listeners):
+            slot = getattr(listener, slot_name, None)
+            if slot is not None:
+                slot(*args)
+
+    def add_listener(self, listener: PyDMChannel):
+        self.listeners.append(listener)
+        # Give the new listener the current state of the PV
+        for slot_name, args in self.latest.items():
+            slot = getattr(listener, slot_name, None)
+            if slot is not None:
+                slot(*args)
+
+
+class ChannelRegistry:
+    """Keeps track of shared channels, one subscription per address."""
+
+    def __init__(self):
+        self._sources = {}
+        self._last_stats = (time.monotonic(), {})
+
+    def subscribe(self, listener: PyDMChannel):
+        """Start passing values for *listener*'s address on to its slots."""
+        address = listener.address
+        if not address:
+            return
+        source = self._sources.get(address)
+        if source is None:
+            log.debug(f"Opening shared channel: {address}")
+            source = self._sources[address] = _SharedSource(address)
+            source.channel.connect()
+        if any(other is listener for other in source.listeners):
+            return
+        source.add_listener(listener)
+
+    def unsubscribe(self, listener: PyDMChannel):
+        """Stop sending values to *listener*.
+
+        The subscription is closed if *listener* was the last one for
+        its address.
+
+        """
+        source = self._sources.get(listener.address)
+        if source is None:
+            return
+        source.listeners = [other for other in source.listeners if other is not listener]
+        if len(source.listeners) == 0:
+            log.debug(f"Closing shared channel: {source.address}")
+            source.channel.disconnect()
+            del self._sources[source.address]
+
+    def listeners(self, address: str) -> list:
+        """The channels currently listening to *address*."""
+        source = self._sources.get(address)
+        return [] if source is None else list(source.listeners)
+
+    def stats(self) -> ChannelStats:
+        """Count the open PVs and listeners, and how fast they update.
+
+        Rates are calculated since the previous call to this method.
+
+        """
+        now = time.monotonic()
+        last_time, last_counts = self._last_stats
+        elapsed = max(now - last_time, 1e-9)
+        counts = {address: source.num_updates for address, source in self._sources.items()}
+        pv_rates = {address: (count - last_counts.get(address, 0)) / elapsed
+                    for address, count in counts.items()}
+        self._last_stats = (now, counts)
+        return ChannelStats(
+            num_pvs=len(self._sources),
+            num_listeners=sum(len(s.listeners) for s in self._sources.values()),
+            update_rate=sum(pv_rates.values()),
+            pv_rates=pv_rates,
+        )
+
+
+channel_registry = ChannelRegistry()
+
+
+class SharedChannel(PyDMChannel):
+    """A PyDM channel that shares its subscription with other windows.
+
+    Channels that write values (i.e. have a *value_signal*) are
+    connected directly, like a regular :py:class:`PyDMChannel`.
+
+    """
+    registry: ChannelRegistry = channel_registry
+
+    def connect(self):
+        if self.value_signal is not None:
+            return super().connect()
+        self.registry.subscribe(self)
+
+    def disconnect(self, destroying=False):
+        if self.value_signal is not None:
+            return super().disconnect(destroying=destroying)
+        self.registry.unsubscribe(self)
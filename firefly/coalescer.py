@@ -0,0 +1,66 @@
+import time
+import logging
+from typing import Callable
+
+from qtpy.QtCore import QObject, QTimer
+
+
+log = logging.getLogger(__name__)
+
+
+class UpdateCoalescer(QObject):
+    """Limit how often a GUI update runs.
+
+    Call :py:meth:`request` whenever the underlying data
+    changes. *callback* runs right away if it hasn't run recently,
+    otherwise once at the end of the current interval. Requests in
+    between are merged into that one update, and counted in
+    *dropped*.
+
+    If *callback* returns ``False``, nothing was redrawn, so the next
+    request is allowed to run right away.
+
+    Parameters
+    ==========
+    callback
+      Function that does the (expensive) update.
+    max_rate
+      Most times per second to run *callback*.
+
+    """
+    updates: int = 0
+    dropped: int = 0
+    _pending: bool = False
+
+    def __init__(self, callback: Callable, max_rate: float = 10, parent=None):
+        super().__init__(parent=parent)
+        self.callback = callback
+        self.interval = 1 / max_rate
+        self._last_run = -float("inf")
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def request(self):
+        """Ask for the callback to be run soon."""
+        if self._pending:
+            self.dropped += 1
+            return
+        wait = self._last_run + self.interval - time.monotonic()
+        if wait <= 0:
+            self._run()
+        else:
+            self._pending = True
+            self._timer.start(int(wait * 1000))
+
+    def flush(self):
+        """Run the callback now if there is a pending request."""
+        self._timer.stop()
+        if self._pending:
+            self._run()
+
+    def _run(self):
+        self._pending = False
+        if self.callback() is not False:
+            self._last_run = time.monotonic()
+            self.updates += 1
@@ -0,0 +1,177 @@
+"""Shared, read-only access to the beamline configuration.
+
+Parsing the TOML configuration files is slow enough to notice on hot
+paths (e.g. every time a window title changes), so Firefly parses
+them once and hands out an immutable snapshot. The files are watched
+for changes, and *config_changed* is emitted with the new snapshot
+when they get reloaded.
+
+.. code-block:: python
+
+    from firefly.config import get_config, config_service
+
+    beamline = get_config()["beamline"]["name"]
+    config_service().config_changed.connect(self.update_title)
+
+The files to watch are listed in the ``FIREFLY_CONFIG_FILES``
+environment variable, separated by ``os.pathsep`` (e.g.
+``~/bluesky/iconfig.toml:/local/25idc/iconfig.toml``). This should
+match the files haven is set up to read. If it is not set, the
+configuration is still parsed once but is not reloaded when the files
+change.
+
+"""
+import os
+import logging
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, Sequence
+
+from qtpy.QtCore import QCoreApplication, QFileSystemWatcher, QObject, QTimer, Signal
+import haven
+
+
+log = logging.getLogger(__name__)
+
+
+def config_files() -> list:
+    """The configuration files listed in ``FIREFLY_CONFIG_FILES``."""
+    files = os.environ.get("FIREFLY_CONFIG_FILES", "")
+    return [Path(fp).expanduser() for fp in files.split(os.pathsep) if fp]
+
+
+def freeze(obj):
+    """Make a read-only copy of nested dictionaries and lists."""
+    if isinstance(obj, Mapping):
+        return MappingProxyType({key: freeze(val) for key, val in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(val) for val in obj)
+    return obj
+
+
+def _file_stat(fp: Path) -> Optional[tuple]:
+    """Enough of a file's status to tell if it has been changed."""
+    try:
+        stat = fp.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _load_haven_config():
+    # Make sure haven re-reads the files if it caches the result
+    cache_clear = getattr(haven.load_config, "cache_clear", None)
+    if cache_clear is not None:
+        cache_clear()
+    return haven.load_config()
+
+
+class ConfigService(QObject):
+    """Parse the configuration once, and reload it when the files change.
+
+    Parameters
+    ==========
+    files
+      Configuration files to watch. Defaults to the files listed in
+      the ``FIREFLY_CONFIG_FILES`` environment variable.
+    loader
+      Called with no arguments to parse the configuration.
+
+    """
+    # How long to wait for the files to stop changing before reloading (ms)
+    reload_delay: int = 250
+
+    config_changed = Signal(object)
+
+    def __init__(self, files: Optional[Sequence[Path]] = None,
+                 loader: Callable = _load_haven_config, parent=None):
+        super().__init__(parent=parent)
+        self.files = config_files() if files is None else [Path(fp) for fp in files]
+        self.loader = loader
+        self._config = freeze(self.loader())
+        # Editors often save a file in several steps, so wait a bit
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.reload_delay)
+        self._reload_timer.timeout.connect(self.reload)
+        self._file_stats = {}
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.schedule_reload)
+        self.watcher.directoryChanged.connect(self.check_directory)
+        self.watch_files()
+
+    def schedule_reload(self, path: str = ""):
+        """Reload the configuration once the files stop changing."""
+        self._reload_timer.start()
+
+    def check_directory(self, path: str):
+        """Reload if one of the config files in directory *path* changed.
+
+        The directory is only watched to notice config files that are
+        created or replaced, so changes to other files are ignored.
+
+        """
+        directory = Path(path)
+        for fp in self.files:
+            if fp.parent == directory and _file_stat(fp) != self._file_stats.get(fp):
+                self.schedule_reload()
+                return
+
+    @property
+    def config(self) -> Mapping:
+        """The current, read-only, configuration."""
+        return self._config
+
+    def watch_files(self):
+        """Make sure all the config files are being watched.
+
+        Files that are replaced when saved stop being watched, and
+        new files only show up as a change to their directory.
+
+        """
+        self._file_stats = {fp: _file_stat(fp) for fp in self.files}
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        paths = [fp for fp in self.files if fp.exists()]
+        paths += list({fp.parent for fp in self.files if fp.parent.exists()})
+        new_paths = [str(fp) for fp in paths if str(fp) not in watched]
+        if len(new_paths) > 0:
+            self.watcher.addPaths(new_paths)
+
+    def reload(self):
+        """Parse the configuration files again.
+
+        *config_changed* is only emitted if the configuration is
+        different.
+
+        """
+        self.watch_files()
+        try:
+            new_config = freeze(self.loader())
+        except Exception as e:
+            log.warning(f"Could not reload configuration: {e}")
+            return
+        if new_config == self._config:
+            return
+        log.info("Configuration files changed, reloading.")
+        self._config = new_config
+        self.config_changed.emit(new_config)
+
+
+_config_service = None
+
+
+def config_service() -> ConfigService:
+    """The configuration service shared by the whole application."""
+    global _config_service
+    if _config_service is None:
+        _config_service = ConfigService()
+        # Keep the file watcher with the GUI, not a worker thread
+        app = QCoreApplication.instance()
+        if app is not None:
+            _config_service.moveToThread(app.thread())
+    return _config_service
+
+
+def get_config() -> Mapping:
+    """A read-only snapshot of the current beamline configuration."""
+    return config_service().config
@@ -1,16 +1,67 @@
-import subprocess
+import threading
 from pathlib import Path
+from typing import Tuple
 
 from pydm import Display
 
+from .tracing import trace
+from .external_tools import tool_launcher
+
+try:
+    from pydm.display import _compile_ui_file, _load_compiled_ui_into_display
+except ImportError:
+    # Older versions of pydm load .ui files with uic directly
+    _compile_ui_file = None
+
+
+# Compiled .ui files, keyed by (path, modification time)
+_ui_cache = {}
+_ui_cache_lock = threading.Lock()
+
+
+def compile_ui_file(ui_file: str) -> Tuple[str, str]:
+    """Compile a Qt .ui file to python source code.
+
+    The results are cached, so each .ui file is only parsed once
+    unless it is modified on disk.
+
+    Returns
+    =======
+    code_string
+      The python source code for the UI class, before macro
+      substitution.
+    class_name
+      The name of the UI class in *code_string*.
+
+    """
+    ui_file = str(Path(ui_file).resolve())
+    key = (ui_file, Path(ui_file).stat().st_mtime_ns)
+    with _ui_cache_lock:
+        if key not in _ui_cache:
+            # Drop stale versions of this file
+            for old_key in [k for k in _ui_cache.keys() if k[0] == ui_file]:
+                del _ui_cache[old_key]
+            _ui_cache[key] = _compile_ui_file(ui_file)
+        return _ui_cache[key]
+
 
 class FireflyDisplay(Display):
     caqtdm_ui_file: str = ""
     caqtdm_command: str = "/APSshare/bin/caQtDM -style plastique -noMsg"
     def __init__(self, parent=None, args=None, macros=None, ui_filename=None, **kwargs):
         super().__init__(parent=parent, args=args, macros=macros, ui_filename=ui_filename, **kwargs)
-        self.customize_device()
-        self.customize_ui()
+        name = type(self).__name__
+        with trace(f"{name}.customize_device", category="displays"):
+            self.customize_device()
+        with trace(f"{name}.customize_ui", category="displays"):
+            self.customize_ui()
+
+    def load_ui_from_file(self, ui_file_path: str, macros=None):
+        """Load the .ui file into this display, re-using compiled UI code."""
+        if _compile_ui_file is None:
+            return super().load_ui_from_file(ui_file_path, macros)
+        code_string, class_name = compile_ui_file(ui_file_path)
+        _load_compiled_ui_into_display(code_string, class_name, self, macros)
 
     def launch_caqtdm(self, macros={}, ui_file: str = None):
         """Launch a caQtDM window showing the window's panel."""
@@ -19,7 +70,8 @@ class FireflyDisplay(Display):
         cmds = self.caqtdm_command.split()
         macro_str = ",".join(f"{key}={val}" for key, val in macros.items())
         cmds = [*cmds, "-macro", macro_str, ui_file]
-        subprocess.Popen(cmds)
+        # Raise the panel instead if it's already open
+        tool_launcher().launch("caqtdm", cmds, macros={**macros, "ui_file": ui_file})
 
     def customize_device(self):
         pass
@@ -2,10 +2,11 @@ import logging
 
 from qtpy import QtWidgets, QtCore
 from bluesky_queueserver_api import BPlan
-from haven import registry, load_config
-from xraydb.xraydb import XrayDB
+from haven import registry
 
 from firefly import display
+from firefly.xray_edges import load_edge_index
+from firefly.config import get_config
 
 
 log = logging.getLogger(__name__)
@@ -28,12 +29,12 @@ class EnergyDisplay(display.FireflyDisplay):
         energy = registry.find(name="energy")
         _macros["ID_ENERGY_PV"] = _macros.get("ID_ENERGY_PV", f"{energy.id_prefix}:Energy.VAL")
         _macros["ID_GAP_PV"] = _macros.get("ID_GAP_PV", f"{energy.id_prefix}:Gap.VAL")
-        # Load X-ray database for calculating edge energies
-        self.xraydb = XrayDB()
+        # Load X-ray edges for the combo box
+        self.edges = load_edge_index().filter(self.min_energy, self.max_energy)
         super().__init__(args=args, macros=_macros, **kwargs)
 
     def launch_mono_caqtdm(self):
-        config = load_config()
+        config = get_config()
         display_macros = self.macros()
         prefix = config["monochromator"]["ioc"] + ":"
         caqtdm_macros = {
@@ -49,7 +50,7 @@ class EnergyDisplay(display.FireflyDisplay):
 
     def launch_id_caqtdm(self):
         """Launch the pre-built caQtDM UI file for the ID."""
-        config = load_config()
+        config = get_config()
         prefix = config["undulator"]["ioc"]
         # Strip leading "ID" from the mono IOC since caQtDM adds it
         prefix = prefix.strip("ID")
@@ -77,35 +78,24 @@ class EnergyDisplay(display.FireflyDisplay):
         self.ui.set_energy_button.clicked.connect(self.set_energy)
         # Set up the combo box with X-ray energies
         combo_box = self.ui.edge_combo_box
-        ltab = self.xraydb.tables['xray_levels']
-        edges = self.xraydb.query(ltab)
-        edges = edges.filter(ltab.c.absorption_edge < self.max_energy,
-                             ltab.c.absorption_edge > self.min_energy)
-        items = [f"{r.element} {r.iupac_symbol} ({int(r.absorption_edge)} eV)"
-                 for r in edges.all()]
-        combo_box.addItems(["Select edge…", *items])
-        print("CUstomizing", combo_box, self.select_edge)
+        combo_box.addItems(["Select edge…", *self.edges.labels()])
         combo_box.activated.connect(self.select_edge)
 
     @QtCore.Slot(int)
     def select_edge(self, index):
-        print("Selecting edge")
         if index == 0:
             # The placeholder text was selected
             return
-        # Parse the combo box text to get the selected edge
+        # Determine which energy was selected (skipping the placeholder)
         combo_box = self.ui.edge_combo_box
-        text = combo_box.itemText(index)
-        elem, edge = text.replace(" ", "_").split("_")[:2]
-        # Determine which energy was selected
-        edge_info = self.xraydb.xray_edge(element=elem, edge=edge)
-        if edge_info is None:
+        try:
+            edge = self.edges[index - 1]
+        except IndexError:
             # Edge is not recognized, so provide feedback
             combo_box.setStyleSheet(self.stylesheet_danger)
         else:
-            # Set the text field to the selected edge's energy            
-            energy, fyield, edge_jump = edge_info
-            self.ui.target_energy_lineedit.setText(f"{energy:.3f}")
+            # Set the text field to the selected edge's energy
+            self.ui.target_energy_lineedit.setText(f"{edge['energy']:.3f}")
             combo_box.setStyleSheet(self.stylesheet_normal)
 
     def ui_filename(self):
@@ -0,0 +1,261 @@
+"""Launch and keep track of external tools (caQtDM, ImageJ, etc.).
+
+Each launch is keyed by the tool and its macros, so asking for the
+same panel again raises the window that is already open instead of
+starting another copy. Finished processes are reaped periodically,
+and the launcher keeps a table of what is running along with some
+launch-latency statistics.
+
+.. code-block:: python
+
+    from firefly.external_tools import tool_launcher
+
+    tool_launcher().launch("caqtdm", ["caQtDM", "-macro", "P=25idc:", "motor.ui"],
+                           macros={"P": "25idc:", "ui_file": "motor.ui"})
+
+"""
+import time
+import shutil
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from typing import Mapping, Optional, Sequence
+
+from qtpy.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+
+log = logging.getLogger(__name__)
+
+
+def process_key(tool: str, macros: Optional[Mapping] = None) -> tuple:
+    """A hashable key identifying one instance of *tool*."""
+    macros = {} if macros is None else macros
+    return (tool, tuple(sorted((str(key), str(val)) for key, val in macros.items())))
+
+
+@dataclass
+class ToolProcess:
+    tool: str
+    key: tuple
+    popen: subprocess.Popen = field(repr=False)
+    cmds: Sequence[str] = ()
+    started: float = 0
+    warm: bool = False
+
+    @property
+    def pid(self) -> int:
+        return self.popen.pid
+
+    @property
+    def running(self) -> bool:
+        return self.popen.poll() is None
+
+
+@dataclass
+class ToolStats:
+    launches: int = 0
+    reuses: int = 0
+    failures: int = 0
+    last_latency: float = 0
+    total_latency: float = 0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.launches if self.launches else 0
+
+
+class ToolLauncher(QObject):
+    """Start external tools, re-using instances that are still running.
+
+    Parameters
+    ==========
+    reap_interval
+      How often to check for processes that have finished (ms).
+
+    """
+    # Emitted with the tool name and its process ID
+    process_started = Signal(str, int)
+    # Emitted with the tool name and its exit code
+    process_finished = Signal(str, int)
+    # Emitted with the tool name and the error message
+    launch_failed = Signal(str, str)
+
+    def __init__(self, reap_interval: int = 1000, parent=None):
+        super().__init__(parent=parent)
+        self._processes = {}
+        self._warm = {}
+        # Short-lived processes we only need to clean up after
+        self._helpers = []
+        self._stats = {}
+        self._reap_timer = QTimer(self)
+        self._reap_timer.setInterval(reap_interval)
+        self._reap_timer.timeout.connect(self.reap)
+
+    def stats(self, tool: str) -> ToolStats:
+        """Launch statistics for *tool*."""
+        return self._stats.setdefault(tool, ToolStats())
+
+    def processes(self) -> list:
+        """The tool processes that are currently known to be running."""
+        self.reap()
+        procs = list(self._processes.values()) + list(self._warm.values())
+        # Warm processes that have been handed out show up twice
+        unique = {id(proc): proc for proc in procs}
+        return list(unique.values())
+
+    def find(self, tool: str, macros: Optional[Mapping] = None) -> Optional[ToolProcess]:
+        """The running instance of *tool* with *macros*, if there is one."""
+        proc = self._processes.get(process_key(tool, macros))
+        if proc is not None and proc.running:
+            return proc
+        return None
+
+    def launch(self, tool: str, cmds: Sequence[str], macros: Optional[Mapping] = None,
+               env: Optional[Mapping] = None) -> Optional[ToolProcess]:
+        """Start *tool*, or raise its window if it's already running.
+
+        Parameters
+        ==========
+        tool
+          Name of the tool, used for de-duplicating and statistics.
+        cmds
+          The command line to run.
+        macros
+          Identify this instance of the tool. If an instance with the
+          same tool and macros is still running, it is raised instead
+          of starting a new one.
+        env
+          Environment variables for the new process.
+
+        Returns
+        =======
+        process
+          The process showing the tool, or ``None`` if it could not
+          be started.
+
+        """
+        stats = self.stats(tool)
+        existing = self.find(tool, macros)
+        if existing is not None:
+            log.info(f"{tool} already running (pid {existing.pid}), raising window.")
+            stats.reuses += 1
+            self.raise_window(existing)
+            return existing
+        key = process_key(tool, macros)
+        warm = self._warm.get(tool)
+        if warm is not None and not warm.running:
+            # The warm instance died, so start a normal process instead
+            self._warm.pop(tool)
+            warm = None
+        t0 = time.perf_counter()
+        try:
+            popen = subprocess.Popen(list(cmds), env=None if env is None else dict(env))
+        except OSError as e:
+            log.error(f"Could not launch {tool}: {e}")
+            stats.failures += 1
+            self.launch_failed.emit(tool, str(e))
+            return None
+        latency = time.perf_counter() - t0
+        stats.launches += 1
+        stats.last_latency = latency
+        stats.total_latency += latency
+        log.info(f"Launched {tool} (pid {popen.pid}) in {latency * 1000:.1f} ms: {cmds}")
+        if warm is not None:
+            # The new process hands its command to the warm instance and
+            # quits. The warm instance only shows one viewer at a time,
+            # so it no longer counts as running for earlier macros.
+            self._helpers.append(popen)
+            proc = warm
+            for other_key, other in list(self._processes.items()):
+                if other is warm:
+                    del self._processes[other_key]
+        else:
+            proc = ToolProcess(tool=tool, key=key, popen=popen, cmds=tuple(cmds),
+                               started=time.monotonic())
+        self._processes[key] = proc
+        self.process_started.emit(tool, proc.pid)
+        self._reap_timer.start()
+        return proc
+
+    def prewarm(self, tool: str, cmds: Sequence[str],
+                env: Optional[Mapping] = None) -> Optional[ToolProcess]:
+        """Start an instance of *tool* in advance.
+
+        Later launches of *tool* are still run, but are expected to
+        pass their command to the warm instance (e.g. ImageJ's
+        single-instance listener), which skips the slow start-up.
+
+        The warm instance is assumed to show one set of macros at a
+        time: each launch handed to it replaces the previous one, so
+        :py:meth:`find` only returns it for the most recent macros.
+
+        """
+        warm = self._warm.get(tool)
+        if warm is not None and warm.running:
+            return warm
+        try:
+            popen = subprocess.Popen(list(cmds), env=None if env is None else dict(env))
+        except OSError as e:
+            log.warning(f"Could not pre-start {tool}: {e}")
+            return None
+        log.info(f"Pre-started {tool} (pid {popen.pid}): {cmds}")
+        warm = ToolProcess(tool=tool, key=process_key(tool, {"warm": True}), popen=popen,
+                           cmds=tuple(cmds), started=time.monotonic(), warm=True)
+        self._warm[tool] = warm
+        self._reap_timer.start()
+        return warm
+
+    def raise_window(self, proc: ToolProcess):
+        """Bring the windows of *proc* to the front, if possible."""
+        xdotool = shutil.which("xdotool")
+        if xdotool is None:
+            log.debug("xdotool not found, cannot raise window.")
+            return
+        cmds = [xdotool, "search", "--onlyvisible", "--pid", str(proc.pid), "windowactivate"]
+        self._helpers.append(subprocess.Popen(cmds, stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL))
+        self._reap_timer.start()
+
+    def reap(self):
+        """Clean up after processes that have finished."""
+        self._helpers = [popen for popen in self._helpers if popen.poll() is None]
+        finished = set()
+        for table in (self._processes, self._warm):
+            for key, proc in list(table.items()):
+                returncode = proc.popen.poll()
+                if returncode is None:
+                    continue
+                del table[key]
+                if id(proc) not in finished:
+                    finished.add(id(proc))
+                    log.info(f"{proc.tool} (pid {proc.pid}) exited with code {returncode}.")
+                    self.process_finished.emit(proc.tool, returncode)
+        if not (self._processes or self._warm or self._helpers):
+            self._reap_timer.stop()
+
+    def terminate_all(self, timeout: float = 1):
+        """Stop all the processes that were started by this launcher."""
+        procs = [proc.popen for proc in self.processes()] + self._helpers
+        for popen in procs:
+            popen.terminate()
+        for popen in procs:
+            try:
+                popen.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                popen.kill()
+        self.reap()
+
+
+_tool_launcher = None
+
+
+def tool_launcher() -> ToolLauncher:
+    """The external tool launcher shared by the whole application."""
+    global _tool_launcher
+    if _tool_launcher is None:
+        _tool_launcher = ToolLauncher()
+        # Keep the reaping timer with the GUI, not a worker thread
+        app = QCoreApplication.instance()
+        if app is not None:
+            _tool_launcher.moveToThread(app.thread())
+    return _tool_launcher
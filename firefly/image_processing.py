@@ -0,0 +1,235 @@
+"""Turn areaDetector image arrays into small images for display.
+
+The heavy lifting happens on a worker pool so that the GUI thread
+only has to paint the finished thumbnail. Raw frames are never
+copied: they are reshaped and downsampled as NumPy views of the
+array received from channel access, and only the (small) thumbnail
+is copied when it gets scaled to 8 bits.
+
+"""
+import math
+import time
+import logging
+import threading
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from qtpy.QtGui import QImage
+
+
+log = logging.getLogger(__name__)
+
+
+_thread_pool = None
+
+
+def thread_pool() -> QThreadPool:
+    """The worker pool shared by all the image decoders."""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(2)
+    return _thread_pool
+
+
+def frame_from_array(data, dimensions: int, sizes: Sequence[int]) -> np.ndarray:
+    """Reshape a flat areaDetector array into an image.
+
+    Parameters
+    ==========
+    data
+      The flat image data, e.g. from ``image1:ArrayData``.
+    dimensions
+      Number of array dimensions (``NDimensions_RBV``). 3 is treated
+      as an RGB1 color image.
+    sizes
+      Array sizes (``ArraySize0_RBV``, ``ArraySize1_RBV``,
+      ``ArraySize2_RBV``).
+
+    Returns
+    =======
+    frame
+      A view of *data* with shape (rows, columns) or (rows, columns,
+      colors).
+
+    """
+    data = np.asarray(data)
+    if dimensions == 3:
+        colors, width, height = sizes[:3]
+        return data[:colors * width * height].reshape(height, width, colors)
+    width, height = sizes[:2]
+    return data[:width * height].reshape(height, width)
+
+
+def downsample(frame: np.ndarray, max_size: int = 256) -> np.ndarray:
+    """Skip pixels so that neither side is larger than *max_size*.
+
+    The result is a strided view of *frame*, not a copy.
+
+    """
+    step = max(1, math.ceil(max(frame.shape[:2]) / max_size))
+    return frame[::step, ::step]
+
+
+def to_uint8(frame: np.ndarray) -> np.ndarray:
+    """Scale a frame to the full 0–255 range for display."""
+    if frame.dtype == np.uint8:
+        return np.ascontiguousarray(frame)
+    lo, hi = np.min(frame), np.max(frame)
+    scale = 255 / (hi - lo) if hi > lo else 0
+    return ((frame - lo) * scale).astype(np.uint8)
+
+
+def to_qimage(frame: np.ndarray) -> QImage:
+    """Make a QImage from an 8-bit grayscale or RGB frame.
+
+    The QImage uses *frame*'s memory, so *frame* must stay alive
+    as long as the image does.
+
+    """
+    height, width = frame.shape[:2]
+    if frame.ndim == 3:
+        fmt, bytes_per_line = QImage.Format_RGB888, width * 3
+    else:
+        fmt, bytes_per_line = QImage.Format_Grayscale8, width
+    return QImage(frame.data, width, height, bytes_per_line, fmt)
+
+
+def make_thumbnail(data, dimensions: int, sizes: Sequence[int], max_size: int = 256) -> np.ndarray:
+    """Reshape, downsample and scale a raw frame to an 8-bit thumbnail."""
+    frame = frame_from_array(data, dimensions=dimensions, sizes=sizes)
+    return to_uint8(downsample(frame, max_size=max_size))
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, decoder, frame):
+        super().__init__()
+        self.decoder = decoder
+        self.frame = frame
+
+    def run(self):
+        t0 = time.perf_counter()
+        try:
+            data, dimensions, sizes, extra = self.frame
+            result = self.decoder.process(data, dimensions, sizes, **extra)
+        except Exception as e:
+            log.warning(f"Could not decode image frame: {e}")
+            result = None
+        self.decoder._decoded.emit((result, time.perf_counter() - t0))
+
+
+class FrameDecoder(QObject):
+    """Process raw frames on the worker pool.
+
+    At most one frame is decoded at a time, and no more than
+    *max_fps* frames per second. If new frames arrive faster than
+    that, only the newest is kept and the rest are dropped, so memory
+    use stays constant.
+
+    Parameters
+    ==========
+    pool
+      Worker pool to decode on. Defaults to a pool shared by all
+      decoders.
+    process
+      Called on the worker pool as ``process(data, dimensions,
+      sizes, **extra)``, and its result is emitted with
+      *frame_ready*. Defaults to making an 8-bit thumbnail no larger
+      than *max_size*.
+
+    """
+    max_fps: float = 5
+    max_size: int = 256
+    decoded: int = 0
+    dropped: int = 0
+    decode_time: float = 0
+
+    frame_ready = Signal(object)
+    _decoded = Signal(object)
+
+    def __init__(self, pool: Optional[QThreadPool] = None,
+                 process: Optional[Callable] = None, parent=None):
+        super().__init__(parent=parent)
+        self.pool = thread_pool() if pool is None else pool
+        if process is not None:
+            self.process = process
+        self._pending = None
+        self._busy = False
+        self._last_start = -float("inf")
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start_next)
+        self._decoded.connect(self._finish)
+
+    def submit(self, data, dimensions: int, sizes: Sequence[int], **extra):
+        """Queue a raw frame, replacing any frame still waiting.
+
+        Any *extra* keyword arguments are passed on to
+        :py:meth:`process`. Use them for state that the GUI thread
+        might change while the frame is being decoded.
+
+        """
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = (data, dimensions, tuple(sizes), extra)
+        self._start_next()
+
+    def _start_next(self):
+        if self._busy or self._pending is None:
+            return
+        wait = self._last_start + 1 / self.max_fps - time.monotonic()
+        if wait > 0:
+            if not self._timer.isActive():
+                self._timer.start(int(wait * 1000))
+            return
+        frame, self._pending = self._pending, None
+        self._busy = True
+        self._last_start = time.monotonic()
+        self.pool.start(_DecodeTask(self, frame))
+
+    def process(self, data, dimensions: int, sizes: Sequence[int]):
+        return make_thumbnail(data, dimensions=dimensions, sizes=sizes,
+                              max_size=self.max_size)
+
+    def _finish(self, result):
+        frame, duration = result
+        self._busy = False
+        if frame is not None:
+            self.decoded += 1
+            self.decode_time = duration
+            self.frame_ready.emit(frame)
+        self._start_next()
+
+
+class FrameStore:
+    """Double-buffered storage for the latest frame.
+
+    A worker writes each new frame into the back buffer, which then
+    becomes the front buffer that the GUI reads from. The buffers are
+    only reallocated when the frame's shape or type changes.
+
+    """
+    frame_number: int = 0
+
+    def __init__(self):
+        self._buffers = [None, None]
+        self._front = 0
+        self._lock = threading.Lock()
+
+    def write(self, frame: np.ndarray) -> np.ndarray:
+        """Copy *frame* into the back buffer and make it the front."""
+        back = 1 - self._front
+        buf = self._buffers[back]
+        if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+            buf = self._buffers[back] = np.empty(frame.shape, dtype=frame.dtype)
+        np.copyto(buf, frame)
+        with self._lock:
+            self._front = back
+            self.frame_number += 1
+        return buf
+
+    def read(self) -> Optional[np.ndarray]:
+        """The most recently written frame, or ``None``."""
+        with self._lock:
+            return self._buffers[self._front]
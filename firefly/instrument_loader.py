@@ -0,0 +1,79 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from qtpy.QtCore import QObject, Signal, Slot
+import haven
+from haven import registry
+
+from .tracing import trace
+
+
+log = logging.getLogger(__name__)
+
+
+class InstrumentLoader(QObject):
+    """Load the beamline's devices in stages.
+
+    Meant to be moved to a worker thread so that the GUI stays
+    responsive while devices are being created and connected. Each
+    stage is a ``load_<stage>()`` method, run in the order given by
+    *stages*.
+
+    """
+    stages = ["registry", "connections"]
+    connection_timeout: float = 5
+    max_workers: int = 16
+
+    # Signals for reporting on progress
+    stage_started = Signal(str)
+    stage_finished = Signal(str, float)
+    finished = Signal(float)
+
+    @Slot()
+    def load(self):
+        """Run all the stages for loading the instrument."""
+        t_start = time.monotonic()
+        for stage in self.stages:
+            log.debug(f"Starting instrument stage: {stage}")
+            self.stage_started.emit(stage)
+            t0 = time.monotonic()
+            try:
+                with trace(f"load_{stage}", category="startup"):
+                    getattr(self, f"load_{stage}")()
+            except Exception as e:
+                log.exception(f"Instrument stage '{stage}' failed: {e}")
+            duration = time.monotonic() - t0
+            log.info(f"Instrument stage '{stage}' finished in {duration:.2f} s.")
+            self.stage_finished.emit(stage, duration)
+        total = time.monotonic() - t_start
+        log.info(f"Instrument loaded in {total:.2f} s.")
+        self.finished.emit(total)
+
+    def load_registry(self):
+        """Create the ophyd devices and register them."""
+        haven.load_instrument()
+
+    def load_connections(self):
+        """Wait for the registered devices to connect.
+
+        Devices are connected in parallel, so that one disconnected
+        IOC only costs *connection_timeout* total, not per device.
+
+        """
+        devices = [cpt for cpt in registry.components
+                   if hasattr(cpt, "wait_for_connection")]
+        if len(devices) == 0:
+            return
+        def connect(device):
+            try:
+                device.wait_for_connection(timeout=self.connection_timeout)
+            except Exception as e:
+                log.warning(f"Could not connect to device {device.name}: {e}")
+                return False
+            return True
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(connect, device) for device in devices]
+            wait(futures)
+        num_connected = sum(f.result() for f in futures)
+        log.info(f"Connected to {num_connected} of {len(devices)} devices.")
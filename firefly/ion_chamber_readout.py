@@ -0,0 +1,98 @@
+"""Convert ion chamber voltages to currents, all at once.
+
+The voltage, pre-amp gain and gain unit of every ion chamber are kept
+in NumPy arrays, so that the currents (and ratios between ion
+chambers, like I0/It) can be calculated for all the ion chambers in
+one step, instead of once per channel update.
+
+"""
+from typing import Sequence
+
+import numpy as np
+
+
+class IonChamberReadout:
+    """Currents and ratios for a set of ion chambers.
+
+    Parameters
+    ==========
+    names
+      Names of the ion chambers, in the order they are indexed.
+
+    """
+    # Pre-amp sensitivity settings, indexed by the sens_num/sens_unit PVs
+    gain_values = np.array([1, 2, 5, 10, 20, 50, 100, 200, 500], dtype=float)
+    gain_units = ["pA/V", "nA/V", "µA/V", "mA/V"]
+    unit_scales = np.array([1e-12, 1e-9, 1e-6, 1e-3])
+
+    def __init__(self, names: Sequence[str]):
+        self.names = list(names)
+        num = len(self.names)
+        self.voltages = np.full(num, np.nan)
+        self.gain_indices = np.full(num, -1, dtype=int)
+        self.unit_indices = np.full(num, -1, dtype=int)
+        # Currents in the pre-amp's units (e.g. µA), and in amps
+        self.currents = np.full(num, np.nan)
+        self.amps = np.full(num, np.nan)
+        self._dirty = np.zeros(num, dtype=bool)
+        # Derived ratios: name -> (numerator index, denominator index, take log)
+        self._ratios = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def set_voltage(self, idx: int, voltage: float):
+        self.voltages[idx] = voltage
+        self._dirty[idx] = True
+
+    def set_gain(self, idx: int, gain_idx: int):
+        self.gain_indices[idx] = gain_idx
+        self._dirty[idx] = True
+
+    def set_unit(self, idx: int, unit_idx: int):
+        self.unit_indices[idx] = unit_idx
+        self._dirty[idx] = True
+
+    def unit(self, idx: int) -> str:
+        """The unit for the current of ion chamber *idx* (e.g. "µA")."""
+        return self.gain_units[self.unit_indices[idx]].split("/")[0]
+
+    def update(self) -> np.ndarray:
+        """Recalculate the currents for all the ion chambers.
+
+        Returns
+        =======
+        changed
+          Indices of the ion chambers with a new, valid current.
+
+        """
+        changed = np.flatnonzero(self._dirty)
+        if len(changed) == 0:
+            return changed
+        self._dirty[:] = False
+        num_gains, num_units = len(self.gain_values), len(self.unit_scales)
+        valid = ((self.gain_indices >= 0) & (self.gain_indices < num_gains)
+                 & (self.unit_indices >= 0) & (self.unit_indices < num_units)
+                 & np.isfinite(self.voltages))
+        gains = self.gain_values[np.clip(self.gain_indices, 0, num_gains - 1)]
+        scales = self.unit_scales[np.clip(self.unit_indices, 0, num_units - 1)]
+        self.currents = np.where(valid, self.voltages / gains, np.nan)
+        self.amps = self.currents * scales
+        return changed[valid[changed]]
+
+    def add_ratio(self, name: str, numerator: str, denominator: str, log: bool = False):
+        """Keep track of *numerator*/*denominator*, or its natural log."""
+        self._ratios[name] = (self.index(numerator), self.index(denominator), log)
+
+    def ratios(self) -> dict:
+        """The latest values of all the ratios added with :py:meth:`add_ratio`."""
+        if len(self._ratios) == 0:
+            return {}
+        nums, dens, logs = (np.array(col) for col in zip(*self._ratios.values()))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = self.amps[nums] / self.amps[dens]
+            values = np.where(logs, np.log(values), values)
+        return dict(zip(self._ratios.keys(), values.tolist()))
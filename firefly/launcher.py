@@ -1,5 +1,6 @@
 import time
 import argparse
+import json
 import cProfile
 import logging
 import pstats
@@ -8,6 +9,7 @@ from pathlib import Path
 
 
 def main():
+    t_start = time.perf_counter()
     logger = logging.getLogger('')
     handler = logging.StreamHandler()
     formatter = logging.Formatter('[%(asctime)s] [%(levelname)-8s] - %(message)s')
@@ -79,6 +81,18 @@ def main():
         action='store_true',
         help='Enable cProfile function profiling, printing on exit.'
     )
+    parser.add_argument(
+        '--trace',
+        metavar='FILE',
+        help='Record a timeline of startup and slow operations, saved to' +
+             ' FILE on exit. View it at https://ui.perfetto.dev.'
+    )
+    parser.add_argument(
+        '--exit-after-startup',
+        action='store_true',
+        help='Print startup timings as JSON and exit once the instrument' +
+             ' is loaded. Used for benchmarking.'
+    )
     parser.add_argument(
         '--hide-menu-bar',
         action='store_true',
@@ -140,6 +154,11 @@ def main():
         profile = cProfile.Profile()
         profile.enable()
 
+    from . import tracing
+    if pydm_args.trace:
+        tracing.enable()
+        tracing.trace_channel_connections()
+
     macros = None
     if pydm_args.macro is not None:
         macros = parse_macro_string(pydm_args.macro)
@@ -148,26 +167,62 @@ def main():
         logger.setLevel(pydm_args.log_level)
         handler.setLevel(pydm_args.log_level)
 
-    app = FireflyApplication(
-        ui_file=pydm_args.displayfile,
-        command_line_args=pydm_args.display_args,
-        perfmon=pydm_args.perfmon,
-        hide_menu_bar=pydm_args.hide_menu_bar,
-        hide_status_bar=pydm_args.hide_status_bar,
-        fullscreen=pydm_args.fullscreen,
-        read_only=pydm_args.read_only,
-        macros=macros,
-        stylesheet_path=pydm_args.stylesheet,
-    )
+    with tracing.trace("FireflyApplication.__init__", category="startup"):
+        app = FireflyApplication(
+            ui_file=pydm_args.displayfile,
+            command_line_args=pydm_args.display_args,
+            perfmon=pydm_args.perfmon,
+            hide_menu_bar=pydm_args.hide_menu_bar,
+            hide_status_bar=pydm_args.hide_status_bar,
+            fullscreen=pydm_args.fullscreen,
+            read_only=pydm_args.read_only,
+            macros=macros,
+            stylesheet_path=pydm_args.stylesheet,
+        )
 
-    # Define devices on the beamline (slow!)
+    # Report progress loading the devices on the splash screen
+    def show_stage(stage):
+        splash.showMessage(f"Loading {stage}…", QtCore.Qt.AlignBottom | QtCore.Qt.AlignHCenter)
+    app.instrument_stage_started.connect(show_stage)
+
+    # Define devices on the beamline (in the background)
     app.load_instrument()
     QApplication.processEvents()
 
-    splash.finish(app.windows["beamline_status"])
+    # Hide the splash screen once devices are registered, or after a
+    # short while so the window is usable during slow connections
+    status_window = app.windows["beamline_status"]
+    def close_splash(stage="registry", duration=None):
+        if stage == "registry" and splash.isVisible():
+            splash.finish(status_window)
+    app.instrument_stage_finished.connect(close_splash)
+    QtCore.QTimer.singleShot(2000, close_splash)
+
+    # Report how long it took to start, then exit
+    if pydm_args.exit_after_startup:
+        from .profiling import RepaintProbe
+        timings = {}
+        def report_startup():
+            if {"first_paint", "instrument_loaded"} <= timings.keys():
+                print(json.dumps(timings), flush=True)
+                app.quit()
+        # The window is only painted once the event loop is running
+        paint_probe = RepaintProbe(status_window, predicate=lambda widget: True, parent=app)
+        paint_probe.arm()
+        def record_paint(paint_time):
+            timings["first_paint"] = paint_time - t_start
+            report_startup()
+        paint_probe.painted.connect(record_paint)
+        def record_loaded(duration):
+            timings["instrument_loaded"] = time.perf_counter() - t_start
+            report_startup()
+        app.instrument_loaded.connect(record_loaded)
 
     exit_code = app.exec_()
 
+    if pydm_args.trace:
+        tracing.save(pydm_args.trace)
+
     if pydm_args.profile:
         profile.disable()
         stats = pstats.Stats(
@@ -0,0 +1,281 @@
+"""Keep recent log messages in memory for the log viewer.
+
+Records are kept in a fixed-size ring, so memory use stays bounded
+however long Firefly runs. The logging handler only queues records;
+they are moved into the table model in batches by a timer on the GUI
+thread, so a burst of messages doesn't freeze the GUI.
+
+"""
+import re
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from qtpy.QtCore import (QAbstractTableModel, QCoreApplication, QModelIndex,
+                         QSortFilterProxyModel, Qt, QTimer)
+from qtpy.QtGui import QColor
+
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    created: float
+    levelno: int
+    levelname: str
+    logger: str
+    thread: str
+    message: str
+
+
+class RecordRing:
+    """The most recent *capacity* items, indexed oldest first."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, idx: int):
+        if not 0 <= idx < self._size:
+            raise IndexError(idx)
+        return self._items[(self._start + idx) % self.capacity]
+
+    def extend(self, items) -> int:
+        """Add *items* at the end.
+
+        Returns
+        =======
+        num_evicted
+          How many of the oldest items were dropped to make room.
+
+        """
+        items = list(items)[-self.capacity:]
+        num_evicted = max(0, self._size + len(items) - self.capacity)
+        for item in items:
+            self._items[(self._start + self._size) % self.capacity] = item
+            if self._size < self.capacity:
+                self._size += 1
+            else:
+                self._start = (self._start + 1) % self.capacity
+        return num_evicted
+
+    def drop_oldest(self, num: int):
+        num = min(num, self._size)
+        for offset in range(num):
+            self._items[(self._start + offset) % self.capacity] = None
+        self._start = (self._start + num) % self.capacity
+        self._size -= num
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+
+class BatchingHandler(logging.Handler):
+    """Queue log records, from any thread, for the log model.
+
+    Only the newest *capacity* records are queued, since older ones
+    would be pushed out of the model anyway.
+
+    """
+    def __init__(self, capacity: int, level=logging.NOTSET):
+        super().__init__(level=level)
+        self.pending = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message = f"{message}\n{self.formatException(record.exc_info)}"
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(LogEntry(
+            created=record.created, levelno=record.levelno, levelname=record.levelname,
+            logger=record.name, thread=record.threadName, message=message))
+
+    def formatException(self, exc_info):
+        return logging.Formatter().formatException(exc_info)
+
+    def take(self, max_records: int) -> list:
+        """Remove up to *max_records* of the oldest queued records."""
+        records = []
+        pending = self.pending
+        while pending and len(records) < max_records:
+            records.append(pending.popleft())
+        return records
+
+
+level_colors = {
+    logging.WARNING: QColor(160, 110, 0),
+    logging.ERROR: QColor(200, 0, 0),
+    logging.CRITICAL: QColor(200, 0, 0),
+}
+
+
+class LogModel(QAbstractTableModel):
+    """Table of the most recent log records.
+
+    Parameters
+    ==========
+    capacity
+      Most records to keep.
+    batch_interval
+      How often to move queued records into the table (ms).
+    max_batch
+      Most records to add in one batch, so that each batch only
+      takes a short time on the GUI thread.
+
+    """
+    columns = ["Time", "Level", "Logger", "Thread", "Message"]
+
+    def __init__(self, capacity: int = 50000, batch_interval: int = 100,
+                 max_batch: int = 2000, parent=None):
+        super().__init__(parent=parent)
+        self.records = RecordRing(capacity)
+        self.max_batch = max_batch
+        self.handler = BatchingHandler(capacity=capacity)
+        self._timer = QTimer(self)
+        self._timer.setInterval(batch_interval)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section]
+        return None
+
+    def entry(self, row: int) -> LogEntry:
+        return self.records[row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.records[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                msecs = int((entry.created % 1) * 1000)
+                return f"{time.strftime('%H:%M:%S', time.localtime(entry.created))}.{msecs:03d}"
+            return (None, entry.levelname, entry.logger, entry.thread, entry.message)[col]
+        elif role == Qt.ForegroundRole:
+            return level_colors.get(entry.levelno)
+        elif role == Qt.ToolTipRole and col == 4:
+            return entry.message
+        return None
+
+    def flush(self) -> int:
+        """Move a batch of queued records into the table.
+
+        Returns
+        =======
+        num_added
+          How many records were added.
+
+        """
+        records = self.handler.take(self.max_batch)
+        if len(records) == 0:
+            return 0
+        capacity = self.records.capacity
+        records = records[-capacity:]
+        # Rows that get pushed out to make room
+        num_evicted = max(0, len(self.records) + len(records) - capacity)
+        if num_evicted > 0:
+            self.beginRemoveRows(QModelIndex(), 0, num_evicted - 1)
+            self.records.drop_oldest(num_evicted)
+            self.endRemoveRows()
+        first = len(self.records)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.records.extend(records)
+        self.endInsertRows()
+        return len(records)
+
+    def clear(self):
+        self.beginResetModel()
+        self.records.clear()
+        self.handler.pending.clear()
+        self.endResetModel()
+
+
+class LogFilterProxy(QSortFilterProxyModel):
+    """Filter log records by level, logger name and message.
+
+    New records are checked as they arrive, and only changing the
+    filters re-checks all the stored records.
+
+    """
+    min_level: int = logging.NOTSET
+    logger_prefix: str = ""
+    pattern: Optional[re.Pattern] = None
+
+    def set_min_level(self, level: int):
+        self.min_level = level
+        self.invalidateFilter()
+
+    def set_logger_prefix(self, prefix: str):
+        self.logger_prefix = prefix.strip()
+        self.invalidateFilter()
+
+    def set_pattern(self, text: str):
+        """Only show messages matching the regular expression *text*.
+
+        Raises
+        ======
+        re.error
+          *text* is not a valid regular expression.
+
+        """
+        self.pattern = re.compile(text, re.IGNORECASE) if text else None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        entry = self.sourceModel().entry(source_row)
+        if entry.levelno < self.min_level:
+            return False
+        if self.logger_prefix and not entry.logger.startswith(self.logger_prefix):
+            return False
+        if self.pattern is not None and self.pattern.search(entry.message) is None:
+            return False
+        return True
+
+
+_log_model = None
+_log_model_lock = threading.Lock()
+
+
+def log_model() -> LogModel:
+    """The log model shared by the whole application.
+
+    The first call installs its handler on the root logger, so call
+    this early to capture messages from start-up.
+
+    """
+    global _log_model
+    with _log_model_lock:
+        if _log_model is None:
+            _log_model = LogModel()
+            # Keep the batching timer with the GUI, not a worker thread
+            app = QCoreApplication.instance()
+            if app is not None:
+                _log_model.moveToThread(app.thread())
+            logging.getLogger().addHandler(_log_model.handler)
+    return _log_model
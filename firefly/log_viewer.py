@@ -0,0 +1,84 @@
+import re
+import logging
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QHeaderView
+
+from firefly import display
+from firefly.log_model import LogFilterProxy, log_model
+
+
+log = logging.getLogger(__name__)
+
+
+class LogViewerDisplay(display.FireflyDisplay):
+    """Recent log messages, filterable by level, logger and regex.
+
+    The messages come from the application-wide
+    :py:class:`~firefly.log_model.LogModel`, so messages logged before
+    the window was opened are shown too.
+
+    """
+    levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+    # How long to wait for typing to stop before filtering (ms)
+    filter_delay: int = 250
+
+    def customize_ui(self):
+        self.log_model = log_model()
+        self.proxy = LogFilterProxy(self)
+        self.proxy.setSourceModel(self.log_model)
+        view = self.ui.log_table_view
+        view.setModel(self.proxy)
+        # Fixed row heights let the view skip measuring every row
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 4)
+        header = view.horizontalHeader()
+        for col, width in enumerate([100, 70, 200, 120]):
+            header.resizeSection(col, width)
+        # Filter controls
+        for level in self.levels:
+            self.ui.level_combobox.addItem(level, getattr(logging, level))
+        self.ui.level_combobox.currentIndexChanged.connect(self.update_level)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.filter_delay)
+        self._filter_timer.timeout.connect(self.update_text_filters)
+        self.ui.logger_line_edit.textChanged.connect(self._filter_timer.start)
+        self.ui.filter_line_edit.textChanged.connect(self._filter_timer.start)
+        self.ui.clear_button.clicked.connect(self.log_model.clear)
+        # Keep up with new messages
+        self.proxy.rowsInserted.connect(self.handle_new_rows)
+        self.proxy.rowsRemoved.connect(self.update_count)
+        self.proxy.modelReset.connect(self.update_count)
+        self.proxy.layoutChanged.connect(self.update_count)
+        self.update_count()
+
+    def update_level(self, idx):
+        self.proxy.set_min_level(self.ui.level_combobox.itemData(idx))
+        self.update_count()
+
+    def update_text_filters(self):
+        self.proxy.set_logger_prefix(self.ui.logger_line_edit.text())
+        line_edit = self.ui.filter_line_edit
+        try:
+            self.proxy.set_pattern(line_edit.text())
+        except re.error as e:
+            # Keep the last good filter until the regex is fixed
+            line_edit.setStyleSheet("QLineEdit { background-color: rgb(255, 200, 200); }")
+            line_edit.setToolTip(f"Invalid regular expression: {e}")
+        else:
+            line_edit.setStyleSheet("")
+            line_edit.setToolTip("Only show messages matching this regular expression.")
+        self.update_count()
+
+    def handle_new_rows(self, *args):
+        if self.ui.follow_checkbox.isChecked():
+            self.ui.log_table_view.scrollToBottom()
+        self.update_count()
+
+    def update_count(self, *args):
+        shown, total = self.proxy.rowCount(), self.log_model.rowCount()
+        self.ui.count_label.setText(f"Showing {shown} of {total} messages")
+
+    def ui_filename(self):
+        return "log_viewer.ui"
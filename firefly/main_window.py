@@ -6,21 +6,45 @@ from pydm.main_window import PyDMMainWindow
 from qtpy import QtCore, QtGui, QtWidgets
 from pydm import data_plugins
 from haven.instrument import motor
-from haven.instrument import motor
-from haven import load_config
+
+from .tracing import trace
+from .config import config_service, get_config
 
 log = logging.getLogger(__name__)
 
 
 class FireflyMainWindow(PyDMMainWindow):
     hide_nav_bar: bool = True
+    # If true, closing the window only hides it so it can be re-opened quickly
+    hide_on_close: bool = False
+
+    # Emitted when the window is closed but kept alive
+    window_hidden = QtCore.Signal()
+
+    # Window attributes for the application's shared actions
+    shared_actions = {
+        "actionShow_Log_Viewer": "show_log_viewer_window_action",
+        "actionShow_Sample_Viewer": "show_sample_viewer_window_action",
+        "actionShow_Xafs_Scan": "show_xafs_scan_window_action",
+        "actionShow_Voltmeters": "show_voltmeters_window_action",
+        "actionShow_Cameras": "show_cameras_window_action",
+    }
+    # Menubar menus that are shared by all windows
+    shared_menus = ["menuPositioners", "menuMotors", "menuScans", "menuDetectors"]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.customize_ui()
+        config_service().config_changed.connect(self.handle_config_changed)
+        with trace(f"{type(self).__name__}.customize_ui", category="windows"):
+            self.customize_ui()
         self.export_actions()
 
     def closeEvent(self, event):
+        if self.hide_on_close:
+            # Keep the window around, accepting the event hides it
+            event.accept()
+            self.window_hidden.emit()
+            return
         super().closeEvent(event)
         # Delete the window so it's recreated next time it's opened
         self.deleteLater()
@@ -64,58 +88,20 @@ class FireflyMainWindow(PyDMMainWindow):
         if self.hide_nav_bar:
             self.toggle_nav_bar(False)
             self.ui.actionShow_Navigation_Bar.setChecked(False)
-        # XAFS scan window
-        self.add_menu_action(
-            action_name="actionShow_Log_Viewer",
-            text="Logs",
-            menu=self.ui.menuView)
-        # Positioners menu
-        self.ui.menuPositioners = QtWidgets.QMenu(self.ui.menubar)
-        self.ui.menuPositioners.setObjectName("menuPositioners")
-        self.ui.menuPositioners.setTitle("Positioners")
-        self.ui.menubar.addAction(self.ui.menuPositioners.menuAction())
-        # Sample viewer
-        self.add_menu_action(
-            action_name="actionShow_Sample_Viewer",
-            text="Sample",
-            menu=self.ui.menuPositioners)
-        # Motors sub-menu
-        self.ui.menuMotors = QtWidgets.QMenu(self.ui.menubar)
-        self.ui.menuMotors.setObjectName("menuMotors")
-        self.ui.menuMotors.setTitle("Motors")
-        self.ui.menuPositioners.addAction(self.ui.menuMotors.menuAction())
-        # Scans menu
-        self.ui.menuScans = QtWidgets.QMenu(self.ui.menubar)
-        self.ui.menuScans.setObjectName("menuScans")
-        self.ui.menuScans.setTitle("Scans")
-        self.ui.menubar.addAction(self.ui.menuScans.menuAction())
-        # XAFS scan window
-        self.add_menu_action(
-            action_name="actionShow_Xafs_Scan",
-            text="XAFS Scan",
-            menu=self.ui.menuScans)
-        # Detectors menu
-        self.ui.menuDetectors = QtWidgets.QMenu(self.ui.menubar)
-        self.ui.menuDetectors.setObjectName("menuDetectors")
-        self.ui.menuDetectors.setTitle("Detectors")
-        self.ui.menubar.addAction(self.ui.menuDetectors.menuAction())        
-        # Voltmeters window
-        self.add_menu_action(
-            action_name="actionShow_Voltmeters",
-            text="Ion Chambers",
-            menu=self.ui.menuDetectors)
-        self.add_menu_action(
-            action_name="actionShow_Cameras",
-            text="Cameras",
-            menu=self.ui.menuDetectors)
-        # Add actions to the motors sub-menus
+        # The application builds the menus once and shares them
         app = QtWidgets.QApplication.instance()
-        for action in app.motor_actions:
-            self.ui.menuMotors.addAction(action)
-        # Add other menu actions
+        for action_name, app_name in self.shared_actions.items():
+            action = getattr(app, app_name)
+            setattr(self.ui, action_name, action)
+            setattr(self, action_name, action)
+        for menu_name in self.shared_menus:
+            setattr(self.ui, menu_name, getattr(app, menu_name))
+        # Add the shared menus to this window's menubar
+        self.ui.menuView.addAction(self.ui.actionShow_Log_Viewer)
         self.ui.menuView.addAction(app.show_status_window_action)
         self.ui.menuView.addAction(app.launch_queuemonitor_action)
-        self.ui.menuPositioners.addAction(app.show_energy_window_action)
+        for menu in [self.ui.menuPositioners, self.ui.menuScans, self.ui.menuDetectors]:
+            self.ui.menubar.addAction(menu.menuAction())
 
     def update_window_title(self):
         if self.showing_file_path_in_title_bar:
@@ -123,13 +109,18 @@ class FireflyMainWindow(PyDMMainWindow):
         else:
             title = self.display_widget().windowTitle()
         # Add the beamline name
-        config = load_config()
+        config = get_config()
         beamline_name = config['beamline']['name']
         title += f" - {beamline_name} - Firefly"
         if data_plugins.is_read_only():
             title += " [Read Only Mode]"
         self.setWindowTitle(title)
     
+    def handle_config_changed(self, config):
+        """Update the window after the configuration files change."""
+        if self.display_widget() is not None:
+            self.update_window_title()
+
     def export_actions(self):
         """Expose specific signals that might be useful for responding to window changes."""
         self.actionShow_Log_Viewer = self.ui.actionShow_Log_Viewer
@@ -148,17 +139,9 @@ class PlanMainWindow(FireflyMainWindow):
         navbar = self.ui.navbar
         for action in navbar.actions():
             navbar.removeAction(action)
-        # Add applications runengine actions
+        # Add the application's shared runengine actions
         app = QtWidgets.QApplication.instance()
-        navbar.addAction(app.start_queue_action)        
-        navbar.addSeparator()
-        navbar.addAction(app.pause_runengine_action)
-        navbar.addAction(app.pause_runengine_now_action)
-        navbar.addSeparator()
-        navbar.addAction(app.resume_runengine_action)
-        navbar.addAction(app.stop_runengine_action)
-        navbar.addAction(app.abort_runengine_action)
-        navbar.addAction(app.halt_runengine_action)
+        navbar.addActions(app.navbar_actions)
 
     def customize_ui(self):
         super().customize_ui()
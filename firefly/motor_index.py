@@ -0,0 +1,134 @@
+"""A searchable index of the beamline's motors.
+
+Motors are grouped by hutch and by IOC, based on their PV prefix,
+and can be looked up with fuzzy matching on their name, labels and
+PV prefix. Building the index does not create any Qt objects, so it
+stays fast even with thousands of motors.
+
+"""
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+
+# APS-style PV prefixes start with the hutch, e.g. "25idc" in "25idcVME:m1"
+hutch_regex = re.compile(r"^(\d+(?:id|bm)[a-z])", re.IGNORECASE)
+
+# Characters that start a new word when scoring matches
+word_separators = " _:.-"
+
+default_group = "Other"
+
+
+@dataclass(frozen=True)
+class MotorEntry:
+    name: str
+    prefix: str
+    ioc: str
+    hutch: str
+    labels: tuple = ()
+    motor: object = field(default=None, compare=False, repr=False)
+    # Lower-case text that search queries are matched against
+    search_text: str = field(default="", compare=False, repr=False)
+
+
+def parse_prefix(prefix: str):
+    """Work out the (hutch, IOC) for a motor's PV prefix."""
+    ioc = prefix.split(":")[0] if prefix else ""
+    match = hutch_regex.match(ioc)
+    hutch = match.group(1).lower() if match else default_group
+    return hutch, (ioc or default_group)
+
+
+def make_entry(motor) -> MotorEntry:
+    prefix = getattr(motor, "prefix", "") or ""
+    hutch, ioc = parse_prefix(prefix)
+    labels = tuple(sorted(str(lbl) for lbl in getattr(motor, "_ophyd_labels_", ())))
+    search_text = " ".join([motor.name, *labels, prefix]).lower()
+    return MotorEntry(name=motor.name, prefix=prefix, ioc=ioc, hutch=hutch,
+                      labels=labels, motor=motor, search_text=search_text)
+
+
+def fuzzy_score(query: str, text: str) -> Optional[float]:
+    """How well *query* matches *text*, or ``None`` if it doesn't.
+
+    Each character of *query* must appear in *text*, in order. Higher
+    scores go to consecutive characters, characters at the start of
+    words, and shorter texts.
+
+    """
+    score = 0.0
+    pos, last = -1, -2
+    for char in query:
+        pos = text.find(char, pos + 1)
+        if pos < 0:
+            return None
+        if pos == last + 1:
+            score += 2
+        if pos == 0 or text[pos - 1] in word_separators:
+            score += 3
+        last = pos
+    return score - 0.01 * len(text)
+
+
+class MotorIndex:
+    """Motors grouped by hutch and IOC, and searchable by name.
+
+    Parameters
+    ==========
+    motors
+      Motor devices, each with a *name* and a *prefix*.
+
+    """
+    def __init__(self, motors: Sequence = ()):
+        self.entries = sorted((make_entry(m) for m in motors), key=lambda e: e.name)
+        self._groups = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def groups(self) -> "OrderedDict[str, OrderedDict[str, list]]":
+        """Entries grouped by hutch, then by IOC, all sorted by name."""
+        if self._groups is None:
+            groups = OrderedDict()
+            for entry in sorted(self.entries, key=lambda e: (e.hutch, e.ioc, e.name)):
+                iocs = groups.setdefault(entry.hutch, OrderedDict())
+                iocs.setdefault(entry.ioc, []).append(entry)
+            self._groups = groups
+        return self._groups
+
+    def search(self, query: str, limit: Optional[int] = 20) -> list:
+        """Find the motors that best match *query*.
+
+        Parameters
+        ==========
+        query
+          Text to match against motor names, labels and PV
+          prefixes. Whitespace is ignored.
+        limit
+          Most entries to return, or ``None`` for all of them.
+
+        Returns
+        =======
+        entries
+          Matching :py:class:`MotorEntry` objects, best match first.
+
+        """
+        query = "".join(query.lower().split())
+        if not query:
+            return self.entries[:limit]
+        chars = set(query)
+        matches = []
+        for entry in self.entries:
+            # Quick check before doing the (slower) fuzzy match
+            if not chars.issubset(entry.search_text):
+                continue
+            score = fuzzy_score(query, entry.search_text)
+            if score is not None:
+                matches.append((-score, entry.name, entry))
+        matches.sort(key=lambda m: m[:2])
+        return [entry for score, name, entry in matches[:limit]]
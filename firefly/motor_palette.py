@@ -0,0 +1,82 @@
+import logging
+
+from qtpy import QtCore, QtWidgets
+from qtpy.QtCore import Qt, Signal
+
+from firefly.motor_index import MotorIndex
+
+
+log = logging.getLogger(__name__)
+
+
+class MotorPalette(QtWidgets.QDialog):
+    """A type-ahead dialog for quickly opening a motor's window.
+
+    Typing filters the motors with fuzzy matching; arrow keys move
+    through the results and Enter opens the selected motor.
+
+    Parameters
+    ==========
+    index
+      The motors to search.
+
+    """
+    max_results: int = 50
+
+    # Emitted with the chosen motor device
+    motor_selected = Signal(object)
+
+    def __init__(self, index: MotorIndex, parent=None):
+        super().__init__(parent=parent)
+        self.index = index
+        self.setWindowTitle("Find Motor")
+        layout = QtWidgets.QVBoxLayout(self)
+        self.search_line_edit = QtWidgets.QLineEdit(self)
+        self.search_line_edit.setPlaceholderText("Motor name, label or PV…")
+        self.search_line_edit.installEventFilter(self)
+        layout.addWidget(self.search_line_edit)
+        self.results_list = QtWidgets.QListWidget(self)
+        layout.addWidget(self.results_list)
+        # Connect signals/slots
+        self.search_line_edit.textChanged.connect(self.update_results)
+        self.search_line_edit.returnPressed.connect(self.accept)
+        self.results_list.itemActivated.connect(self.accept)
+        self.update_results("")
+
+    def set_index(self, index: MotorIndex):
+        self.index = index
+        self.update_results(self.search_line_edit.text())
+
+    def update_results(self, text: str):
+        """Show the motors that best match *text*."""
+        self.results_list.clear()
+        for entry in self.index.search(text, limit=self.max_results):
+            item = QtWidgets.QListWidgetItem(f"{entry.name}    ({entry.prefix})")
+            item.setData(Qt.UserRole, entry)
+            self.results_list.addItem(item)
+        if self.results_list.count() > 0:
+            self.results_list.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        # Let the arrow keys move through the results while typing
+        if obj is self.search_line_edit and event.type() == QtCore.QEvent.KeyPress:
+            if event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+                QtWidgets.QApplication.sendEvent(self.results_list, event)
+                return True
+        return super().eventFilter(obj, event)
+
+    def selected_entry(self):
+        item = self.results_list.currentItem()
+        return None if item is None else item.data(Qt.UserRole)
+
+    def accept(self, *args):
+        entry = self.selected_entry()
+        if entry is not None:
+            log.debug(f"Opening motor from palette: {entry.name}")
+            self.motor_selected.emit(entry.motor)
+        super().accept()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.search_line_edit.selectAll()
+        self.search_line_edit.setFocus()
@@ -0,0 +1,146 @@
+"""Probes for measuring how responsive Firefly is under load.
+
+These are used by the scale benchmarks (``benchmarks/bench_scale.py``)
+to measure how far the GUI event loop lags behind, how much CPU and
+memory Firefly uses, and how long it takes for a PV change to be
+painted on screen.
+
+"""
+import time
+import logging
+import statistics
+from typing import Callable, Optional
+
+import psutil
+from qtpy.QtCore import QEvent, QObject, QTimer, Signal
+
+
+log = logging.getLogger(__name__)
+
+
+class EventLoopMonitor(QObject):
+    """Measure how late the GUI event loop runs a repeating timer.
+
+    If the event loop is busy (e.g. handling PV updates), the timer
+    fires late, and the difference is recorded as the lag.
+
+    Parameters
+    ==========
+    interval
+      How often the timer should fire (ms).
+
+    """
+    def __init__(self, interval: int = 10, parent=None):
+        super().__init__(parent=parent)
+        self.interval = interval
+        self.lags = []
+        self._last = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self):
+        self.lags = []
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.lags.append(max(0, now - self._last - self.interval / 1000))
+        self._last = now
+
+    @property
+    def max_lag(self) -> float:
+        return max(self.lags, default=0)
+
+    def percentile(self, percent: float) -> float:
+        """The lag (in seconds) that *percent* % of ticks stayed under."""
+        if len(self.lags) < 2:
+            return self.max_lag
+        return statistics.quantiles(self.lags, n=100, method="inclusive")[int(percent) - 1]
+
+
+class ResourceSampler:
+    """Measure CPU and memory use of this process over a period.
+
+    .. code-block:: python
+
+        sampler = ResourceSampler()
+        sampler.start()
+        ...
+        usage = sampler.stop()
+        print(usage["cpu"], usage["rss"])
+
+    """
+    def __init__(self, process: Optional[psutil.Process] = None):
+        self.process = psutil.Process() if process is None else process
+        self._start = None
+
+    def _cpu_time(self) -> float:
+        times = self.process.cpu_times()
+        return times.user + times.system
+
+    def start(self):
+        self._start = (time.perf_counter(), self._cpu_time())
+
+    def stop(self) -> dict:
+        """CPU use (fraction of one core) since :py:meth:`start`, and
+        the current resident memory (bytes).
+
+        """
+        wall_start, cpu_start = self._start
+        wall = time.perf_counter() - wall_start
+        cpu = (self._cpu_time() - cpu_start) / max(wall, 1e-9)
+        return {"cpu": cpu, "rss": self.process.memory_info().rss}
+
+
+class RepaintProbe(QObject):
+    """Record when a widget is first painted showing a new value.
+
+    Parameters
+    ==========
+    widget
+      The widget to watch for paint events.
+    predicate
+      Called with *widget* on each paint event. The probe fires on
+      the first paint for which it returns ``True``.
+
+    """
+    # Emitted with the time (``time.perf_counter()``) of the paint
+    painted = Signal(float)
+
+    paint_time: Optional[float] = None
+
+    def __init__(self, widget, predicate: Callable, parent=None):
+        super().__init__(parent=parent)
+        self.widget = widget
+        self.predicate = predicate
+        self._armed = False
+        widget.installEventFilter(self)
+
+    def arm(self) -> float:
+        """Start waiting for the next matching paint.
+
+        Returns
+        =======
+        t0
+          The time the probe was armed, for calculating latency.
+
+        """
+        self.paint_time = None
+        self._armed = True
+        return time.perf_counter()
+
+    def fired(self) -> bool:
+        return self.paint_time is not None
+
+    def eventFilter(self, obj, event):
+        if self._armed and obj is self.widget and event.type() == QEvent.Paint:
+            if self.predicate(obj):
+                self._armed = False
+                self.paint_time = time.perf_counter()
+                self.painted.emit(self.paint_time)
+        return super().eventFilter(obj, event)
@@ -1,73 +1,289 @@
 import time
-from typing import Optional
+import asyncio
+import inspect
+import itertools
+from enum import IntEnum
+from dataclasses import dataclass
+from concurrent.futures import Future
+from typing import Optional, Callable, Coroutine, Sequence
 import logging
 import warnings
 
 from qtpy.QtCore import QThread, QObject, Signal, Slot, QTimer
-from bluesky_queueserver_api.zmq import REManagerAPI
+from bluesky_queueserver_api.zmq.aio import REManagerAPI
 from bluesky_queueserver_api import BPlan, comm_base
 
 from haven import RunEngine
 
+from .tracing import trace_async
+
 
 log = logging.getLogger()
 
 
+class Priority(IntEnum):
+    """Lanes for requests to the queueserver.
+
+    Lower values are sent first. Control requests (pause, stop,
+    abort, etc.) are never made to wait behind other requests.
+
+    """
+    CONTROL = 0
+    STATUS = 1
+    EDIT = 2
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """The outcome of adding several items to the queue at once.
+
+    The queueserver adds a batch all-or-nothing, so if any item is
+    rejected then none of them are added to the queue.
+
+    """
+    items: Sequence
+    successes: Sequence[bool]
+    messages: Sequence[str]
+    queue_length: Optional[int] = None
+
+    @classmethod
+    def from_response(cls, items: Sequence, response: dict):
+        """Build the result from the server's ``item_add_batch`` response."""
+        results = response.get("results") or []
+        # Fill in missing results, e.g. if the request failed entirely
+        if len(results) != len(items):
+            results = [{"success": response["success"], "msg": response.get("msg", "")}] * len(items)
+        return cls(
+            items=list(items),
+            successes=[r["success"] for r in results],
+            messages=[r.get("msg", "") for r in results],
+            queue_length=response.get("qsize"),
+        )
+
+    @property
+    def success(self) -> bool:
+        return len(self.items) > 0 and all(self.successes)
+
+    @property
+    def failures(self) -> list:
+        """(item, message) for each item that was rejected."""
+        return [(item, msg) for item, ok, msg in zip(self.items, self.successes, self.messages)
+                if not ok]
+
+
 class QueueClientThread(QThread):
+    """A thread running an asyncio event loop for a queue client."""
     timer: QTimer
-    
+    loop: asyncio.AbstractEventLoop
+
     def __init__(self, *args, client, **kwargs):
         self.client = client
         super().__init__(*args, **kwargs)
+        self.setObjectName("queue_client")
+        # Event loop for running the client's requests
+        self.loop = asyncio.new_event_loop()
+        self.client.loop = self.loop
         # Timer for polling the queueserver
         self.timer = QTimer()
         self.timer.timeout.connect(self.client.update)
-        self.timer.start(1000)
+        self.timer.start(int(self.client.poll_period * 1000))
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.client.start())
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.client.stop())
+            self.loop.close()
 
     def quit(self, *args, **kwargs):
         self.timer.stop()
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
         # del self.timer
         # del self.client
         super().quit(*args, **kwargs)
 
 
 class QueueClient(QObject):
+    """Talks to the queueserver without blocking the caller.
+
+    Requests are scheduled on an asyncio event loop (see
+    :py:class:`QueueClientThread`) and several can be in flight at
+    once. Results come back as Qt signals.
+
+    Parameters
+    ==========
+    api
+      The queueserver API to use. If omitted, *api_factory* is called
+      from inside the event loop to create one.
+    api_factory
+      Callable that returns a new queueserver API.
+
+    """
     api: REManagerAPI
+    loop: Optional[asyncio.AbstractEventLoop] = None
     _last_queue_length: Optional[int] = None
+    _last_queue_uid: Optional[str] = None
+    _last_status: Optional[dict] = None
+    _status_request: Optional[Future] = None
     last_update: float = -1
-    timeout: float = 1
+    # How often to ask the queueserver for its status, in seconds
+    poll_period: float = 0.1
+    timeout: float = poll_period
+    # Maximum number of non-control requests in flight at once
+    max_requests: int = 4
+    # Default time to wait for a response for each lane, in seconds
+    request_timeouts = {
+        Priority.CONTROL: 5,
+        Priority.STATUS: 2,
+        Priority.EDIT: 30,
+    }
 
     # Signals responding to queue changes
     state_changed = Signal()
+    status_changed = Signal(object)
     length_changed = Signal(int)
+    queue_changed = Signal(object)
+    items_added = Signal(object)
+    # Signals for reporting problems with requests
+    request_failed = Signal(object)
 
-    def __init__(self, *args, api, **kwargs):
+    def __init__(self, *args, api=None, api_factory: Callable = None, **kwargs):
         self.api = api
+        self.api_factory = api_factory
+        self._counter = itertools.count()
+        self._requests = asyncio.PriorityQueue()
+        self._workers = []
+        self._tasks = set()
         super().__init__(*args, **kwargs)
 
+    async def start(self):
+        """Prepare the client to start handling requests."""
+        if self.api is None:
+            self.api = self.api_factory()
+        self._workers = [asyncio.create_task(self._worker())
+                         for i in range(self.max_requests)]
+
+    async def stop(self):
+        """Cancel outstanding requests and close the API."""
+        # Cancel the requests that are in flight
+        tasks = [*self._workers, *self._tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        # Cancel the requests still waiting for a free slot
+        while not self._requests.empty():
+            priority, count, coro, timeout, future = self._requests.get_nowait()
+            coro.close()
+            future.cancel()
+            self._requests.task_done()
+        if self.api is not None and hasattr(self.api, "close"):
+            try:
+                await self.call_api("close")
+            except Exception as e:
+                log.warning(f"Could not close queueserver API: {e}")
+
+    async def _worker(self):
+        while True:
+            priority, count, coro, timeout, future = await self._requests.get()
+            await self._run_request(coro, timeout=timeout, future=future)
+            self._requests.task_done()
+
+    async def _run_request(self, coro: Coroutine, timeout: float, future: Future):
+        try:
+            result = await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.CancelledError:
+            # Don't leave the caller waiting on a request that will never finish
+            future.cancel()
+            raise
+        except Exception as e:
+            log.error(f"Queueserver request failed: {e!r}")
+            self.request_failed.emit(e)
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def submit(self, coro: Coroutine, priority: Priority = Priority.EDIT,
+               timeout: Optional[float] = None) -> Future:
+        """Schedule a coroutine to run on the event loop.
+
+        Safe to call from any thread.
+
+        Parameters
+        ==========
+        coro
+          The coroutine making the request(s) to the queueserver.
+        priority
+          Which lane to send the request in. ``Priority.CONTROL``
+          requests start immediately, others wait for a free slot,
+          lowest priority value first.
+        timeout
+          How long to wait for the request to finish, in
+          seconds. Defaults to the lane's entry in
+          *request_timeouts*.
+
+        Returns
+        =======
+        future
+          A future that will hold the coroutine's result.
+
+        """
+        if timeout is None:
+            timeout = self.request_timeouts[priority]
+        future = Future()
+        if priority == Priority.CONTROL:
+            def schedule():
+                task = self.loop.create_task(self._run_request(coro, timeout=timeout, future=future))
+                # Keep a reference so the task isn't garbage collected
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        else:
+            request = (priority, next(self._counter), coro, timeout, future)
+            def schedule():
+                self._requests.put_nowait(request)
+        self.loop.call_soon_threadsafe(schedule)
+        return future
+
+    async def call_api(self, method: str, **kwargs):
+        """Call a method on the API, whether it's async or not."""
+        async with trace_async(f"queueserver.{method}", category="queue"):
+            result = getattr(self.api, method)(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+
     def update(self):
         now = time.time()
-        if now >= self.last_update + self.timeout:
+        status_pending = self._status_request is not None and not self._status_request.done()
+        if now >= self.last_update + self.timeout and not status_pending:
             log.debug("Updating queue client.")
-            try:
-                self.check_queue_length()
-            except comm_base.RequestTimeoutError as e:
-                # If we can't reach the server, wait for a minute and retry
-                self.timeout = min(60, self.timeout * 2)
-                log.warn(str(e))
+            # (timeouts are handled by ``_update()`` itself)
+            self._status_request = self.submit(self._update(), priority=Priority.STATUS,
+                                               timeout=2 * self.request_timeouts[Priority.STATUS])
+            self.last_update = now
+
+    async def _update(self):
+        try:
+            await asyncio.wait_for(self._check_status(),
+                                   timeout=self.request_timeouts[Priority.STATUS])
+        except Exception as e:
+            # If we can't reach the server, back off (up to a minute) and retry
+            self.timeout = min(60, max(1, self.timeout * 2))
+            log.warn(f"Could not update queue status: {e!r}")
+            if isinstance(e, (comm_base.RequestTimeoutError, asyncio.TimeoutError)):
                 warnings.warn(str(e))
-                log.info(f"Retrying in {self.timeout} seconds.")
-            else:
-                # Update succeeded, so wait for a second
-                self.timeout = 1
-            finally:
-                self.last_update = now
-        
+            log.info(f"Retrying in {self.timeout} seconds.")
+        else:
+            # Update succeeded, so go back to regular polling
+            self.timeout = self.poll_period
 
     @Slot(bool)
     def request_pause(self, defer: bool = True):
         """Ask the queueserver run engine to pause.
-        
+
         Parameters
         ==========
         defer
@@ -76,28 +292,116 @@ class QueueClient(QObject):
 
         """
         option = "deferred" if defer else "immediate"
-        self.api.re_pause(option=option)
+        return self.submit(self.call_api("re_pause", option=option),
+                           priority=Priority.CONTROL)
+
+    @Slot()
+    def resume_runengine(self):
+        return self.submit(self.call_api("re_resume"), priority=Priority.CONTROL)
+
+    @Slot()
+    def stop_runengine(self):
+        return self.submit(self.call_api("re_stop"), priority=Priority.CONTROL)
+
+    @Slot()
+    def abort_runengine(self):
+        return self.submit(self.call_api("re_abort"), priority=Priority.CONTROL)
+
+    @Slot()
+    def halt_runengine(self):
+        return self.submit(self.call_api("re_halt"), priority=Priority.CONTROL)
 
     @Slot(object)
     def add_queue_item(self, item):
         log.info(f"Client adding item to queue: {item}")
-        result = self.api.item_add(item=item)
+        return self.submit(self._add_queue_item(item), priority=Priority.EDIT)
+
+    async def _add_queue_item(self, item):
+        result = await self.call_api("item_add", item=item)
         if result['success']:
             log.info(f"Item added. New queue length: {result['qsize']}")
             self.length_changed.emit(result['qsize'])
         else:
             log.error(f"Did not add queue item to queue: {result}")
             raise RuntimeError(result)
+        return result
+
+    @Slot(object)
+    def add_queue_items(self, items: Sequence):
+        """Add several items to the queue in a single request.
+
+        Emits *items_added* with a :py:class:`BatchResult`, and
+        *length_changed* once for the whole batch.
+
+        """
+        log.info(f"Client adding {len(items)} items to queue.")
+        return self.submit(self._add_queue_items(items), priority=Priority.EDIT)
+
+    async def _add_queue_items(self, items):
+        response = await self.call_api("item_add_batch", items=items)
+        result = BatchResult.from_response(items, response)
+        if result.success:
+            log.info(f"Added {len(items)} items. New queue length: {result.queue_length}")
+        else:
+            log.error(f"Did not add batch to queue: {response['msg']}")
+            for item, msg in result.failures:
+                log.error(f"Rejected queue item {item}: {msg}")
+        self.items_added.emit(result)
+        if result.queue_length is not None:
+            self.length_changed.emit(result.queue_length)
+        return result
 
     @Slot()
     def start_queue(self):
-        self.api.queue_start()
+        return self.submit(self.call_api("queue_start"), priority=Priority.CONTROL)
+
+    @Slot()
+    def check_status(self):
+        """Ask the queueserver for its status and report any changes.
+
+        The status is small, so it can be polled often. The full queue
+        is only downloaded when the queue's UID changes.
+
+        """
+        return self.submit(self._check_status(), priority=Priority.STATUS)
+
+    async def _check_status(self):
+        status = await self.call_api("status")
+        if status != self._last_status:
+            self.status_changed.emit(status)
+            self._last_status = status
+        # Check the queue length
+        queue_length = int(status["items_in_queue"])
+        if queue_length != self._last_queue_length:
+            log.debug(f"Queue length updated: {queue_length}")
+            self.length_changed.emit(queue_length)
+            self._last_queue_length = queue_length
+        # Check for changes to the queue itself
+        queue_uid = status["plan_queue_uid"]
+        if queue_uid != self._last_queue_uid:
+            self._last_queue_uid = queue_uid
+            await self._check_queue()
+        return status
+
+    @Slot()
+    def check_queue(self):
+        """Download the full queue from the queueserver."""
+        return self.submit(self._check_queue(), priority=Priority.STATUS)
+
+    async def _check_queue(self):
+        queue = await self.call_api("queue_get")
+        log.debug(f"Queue updated: {queue['plan_queue_uid']}")
+        self.queue_changed.emit(queue)
+        return queue
 
     @Slot()
     def check_queue_length(self):
-        queue = self.api.queue_get()
-        print(queue)
+        return self.submit(self._check_queue_length(), priority=Priority.STATUS)
+
+    async def _check_queue_length(self):
+        queue = await self.call_api("queue_get")
         queue_length = len(queue['items'])
         log.debug(f"Queue length updated: {queue_length}")
         self.length_changed.emit(queue_length)
         self._last_queue_length = queue_length
+        return queue_length
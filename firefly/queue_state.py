@@ -0,0 +1,108 @@
+import logging
+from typing import Optional, Sequence
+
+from qtpy.QtCore import QObject, Signal, Slot
+
+
+log = logging.getLogger(__name__)
+
+
+def item_uid(item):
+    """Get a key that identifies a queue item."""
+    try:
+        return item["item_uid"]
+    except (TypeError, KeyError):
+        return repr(item)
+
+
+class QueueState(QObject):
+    """A local copy of the queueserver's queue and run engine state.
+
+    One instance is shared by the whole application, and is kept up
+    to date from the :py:class:`~firefly.queue_client.QueueClient`'s
+    *status_changed* and *queue_changed* signals. Changes are
+    announced with fine-grained signals, so that windows can update
+    their own views without asking the server again.
+
+    Applying the item signals in the order they are emitted to a
+    copy of the old *items* list results in the new *items* list.
+
+    """
+    items: list
+    running_item: Optional[dict] = None
+    manager_state: str = ""
+    history_length: int = 0
+    environment_open: bool = False
+
+    # Changes to the list of queued items
+    item_inserted = Signal(int, object)
+    item_removed = Signal(int, object)
+    item_moved = Signal(int, int)
+    item_changed = Signal(int, object)
+    length_changed = Signal(int)
+    # Changes to the run engine and its manager
+    running_item_changed = Signal(object)
+    manager_state_changed = Signal(str)
+    history_length_changed = Signal(int)
+    environment_changed = Signal(bool)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    @Slot(object)
+    def update_status(self, status):
+        """Update the state from the response to ``api.status()``."""
+        manager_state = str(status["manager_state"])
+        if manager_state != self.manager_state:
+            log.debug(f"Queue manager state: {self.manager_state} -> {manager_state}")
+            self.manager_state = manager_state
+            self.manager_state_changed.emit(manager_state)
+        history_length = int(status["items_in_history"])
+        if history_length != self.history_length:
+            self.history_length = history_length
+            self.history_length_changed.emit(history_length)
+        environment_open = bool(status["worker_environment_exists"])
+        if environment_open != self.environment_open:
+            self.environment_open = environment_open
+            self.environment_changed.emit(environment_open)
+
+    @Slot(object)
+    def update_queue(self, queue):
+        """Update the state from the response to ``api.queue_get()``."""
+        running_item = queue["running_item"] or None
+        if running_item != self.running_item:
+            self.running_item = running_item
+            self.running_item_changed.emit(running_item)
+        old_length = len(self.items)
+        self.update_items(list(queue["items"]))
+        if len(self.items) != old_length:
+            self.length_changed.emit(len(self.items))
+
+    def update_items(self, new_items: Sequence):
+        """Change the queued items, emitting a signal for each difference."""
+        items = self.items
+        new_uids = [item_uid(item) for item in new_items]
+        # Remove items that are no longer in the queue
+        keep = set(new_uids)
+        for idx in reversed(range(len(items))):
+            if item_uid(items[idx]) not in keep:
+                item = items.pop(idx)
+                self.item_removed.emit(idx, item)
+        # Move, insert and update the rest
+        for new_idx, (uid, new_item) in enumerate(zip(new_uids, new_items)):
+            uids = [item_uid(item) for item in items[new_idx:]]
+            if uid in uids:
+                old_idx = uids.index(uid) + new_idx
+                if old_idx != new_idx:
+                    items.insert(new_idx, items.pop(old_idx))
+                    self.item_moved.emit(old_idx, new_idx)
+                if items[new_idx] != new_item:
+                    items[new_idx] = new_item
+                    self.item_changed.emit(new_idx, new_item)
+            else:
+                items.insert(new_idx, new_item)
+                self.item_inserted.emit(new_idx, new_item)
@@ -0,0 +1,101 @@
+"""Fixed-size history of timestamped values.
+
+The arrays are allocated once, so memory use stays the same no matter
+how long Firefly runs, and appending a value does not copy anything.
+
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class RingBuffer:
+    """The most recent *capacity* (time, value) pairs.
+
+    Parameters
+    ==========
+    capacity
+      How many points to keep. Older points are overwritten.
+    dtype
+      Data type for the values.
+
+    """
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=dtype)
+        # Index of the next point to write, and how many points are stored
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._times.nbytes + self._values.nbytes
+
+    def append(self, timestamp: float, value):
+        self._times[self._head] = timestamp
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the stored (times, values), oldest first."""
+        start = (self._head - self._size) % self.capacity
+        idx = (start + np.arange(self._size)) % self.capacity
+        return self._times[idx], self._values[idx]
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if self._size == 0:
+            return None
+        idx = (self._head - 1) % self.capacity
+        return self._times[idx], self._values[idx]
+
+    def window(self, start: float = -np.inf, stop: float = np.inf,
+               max_points: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """The points between *start* and *stop* (inclusive), ready to plot.
+
+        If there are more than *max_points* points, they are reduced
+        with :py:func:`min_max_decimate`.
+
+        """
+        times, values = self.data()
+        # Times are appended in order, so a binary search is enough
+        lo = np.searchsorted(times, start, side="left")
+        hi = np.searchsorted(times, stop, side="right")
+        times, values = times[lo:hi], values[lo:hi]
+        if max_points is not None and len(times) > max_points:
+            times, values = min_max_decimate(times, values, max_points)
+        return times, values
+
+
+def min_max_decimate(times: np.ndarray, values: np.ndarray,
+                     max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a trace to at most *max_points* points for plotting.
+
+    The points are split into bins, and only the smallest and largest
+    value in each bin are kept, so spikes still show up on the plot.
+
+    """
+    num_bins = max(1, max_points // 2)
+    bin_size = int(np.ceil(len(values) / num_bins))
+    num_bins = int(np.ceil(len(values) / bin_size))
+    # Pad with the last value so that the points fill whole bins
+    padding = num_bins * bin_size - len(values)
+    binned = np.pad(values, (0, padding), mode="edge").reshape(num_bins, bin_size)
+    bin_times = np.pad(times, (0, padding), mode="edge").reshape(num_bins, bin_size)
+    rows = np.arange(num_bins)
+    idx_min = np.argmin(binned, axis=1)
+    idx_max = np.argmax(binned, axis=1)
+    # Keep the min and max in the order they happened
+    first = np.minimum(idx_min, idx_max)
+    second = np.maximum(idx_min, idx_max)
+    out_times = np.column_stack([bin_times[rows, first], bin_times[rows, second]]).ravel()
+    out_values = np.column_stack([binned[rows, first], binned[rows, second]]).ravel()
+    return out_times, out_values
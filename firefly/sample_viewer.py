@@ -0,0 +1,260 @@
+import math
+import time
+import logging
+from functools import partial
+
+import numpy as np
+from pydm.widgets.channel import PyDMChannel
+from qtpy.QtCore import QRectF, QTimer, Signal
+from haven import registry
+
+from firefly import display
+from firefly.channels import SharedChannel
+from firefly.image_processing import FrameDecoder, FrameStore, frame_from_array
+
+
+log = logging.getLogger(__name__)
+
+
+class SampleViewerDisplay(display.FireflyDisplay):
+    """Live view of a sample camera.
+
+    Frames from the areaDetector image plugin are decoded on a worker
+    pool and shown at no more than *max_display_rate* frames per
+    second. Zoomed-out frames are decimated after they arrive.
+
+    The ROI plugin is shared with other plugins and file writers, so
+    it is only changed if the user opts in with the "Crop on detector"
+    checkbox. Then, if the image plugin is fed by the ROI plugin, the
+    detector crops and bins the image to match the visible part of the
+    view, so less data is sent over the network.
+
+    """
+    max_display_rate: float = 10
+    image_plugin: str = "image1"
+    roi_plugin: str = "ROI1"
+    # How long the view must stay still before changing the ROI (ms)
+    roi_delay: int = 200
+    prefix: str = ""
+    decimation: int = 1
+    frames_shown: int = 0
+    _auto_range: bool = True
+
+    # Signals for writing to the detector's ROI plugin
+    roi_bin_changed = Signal(int)
+    roi_min_x_changed = Signal(int)
+    roi_size_x_changed = Signal(int)
+    roi_min_y_changed = Signal(int)
+    roi_size_y_changed = Signal(int)
+
+    def __init__(self, args=None, macros={}, **kwargs):
+        self.frames = FrameStore()
+        self._channels = []
+        super().__init__(args=args, macros=macros, **kwargs)
+
+    def customize_ui(self):
+        # Decode frames off the GUI thread
+        self.decoder = FrameDecoder(process=self.process_frame, parent=self)
+        self.decoder.max_fps = self.max_display_rate
+        self.decoder.frame_ready.connect(self.show_frame)
+        self.ui.max_rate_spinbox.setValue(self.max_display_rate)
+        self.ui.max_rate_spinbox.valueChanged.connect(self.set_max_display_rate)
+        self.ui.hardware_roi_checkbox.setChecked(False)
+        self.ui.hardware_roi_checkbox.toggled.connect(self.update_roi_status)
+        # Update the ROI once the user stops panning/zooming
+        self._roi_timer = QTimer(self)
+        self._roi_timer.setSingleShot(True)
+        self._roi_timer.setInterval(self.roi_delay)
+        self._roi_timer.timeout.connect(self.update_roi)
+        self.view_box().sigRangeChanged.connect(lambda *args: self._roi_timer.start())
+        # Periodically show how well we're keeping up
+        self._last_stats = (time.monotonic(), 0)
+        self._stats_timer = QTimer(self)
+        self._stats_timer.timeout.connect(self.update_stats)
+        self._stats_timer.start(1000)
+        # Add the available cameras
+        combobox = self.ui.camera_combobox
+        cameras = registry.findall(label="cameras", allow_none=True)
+        for cam in sorted(cameras, key=lambda c: c.name):
+            combobox.addItem(cam.description, cam.prefix)
+        prefix = self.macros().get("PREFIX")
+        if prefix is not None and combobox.findData(prefix) < 0:
+            combobox.addItem(prefix, prefix)
+        if prefix is not None:
+            combobox.setCurrentIndex(combobox.findData(prefix))
+        combobox.currentIndexChanged.connect(
+            lambda idx: self.set_camera(combobox.itemData(idx)))
+        if combobox.count() > 0:
+            self.set_camera(combobox.currentData())
+
+    def view_box(self):
+        view = self.ui.image_view.getView()
+        return view.getViewBox() if hasattr(view, "getViewBox") else view
+
+    def channels(self):
+        return self._channels
+
+    def set_camera(self, prefix: str):
+        """Start showing frames from the camera with PV *prefix*."""
+        for ch in self._channels:
+            ch.disconnect()
+        log.debug(f"Sample viewer showing camera: {prefix}")
+        self.prefix = prefix
+        self._dimensions = 2
+        self._sizes = [0, 0, 0]
+        self._sensor_size = [0, 0]
+        self._roi = {"bin_x": 1, "bin_y": 1, "min_x": 0, "min_y": 0}
+        self._ports = {"roi": None, "image_source": None}
+        self._roi_connected = False
+        self._auto_range = True
+        image = f"{prefix}{self.image_plugin}:"
+        roi = f"{prefix}{self.roi_plugin}:"
+        self._channels = [
+            # Frames from the image plugin
+            SharedChannel(f"{image}NDimensions_RBV", value_slot=self.update_dimensions),
+            SharedChannel(f"{image}ArraySize0_RBV", value_slot=partial(self.update_size, 0)),
+            SharedChannel(f"{image}ArraySize1_RBV", value_slot=partial(self.update_size, 1)),
+            SharedChannel(f"{image}ArraySize2_RBV", value_slot=partial(self.update_size, 2)),
+            SharedChannel(f"{image}ArrayData", value_slot=self.update_frame),
+            # For checking that the image plugin is fed by the ROI plugin
+            SharedChannel(f"{image}NDArrayPort_RBV", value_slot=partial(self.update_port, "image_source")),
+            SharedChannel(f"{roi}PortName_RBV", value_slot=partial(self.update_port, "roi"),
+                          connection_slot=self.update_roi_connection),
+            SharedChannel(f"{prefix}cam1:MaxSizeX_RBV", value_slot=partial(self.update_sensor_size, 0)),
+            SharedChannel(f"{prefix}cam1:MaxSizeY_RBV", value_slot=partial(self.update_sensor_size, 1)),
+            # Current ROI on the detector
+            SharedChannel(f"{roi}BinX_RBV", value_slot=partial(self.update_roi_readback, "bin_x")),
+            SharedChannel(f"{roi}BinY_RBV", value_slot=partial(self.update_roi_readback, "bin_y")),
+            SharedChannel(f"{roi}MinX_RBV", value_slot=partial(self.update_roi_readback, "min_x")),
+            SharedChannel(f"{roi}MinY_RBV", value_slot=partial(self.update_roi_readback, "min_y")),
+            # Changing the ROI on the detector
+            PyDMChannel(f"{roi}BinX", value_signal=self.roi_bin_changed),
+            PyDMChannel(f"{roi}BinY", value_signal=self.roi_bin_changed),
+            PyDMChannel(f"{roi}MinX", value_signal=self.roi_min_x_changed),
+            PyDMChannel(f"{roi}SizeX", value_signal=self.roi_size_x_changed),
+            PyDMChannel(f"{roi}MinY", value_signal=self.roi_min_y_changed),
+            PyDMChannel(f"{roi}SizeY", value_signal=self.roi_size_y_changed),
+        ]
+        for ch in self._channels:
+            ch.connect()
+
+    @property
+    def hardware_roi(self) -> bool:
+        """Whether the user has allowed changes to the detector's ROI plugin."""
+        return self.ui.hardware_roi_checkbox.isChecked()
+
+    @property
+    def roi_available(self) -> bool:
+        """Whether the detector's ROI plugin feeds the image plugin."""
+        roi_port = self._ports["roi"]
+        return (self._roi_connected and roi_port is not None
+                and roi_port == self._ports["image_source"])
+
+    def update_roi_connection(self, connected):
+        self._roi_connected = bool(connected)
+        self.update_roi_status()
+
+    def update_port(self, key, port):
+        self._ports[key] = str(port)
+        self.update_roi_status()
+
+    def update_roi_status(self, *args):
+        self.ui.roi_status_label.setText("Available" if self.roi_available else "Unavailable")
+
+    def update_roi_readback(self, key, value):
+        self._roi[key] = int(value)
+
+    def update_sensor_size(self, axis, size):
+        self._sensor_size[axis] = int(size)
+
+    def update_dimensions(self, dimensions):
+        self._dimensions = int(dimensions)
+
+    def update_size(self, axis, size):
+        self._sizes[axis] = int(size)
+
+    def update_frame(self, data):
+        if min(self._sizes[:3 if self._dimensions == 3 else 2]) <= 0:
+            return
+        # Snapshot the GUI state, since the frame is processed on another thread
+        self.decoder.submit(data, dimensions=self._dimensions, sizes=self._sizes,
+                            decimation=self.decimation, roi=dict(self._roi))
+
+    def set_max_display_rate(self, rate: float):
+        self.max_display_rate = rate
+        self.decoder.max_fps = rate
+
+    def process_frame(self, data, dimensions, sizes, decimation=1, roi=None):
+        """Reshape and decimate a raw frame into the frame store.
+
+        Runs on the worker pool, so it only uses the *decimation* and
+        *roi* that were current when the frame arrived.
+
+        """
+        roi = {"bin_x": 1, "bin_y": 1, "min_x": 0, "min_y": 0} if roi is None else roi
+        frame = frame_from_array(data, dimensions=dimensions, sizes=sizes)
+        # Remember where the frame goes in full-sensor coordinates
+        height, width = frame.shape[:2]
+        frame = frame[::decimation, ::decimation]
+        rect = (roi["min_x"], roi["min_y"], width * roi["bin_x"], height * roi["bin_y"])
+        return self.frames.write(frame), rect
+
+    def show_frame(self, result):
+        frame, rect = result
+        image_item = self.ui.image_view.getImageItem()
+        # pyqtgraph images are indexed (x, y)
+        image_item.setImage(np.swapaxes(frame, 0, 1), autoLevels=True)
+        image_item.setRect(QRectF(*rect))
+        self.frames_shown += 1
+        if self._auto_range:
+            # Show the whole image first, then leave the view to the user
+            self.view_box().autoRange()
+            self.view_box().disableAutoRange()
+            self._auto_range = False
+
+    def update_roi(self):
+        """Match the transferred image to the visible part of the view.
+
+        If the user allowed it and the detector supports it, the ROI
+        plugin crops and bins the image. Otherwise frames are decimated
+        after they arrive.
+
+        """
+        if self.frames_shown == 0:
+            return
+        view_box = self.view_box()
+        # Number of sensor pixels per screen pixel
+        pixel_size = view_box.viewPixelSize()
+        factor = max(1, int(min(pixel_size)))
+        max_x, max_y = self._sensor_size
+        if not (self.hardware_roi and self.roi_available) or max_x <= 0 or max_y <= 0:
+            self.decimation = factor
+            return
+        # Have the detector crop and bin the image instead
+        self.decimation = 1
+        (x0, x1), (y0, y1) = view_box.viewRange()
+        min_x = int(np.clip(x0, 0, max_x - 1))
+        min_y = int(np.clip(y0, 0, max_y - 1))
+        size_x = int(np.clip(math.ceil(x1) - min_x, 1, max_x - min_x))
+        size_y = int(np.clip(math.ceil(y1) - min_y, 1, max_y - min_y))
+        log.debug(f"Setting {self.roi_plugin}: bin={factor}, "
+                  f"x=({min_x}, {size_x}), y=({min_y}, {size_y})")
+        self.roi_bin_changed.emit(factor)
+        self.roi_min_x_changed.emit(min_x)
+        self.roi_size_x_changed.emit(size_x)
+        self.roi_min_y_changed.emit(min_y)
+        self.roi_size_y_changed.emit(size_y)
+
+    def update_stats(self):
+        """Show the displayed frame rate, dropped frames and decode time."""
+        now = time.monotonic()
+        last_time, last_shown = self._last_stats
+        fps = (self.frames_shown - last_shown) / max(now - last_time, 1e-9)
+        self._last_stats = (now, self.frames_shown)
+        self.ui.stats_label.setText(
+            f"{fps:.1f} fps\n"
+            f"{self.decoder.dropped} frames dropped\n"
+            f"Decode: {self.decoder.decode_time * 1000:.1f} ms")
+
+    def ui_filename(self):
+        return "sample_viewer.ui"
@@ -3,70 +3,97 @@ import logging
 import haven
 
 from firefly import display
+from firefly.beamline_health import BeamlineHealth, StatusSignal
+from firefly.config import get_config
+from firefly.status_tiles import StatusTileGrid
 
 log = logging.getLogger(__name__)
 
 
+# PVs from the storage ring and the APS personnel safety system
+ring_current_pv = "S:SRcurrentAI"
+shutter_permit_pv = "ACIS:ShutterPermit"
+
+
 class StatusDisplay(display.FireflyDisplay):
+    """Overview of the beamline's health.
+
+    Devices are looked up in the registry once, when the display is
+    created, and their PVs are summarized by a
+    :py:class:`~firefly.beamline_health.BeamlineHealth` model shown as
+    a grid of tiles. Only the shutter buttons are separate widgets.
+
+    """
+    health: BeamlineHealth = None
 
     def __init__(self, args=None, macros={}, **kwargs):
+        msg = "COMPONENT_NOT_FOUND"
+        # Find all the devices in one pass through the registry
+        shutters = haven.registry.findall(label="shutters", allow_none=True)
+        self.shutterA = next((s for s in shutters if s.name == "Shutter A"), None)
+        self.shutterCD = next((s for s in shutters if s.name != "Shutter A"), None)
+        self.mono = haven.registry.find(name="monochromator", allow_none=True)
         _macros = {}
         # Set up macros for the A shutter
-        try:
-            shutterA = haven.registry.find(name="Shutter A", allow_none=False)
-        except haven.exceptions.ComponentNotFound:
-            msg = "COMPONENT_NOT_FOUND"
+        if self.shutterA is None:
             log.warning("Could not find 'Shutter A' device in haven registry.")
-            _macros.update({
-                "FES_STATE_PV": msg,
-                "FES_OPEN_PV": msg,
-                "FES_CLOSE_PV": msg,
-            })
+            _macros.update({"FES_OPEN_PV": msg, "FES_CLOSE_PV": msg})
         else:
             _macros.update({
-                "FES_STATE_PV": shutterA.state_pv,
-                "FES_OPEN_PV": shutterA.open_signal.pvname,
-                "FES_CLOSE_PV": shutterA.close_signal.pvname,
+                "FES_OPEN_PV": self.shutterA.open_signal.pvname,
+                "FES_CLOSE_PV": self.shutterA.close_signal.pvname,
             })
         # Set up the C or D hutch shutter
-        try:
-            shutters = haven.registry.findall(label="shutters", allow_none=False)
-            shutterCD = [s for s in shutters if s.name != "Shutter A"][0]
-        # except IndexError:
-        #     # We only have one shutter, probably during testing
-        #     # so for now we just reuse the A shutter.
-        #     shutterCD = shutterA
-        except (haven.exceptions.ComponentNotFound, IndexError):
-            msg = "COMPONENT_NOT_FOUND"
+        if self.shutterCD is None:
             log.warning("Could not find a C or D hutch shutter device in haven registry.")
-            _macros.update({
-                "SCDS_STATE_PV": msg,
-                "SCDS_OPEN_PV": msg,
-                "SCDS_CLOSE_PV": msg,
-            })
+            _macros.update({"SCDS_OPEN_PV": msg, "SCDS_CLOSE_PV": msg})
         else:
             _macros.update({
-                "SCDS_STATE_PV": shutterCD.state_pv,
-                "SCDS_OPEN_PV": shutterCD.open_signal.pvname,
-                "SCDS_CLOSE_PV": shutterCD.close_signal.pvname,
+                "SCDS_OPEN_PV": self.shutterCD.open_signal.pvname,
+                "SCDS_CLOSE_PV": self.shutterCD.close_signal.pvname,
             })
-        try:
-            mono = haven.registry.find(name="monochromator")
-        except haven.exceptions.ComponentNotFound:
-            msg = "COMPONENT_NOT_FOUND"
+        if self.mono is None:
             log.warning("Could not find monochromator device in haven registry.")
-            _macros.update({
-                "ENERGY_PV": msg,
-                "MONO_MODE_PV": msg,
-            })
-        else:
-            _macros.update({
-                "ENERGY_PV": mono.energy.user_readback.pvname,
-                "MONO_MODE_PV": mono.mode.pvname,
-            })            
         # Set default macros
         _macros.update(macros)
         super().__init__(args=args, macros=_macros, **kwargs)
-    
+
+    def health_signals(self) -> list:
+        """The PVs that go into the beamline health summary."""
+        signals = [
+            StatusSignal("ring_current", ring_current_pv, "Stored Beam",
+                         kind="ring_current", role="beam", units="mA"),
+            StatusSignal("shutter_permit", shutter_permit_pv, "Shutter Permit",
+                         kind="permit", role="beam"),
+        ]
+        if self.shutterA is not None:
+            signals.append(StatusSignal("shutter_a", self.shutterA.state_pv, "Shutter A",
+                                        kind="shutter", role="beam"))
+        if self.shutterCD is not None:
+            signals.append(StatusSignal("shutter_cd", self.shutterCD.state_pv, "Shutter C/D",
+                                        kind="shutter", role="hutch"))
+        if self.mono is not None:
+            signals.append(StatusSignal("energy", self.mono.energy.user_readback.pvname,
+                                        "Energy", units="eV"))
+        # Extra signals from the beamline's config file
+        config = get_config().get("beamline_status", {})
+        for gauge in config.get("vacuum", ()):
+            signals.append(StatusSignal(f"vacuum_{gauge['name']}", gauge["pv"], gauge["name"],
+                                        kind="vacuum", threshold=gauge.get("threshold"),
+                                        units="Torr"))
+        for ioc, pv in config.get("ioc_heartbeats", {}).items():
+            signals.append(StatusSignal(f"heartbeat_{ioc}", pv, ioc, kind="heartbeat"))
+        return signals
+
+    def customize_ui(self):
+        self.health = BeamlineHealth(self.health_signals(), parent=self)
+        self.tile_grid = StatusTileGrid(parent=self)
+        self.ui.verticalLayout.insertWidget(0, self.tile_grid)
+        self.health.states_changed.connect(self.tile_grid.update_tiles)
+        self.health.connect()
+
+    def channels(self):
+        return [] if self.health is None else self.health.channels()
+
     def ui_filename(self):
         return "status.ui"
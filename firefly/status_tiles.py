@@ -0,0 +1,45 @@
+from typing import Mapping
+
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QGridLayout, QLabel, QWidget
+
+from firefly.beamline_health import Severity, TileState
+
+
+severity_styles = {
+    Severity.OK: "background-color: rgb(170, 230, 170);",
+    Severity.WARNING: "background-color: rgb(250, 230, 130);",
+    Severity.ALARM: "background-color: rgb(240, 130, 130);",
+    Severity.DISCONNECTED: "background-color: rgb(220, 220, 220); color: rgb(120, 120, 120);",
+}
+
+
+class StatusTileGrid(QWidget):
+    """A compact grid of colored tiles, one for each status.
+
+    Tiles are created the first time their state arrives, and only the
+    tiles whose state changed get updated.
+
+    """
+    columns: int = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.tiles = {}
+        self.grid = QGridLayout(self)
+        self.grid.setSpacing(4)
+
+    def update_tiles(self, states: Mapping[str, TileState]):
+        for key, state in states.items():
+            tile = self.tiles.get(key)
+            if tile is None:
+                tile = self.tiles[key] = QLabel(parent=self)
+                tile.setAlignment(Qt.AlignCenter)
+                tile.setObjectName(f"{key}_tile")
+                idx = len(self.tiles) - 1
+                self.grid.addWidget(tile, idx // self.columns, idx % self.columns)
+            tile.setText(f"<b>{state.label}</b><br/>{state.text}")
+            # Re-styling is slow, so only do it when the color changes
+            if tile.property("severity") != int(state.severity):
+                tile.setProperty("severity", int(state.severity))
+                tile.setStyleSheet(f"QLabel {{ {severity_styles[state.severity]} padding: 4px; }}")
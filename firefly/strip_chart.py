@@ -0,0 +1,68 @@
+import time
+import logging
+
+import pyqtgraph as pg
+from qtpy.QtCore import QTimer
+
+from firefly.ring_buffer import RingBuffer
+
+
+log = logging.getLogger(__name__)
+
+
+class StripChart(pg.PlotWidget):
+    """A rolling plot of a value's recent history.
+
+    Points are kept in a fixed-size :py:class:`RingBuffer`. The plot is
+    redrawn at most *refresh_rate* times per second, and only while
+    visible, and zoomed-out views are reduced to about one point per
+    pixel with min/max decimation.
+
+    Parameters
+    ==========
+    capacity
+      How many points to remember (default: 1 hour at 10 Hz).
+    refresh_rate
+      How many times per second to redraw the plot.
+
+    """
+    def __init__(self, capacity: int = 36000, refresh_rate: float = 2,
+                 parent=None, **kwargs):
+        super().__init__(parent=parent, axisItems={"bottom": pg.DateAxisItem()}, **kwargs)
+        self.buffer = RingBuffer(capacity)
+        self.curve = self.plot([], [])
+        self.setMouseEnabled(x=True, y=False)
+        self._stale = False
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(int(1000 / refresh_rate))
+        self._refresh_timer.timeout.connect(self.redraw)
+        self._refresh_timer.start()
+        # Zooming and panning should show the points in the new range
+        self.getViewBox().sigXRangeChanged.connect(self.mark_stale)
+
+    def append(self, value, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        self.buffer.append(timestamp, value)
+        self._stale = True
+
+    def mark_stale(self, *args):
+        self._stale = True
+
+    def redraw(self):
+        """Plot the points in view, if anything changed."""
+        if not (self._stale and self.isVisible()):
+            return
+        self._stale = False
+        view_box = self.getViewBox()
+        if view_box.autoRangeEnabled()[0]:
+            start, stop = -float("inf"), float("inf")
+        else:
+            start, stop = view_box.viewRange()[0]
+        # About one min/max pair per pixel is all that can be seen
+        max_points = max(2 * int(view_box.width()), 2)
+        times, values = self.buffer.window(start, stop, max_points=max_points)
+        self.curve.setData(times, values)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.redraw()
@@ -0,0 +1,185 @@
+"""Lightweight tracing of what Firefly is doing, and when.
+
+Tracing is off by default, and costs next to nothing until
+:py:func:`enable` is called (e.g. by ``firefly --trace FILE``). Events
+are saved in the Chrome trace-event JSON format, which can be viewed
+with https://ui.perfetto.dev or chrome://tracing.
+
+.. code-block:: python
+
+    from firefly import tracing
+
+    with tracing.trace("load_devices", category="startup"):
+        ...
+
+    @tracing.traced(category="queue")
+    def add_queue_item(item):
+        ...
+
+    async def get_status():
+        async with tracing.trace_async("get_status", category="queue"):
+            await api.status()
+
+"""
+import os
+import json
+import time
+import inspect
+import threading
+import itertools
+import functools
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Optional
+
+from qtpy.QtCore import QThread
+
+
+log = logging.getLogger(__name__)
+
+
+_enabled = False
+_events = []
+_thread_names = {}
+_async_ids = itertools.count(1)
+_t0 = time.perf_counter_ns()
+
+
+def enable():
+    """Start recording trace events."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording trace events."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    """Discard all recorded events."""
+    _events.clear()
+    _thread_names.clear()
+
+
+def _now() -> float:
+    """Microseconds since tracing was imported."""
+    return (time.perf_counter_ns() - _t0) / 1000
+
+
+def _thread_id() -> int:
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        # QThreads show up in python as dummy threads, so prefer the Qt name
+        name = QThread.currentThread().objectName() or threading.current_thread().name
+        _thread_names[tid] = name
+    return tid
+
+
+def _add_event(**event):
+    _events.append({"pid": os.getpid(), "tid": _thread_id(), **event})
+
+
+@contextmanager
+def trace(name: str, category: str = "firefly", **args):
+    """Record how long the body of the ``with`` statement takes.
+
+    Extra keyword arguments are saved with the event. Only use this
+    for synchronous code: spans that ``await`` can overlap with others
+    on the same thread, so use :py:func:`trace_async` instead.
+
+    """
+    if not _enabled:
+        yield
+        return
+    start = _now()
+    try:
+        yield
+    finally:
+        _add_event(name=name, cat=category, ph="X", ts=start,
+                   dur=_now() - start, args=args)
+
+
+@asynccontextmanager
+async def trace_async(name: str, category: str = "firefly", **args):
+    """Record how long the body of the ``async with`` statement takes.
+
+    Saved as a pair of async begin/end events with their own ID, so
+    that coroutines running at the same time on one event loop show
+    up as separate spans.
+
+    """
+    if not _enabled:
+        yield
+        return
+    span_id = next(_async_ids)
+    _add_event(name=name, cat=category, ph="b", id=span_id, ts=_now(), args=args)
+    try:
+        yield
+    finally:
+        _add_event(name=name, cat=category, ph="e", id=span_id, ts=_now())
+
+
+def traced(name: Optional[str] = None, category: str = "firefly"):
+    """Decorator that records each call to a function or coroutine.
+
+    Parameters
+    ==========
+    name
+      Name for the trace events. Defaults to the function's qualified
+      name.
+    category
+      Category for grouping the trace events.
+
+    """
+    def decorator(func):
+        event_name = func.__qualname__ if name is None else name
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                async with trace_async(event_name, category=category):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with trace(event_name, category=category):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instant(name: str, category: str = "firefly", **args):
+    """Record a single point in time."""
+    if _enabled:
+        _add_event(name=name, cat=category, ph="i", s="t", ts=_now(), args=args)
+
+
+def trace_channel_connections():
+    """Record when PyDM channels get connected and disconnected."""
+    from pydm.widgets.channel import PyDMChannel
+    if getattr(PyDMChannel, "_firefly_traced", False):
+        return
+    for method_name in ["connect", "disconnect"]:
+        method = getattr(PyDMChannel, method_name)
+        def wrapper(self, *args, _method=method, _name=method_name, **kwargs):
+            with trace(f"PyDMChannel.{_name}", category="channels", address=self.address):
+                return _method(self, *args, **kwargs)
+        setattr(PyDMChannel, method_name, functools.wraps(method)(wrapper))
+    PyDMChannel._firefly_traced = True
+
+
+def save(fp: Path):
+    """Write the recorded events to a Chrome trace-event JSON file."""
+    metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(),
+                 "tid": tid, "args": {"name": name}}
+                for tid, name in _thread_names.items()]
+    with open(fp, mode="w") as fd:
+        json.dump({"traceEvents": [*metadata, *_events],
+                   "displayTimeUnit": "ms"}, fd)
+    log.info(f"Saved {len(_events)} trace events to {fp}")
@@ -1,10 +1,13 @@
 import logging
 
-from pydm.widgets.channel import PyDMChannel
 from haven.instrument.ion_chamber import IonChamber
-from haven import load_config
 
 from firefly import display
+from firefly.coalescer import UpdateCoalescer
+from firefly.channels import SharedChannel
+from firefly.config import get_config
+from firefly.auto_range import AutoRangeController
+from firefly.strip_chart import StripChart
 
 log = logging.getLogger(__name__)
 
@@ -13,17 +16,32 @@ class VoltmeterDisplay(display.FireflyDisplay):
     _device: IonChamber = None
     gain_values = [1, 2, 5, 10, 20, 50, 100, 200, 500]
     gain_units = ["pA/V", "nA/V", "µA/V", "mA/V"]
+    # For converting the current to amps in the history plot
+    unit_scales = {"pA": 1e-12, "nA": 1e-9, "µA": 1e-6, "mA": 1e-3}
+    gain = None
+    gain_unit = None
+    # Most times per second to redraw the current label
+    max_refresh_rate: float = 10
+    _voltage = None
+    _drawn_inputs = None
+    history_plot = None
+    auto_ranger = None
+    # Whether the current is calculated by a parent display instead
+    external_readout: bool = False
     
     def __init__(self, device: IonChamber = None, args=None, macros={}, **kwargs):
         self._device = device
-        default_ioc_prefix = load_config()['ion_chamber']['scaler']['ioc']
+        default_ioc_prefix = get_config()['ion_chamber']['scaler']['ioc']
         macros['IOC_VME'] = macros.get("IOC_VME", default_ioc_prefix)
         super().__init__(macros=macros, args=args, **kwargs)
     
     def customize_device(self):
+        # Owned by the display, so its timer can't fire after the display is gone
+        # (created here since the channels below may deliver cached values right away)
+        self._current_updater = UpdateCoalescer(self.draw_current, max_rate=self.max_refresh_rate,
+                                                parent=self)
         # Create and store the hardware device
         ch_num = self.macros().get("CHANNEL_NUMBER", None)
-        config = load_config()
         # preamp_ioc = config["ion_chamber"]["preamp"]["ioc"]
         preamp_prefix = self.macros().get("PREAMP_PREFIX", "")
         scaler_prefix = self.macros().get("SCALER_PREFIX", "")
@@ -35,23 +53,92 @@ class VoltmeterDisplay(display.FireflyDisplay):
                 log.debug(f"Voltmeter created new device: {self._device}")
             else:
                 log.warning(f"No device loaded for voltmeter: {self.macros}.")
-        # Setup a pydm channel to monitor the gain on the pre-amplifier
-        self._ch_gain_value = PyDMChannel("", value_slot=self.update_gain)
-        self._ch_gain_unit = PyDMChannel("", value_slot=self.update_gain_unit)
-        self._ch_voltage = PyDMChannel(self.ui.ion_chamber_label.channel, value_slot=self.update_current)
+        # Setup shared channels to monitor the gain on the pre-amplifier
+        self._ch_gain_value = SharedChannel(self.ui.sens_num_label.channel, value_slot=self.update_gain)
+        self._ch_gain_unit = SharedChannel(self.ui.sens_unit_label.channel, value_slot=self.update_gain_unit)
+        self._ch_voltage = SharedChannel(self.ui.ion_chamber_label.channel, value_slot=self.update_current)
+        for ch in self.channels():
+            ch.connect()
+
+    def channels(self):
+        """Channels used for calculating the current.
+
+        PyDM disconnects these when the display is closed.
+
+        """
+        auto_range_channels = [] if self.auto_ranger is None else self.auto_ranger.channels()
+        if self.external_readout:
+            return auto_range_channels
+        return [self._ch_gain_value, self._ch_gain_unit, self._ch_voltage, *auto_range_channels]
+
+    def use_external_readout(self):
+        """Stop calculating the current, a parent display will do it.
+
+        See :py:class:`~firefly.voltmeters.VoltmetersDisplay`, which
+        converts all its ion chambers at once and calls
+        :py:meth:`show_current`.
+
+        """
+        if self.external_readout:
+            return
+        for ch in [self._ch_gain_value, self._ch_gain_unit, self._ch_voltage]:
+            ch.disconnect()
+        self.external_readout = True
 
     def update_gain(self, new_gain_idx):
         self.gain = self.gain_values[new_gain_idx]
+        self._current_updater.request()
 
     def update_gain_unit(self, new_unit_idx):
         unit = self.gain_units[new_unit_idx]
         self.gain_unit = unit.split("/")[0]
+        self._current_updater.request()
 
     def update_current(self, voltage):
-        text = f"({voltage / self.gain} {self.gain_unit})"
-        self.ui.ion_chamber_current.setText(text)
+        self._voltage = voltage
+        self._current_updater.request()
+
+    @property
+    def dropped_updates(self) -> int:
+        """How many current updates were merged to limit the refresh rate."""
+        return self._current_updater.dropped
+
+    def draw_current(self):
+        """Show the latest voltage as a current on the label.
+
+        Returns ``False`` if nothing was drawn.
+
+        """
+        inputs = (self._voltage, self.gain, self.gain_unit)
+        if None in inputs or inputs == self._drawn_inputs:
+            return False
+        voltage, gain, gain_unit = inputs
+        self.show_current(voltage / gain, gain_unit, voltage / gain * self.unit_scales[gain_unit])
+        self._drawn_inputs = inputs
+
+    def show_current(self, current: float, unit: str, amps: float):
+        """Show *current* (in *unit*) on the label, and *amps* in the history."""
+        self.ui.ion_chamber_current.setText(f"({current} {unit})")
+        if self.history_plot is not None:
+            self.history_plot.append(amps)
     
     def customize_ui(self):
+        # Recent history of the current
+        self.history_plot = StripChart(parent=self)
+        self.history_plot.setLabel("left", "Current", units="A")
+        self.history_plot.setFixedHeight(120)
+        self.ui.verticalLayout.addWidget(self.history_plot)
+        # Optional automatic gain ranging (the scaler is the ion chamber's PREFIX)
+        scaler = self.macros().get("PREFIX", "")
+        self.auto_ranger = AutoRangeController(
+            device=self._device,
+            voltage_address=self.ui.ion_chamber_label.channel,
+            count_address=f"{scaler}.CNT",
+            gain_address=self.ui.sens_num_label.channel,
+            unit_address=self.ui.sens_unit_label.channel,
+            parent=self)
+        self.ui.auto_range_checkbox.setEnabled(self._device is not None and scaler != "")
+        self.ui.auto_range_checkbox.toggled.connect(self.auto_ranger.set_enabled)
         # Gain adjustment buttons
         if self._device is not None:
             self.ui.gain_up_button.clicked.connect(self._device.increase_gain)
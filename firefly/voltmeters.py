@@ -1,11 +1,18 @@
 import json
+import math
 import warnings
 import logging
+from functools import partial
 
 from pydm.widgets import PyDMEmbeddedDisplay
+from qtpy.QtCore import QTimer, Signal
+from qtpy.QtWidgets import QLabel
 import haven
 
 from firefly import display
+from firefly.channels import SharedChannel
+from firefly.config import get_config
+from firefly.ion_chamber_readout import IonChamberReadout
 # from .voltmeter import VoltmeterDisplay
 
 
@@ -13,12 +20,32 @@ log = logging.getLogger(__name__)
 
 
 class VoltmetersDisplay(display.FireflyDisplay):
+    """Voltages and currents for all the ion chambers.
+
+    Currents are calculated for all the ion chambers at once by an
+    :py:class:`~firefly.ion_chamber_readout.IonChamberReadout`, up to
+    *refresh_rate* times per second, along with ratios between ion
+    chambers (e.g. I0/It).
+
+    """
     _ion_chamber_displays = []
+    refresh_rate: float = 10
+    # (name, numerator, denominator, take log) for derived signals
+    ratio_definitions = [
+        ("I0/It", "I0", "It", False),
+        ("ln(I0/It)", "I0", "It", True),
+        ("ln(It/Iref)", "It", "Iref", True),
+        ("If/I0", "If", "I0", False),
+    ]
+
+    # Emitted with a dictionary of the ratios between ion chambers
+    ratios_changed = Signal(object)
 
     def __init__(self, args=None, macros={}, **kwargs):
         self._ion_chamber_displays = []
+        self._readout_channels = []
         # Determine macros programatically from config file
-        config = haven.load_config()['ion_chamber']['scaler']
+        config = get_config()['ion_chamber']['scaler']
         macros["PREFIX"] = macros.get("PREFIX", f"{config['ioc']}:{config['record']}")
         super().__init__(args=args, macros=macros, **kwargs)
     
@@ -43,6 +70,61 @@ class VoltmetersDisplay(display.FireflyDisplay):
             # Add the Embedded Display to the Results Layout
             self.voltmeters_layout.addWidget(disp)
             self._ion_chamber_displays.append(disp)
+        self.setup_readout(sorted(ion_chambers, key=lambda c: c.ch_num))
+
+    def setup_readout(self, ion_chambers):
+        """Calculate the currents for all *ion_chambers* together."""
+        self.readout = IonChamberReadout([ic.name for ic in ion_chambers])
+        for name, numerator, denominator, log_ in self.ratio_definitions:
+            if {numerator, denominator}.issubset(self.readout.names):
+                self.readout.add_ratio(name, numerator, denominator, log=log_)
+        self._attached = set()
+        self._readout_channels = []
+        for idx, ic in enumerate(ion_chambers):
+            self._readout_channels.extend([
+                SharedChannel(f"{ic.prefix}_calc{ic.ch_num}.VAL",
+                              value_slot=partial(self.readout.set_voltage, idx)),
+                SharedChannel(f"{ic.preamp_prefix}:sens_num.VAL",
+                              value_slot=partial(self.readout.set_gain, idx)),
+                SharedChannel(f"{ic.preamp_prefix}:sens_unit.VAL",
+                              value_slot=partial(self.readout.set_unit, idx)),
+            ])
+        for ch in self._readout_channels:
+            ch.connect()
+        self.ratios_label = QLabel(parent=self)
+        self.ratios_label.setVisible(len(self.readout.ratios()) > 0)
+        self.ui.verticalLayout1.addWidget(self.ratios_label)
+        self._readout_timer = QTimer(self)
+        self._readout_timer.setInterval(int(1000 / self.refresh_rate))
+        self._readout_timer.timeout.connect(self.update_readout)
+        self._readout_timer.start()
+
+    def channels(self):
+        return self._readout_channels
+
+    def update_readout(self):
+        """Recalculate the currents and show them on the voltmeters."""
+        changed = set(self.readout.update().tolist())
+        # Voltmeters that have loaded since the last update
+        for idx, disp in enumerate(self._ion_chamber_displays):
+            if idx not in self._attached and disp.embedded_widget is not None:
+                disp.embedded_widget.use_external_readout()
+                self._attached.add(idx)
+                if math.isfinite(self.readout.currents[idx]):
+                    changed.add(idx)
+        for idx in sorted(changed & self._attached):
+            self._ion_chamber_displays[idx].embedded_widget.show_current(
+                float(self.readout.currents[idx]), self.readout.unit(idx),
+                float(self.readout.amps[idx]))
+        if len(changed) > 0:
+            self.update_ratios()
+
+    def update_ratios(self):
+        ratios = self.readout.ratios()
+        if len(ratios) == 0:
+            return
+        self.ratios_label.setText("    ".join(f"{name}: {val:.4g}" for name, val in ratios.items()))
+        self.ratios_changed.emit(ratios)
 
     def ui_filename(self):
         return "voltmeters.ui"
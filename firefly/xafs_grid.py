@@ -0,0 +1,173 @@
+"""Calculate the energy points and exposure times for an XAFS scan.
+
+Regions are given either in energy (eV) or in photoelectron
+wavenumber k (Å⁻¹), and are converted to one array of energies and
+one array of exposure times, ready to be sent to the queueserver.
+
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# ħ²/2mₑ, in eV·Å², for converting between k and energy
+KE_FACTOR = 3.80998212
+
+# Energies closer together than this (in eV) are the same point
+energy_tolerance = 1e-3
+
+
+def k_to_energy(k, E0: float = 0):
+    """Convert photoelectron wavenumber (Å⁻¹) to X-ray energy (eV)."""
+    return E0 + KE_FACTOR * np.square(k)
+
+
+def energy_to_k(energy, E0: float = 0):
+    """Convert X-ray energy (eV) to photoelectron wavenumber (Å⁻¹)."""
+    return np.sqrt(np.clip(np.asarray(energy) - E0, 0, None) / KE_FACTOR)
+
+
+@dataclass(frozen=True)
+class XafsRegion:
+    """One region of an XAFS scan.
+
+    Parameters
+    ==========
+    start
+      First point of the region, in eV (or Å⁻¹ if *k_space*).
+    stop
+      Last point of the region, in eV (or Å⁻¹ if *k_space*).
+    step
+      Spacing between points, in eV (or Å⁻¹ if *k_space*).
+    exposure
+      Counting time at each point, in seconds. In k-space, this is
+      the time at *start*.
+    k_space
+      If true, *start*, *stop*, and *step* are wavenumbers relative
+      to the edge.
+    k_weight
+      Exposure times in k-space are scaled by (k/*start*)^*k_weight*.
+
+    """
+    start: float
+    stop: float
+    step: float
+    exposure: float = 1.0
+    k_space: bool = False
+    k_weight: float = 0.0
+
+    def num_points(self) -> int:
+        return int(np.floor((self.stop - self.start) / self.step + 1e-9)) + 1
+
+    def points(self) -> np.ndarray:
+        """The region's points in its own units (eV or Å⁻¹)."""
+        return self.start + self.step * np.arange(self.num_points())
+
+    def energies(self, E0: Optional[float] = None) -> np.ndarray:
+        """Absolute energies (eV) for this region.
+
+        Energy regions are relative to *E0* if given, otherwise
+        absolute. K-space regions require *E0*.
+
+        """
+        points = self.points()
+        if self.k_space:
+            return k_to_energy(points, E0=E0)
+        return points if E0 is None else points + E0
+
+    def exposures(self) -> np.ndarray:
+        """Counting time (s) at each point in the region."""
+        points = self.points()
+        if self.k_space and self.k_weight != 0 and self.start > 0:
+            return self.exposure * (points / self.start) ** self.k_weight
+        return np.full_like(points, self.exposure, dtype=float)
+
+    def energy_range(self, E0: Optional[float] = None):
+        """(first, last) absolute energy of the region."""
+        if self.k_space:
+            return tuple(k_to_energy(np.array([self.start, self.stop]), E0=E0))
+        offset = 0 if E0 is None else E0
+        return (self.start + offset, self.stop + offset)
+
+
+def validate_regions(regions: Sequence[XafsRegion], E0: Optional[float] = None) -> list:
+    """Check the regions for problems before they are scanned.
+
+    Returns
+    =======
+    problems
+      Human-readable descriptions of anything wrong, e.g. overlapping
+      regions or gaps between them. Empty if the regions are fine.
+
+    """
+    problems = []
+    previous = None
+    for idx, region in enumerate(regions, start=1):
+        if region.step <= 0:
+            problems.append(f"Region {idx}: step must be positive.")
+            continue
+        if region.stop < region.start:
+            problems.append(f"Region {idx}: stop is before start.")
+            continue
+        if region.exposure <= 0:
+            problems.append(f"Region {idx}: exposure must be positive.")
+        if region.k_space and E0 is None:
+            problems.append(f"Region {idx}: k-space requires an edge (E0).")
+            continue
+        if region.k_space and region.start < 0:
+            problems.append(f"Region {idx}: k cannot be negative.")
+            continue
+        start, stop = region.energy_range(E0=E0)
+        if previous is not None:
+            prev_start, prev_stop, prev_step = previous
+            if start < prev_stop - energy_tolerance:
+                problems.append(f"Region {idx} overlaps region {idx - 1}.")
+            elif start > prev_stop + prev_step + energy_tolerance:
+                problems.append(f"Gap of {start - prev_stop:.2f} eV between "
+                                f"regions {idx - 1} and {idx}.")
+        # Energy step at the end of the region, for detecting gaps
+        if region.k_space:
+            last_step = stop - k_to_energy(region.stop - region.step, E0=E0)
+        else:
+            last_step = region.step
+        previous = (start, stop, last_step)
+    return problems
+
+
+def energy_grid(regions: Sequence[XafsRegion], E0: Optional[float] = None):
+    """Build the energies and exposure times for a list of regions.
+
+    Points shared by the end of one region and the start of the next
+    are only measured once.
+
+    Returns
+    =======
+    energies
+      Absolute X-ray energies, in eV.
+    exposures
+      Counting time at each energy, in seconds.
+
+    """
+    if len(regions) == 0:
+        return np.array([]), np.array([])
+    energies = np.concatenate([r.energies(E0=E0) for r in regions])
+    exposures = np.concatenate([r.exposures() for r in regions])
+    # Remove duplicated points at the region boundaries
+    keep = np.ones(len(energies), dtype=bool)
+    keep[1:] = np.abs(np.diff(energies)) > energy_tolerance
+    return energies[keep], exposures[keep]
+
+
+def scan_duration(exposures: np.ndarray, overhead: float = 0.0) -> float:
+    """Estimate how long a scan will take, in seconds.
+
+    Parameters
+    ==========
+    exposures
+      Counting time at each point, in seconds.
+    overhead
+      Extra time per point (e.g. moving the monochromator), in seconds.
+
+    """
+    return float(np.sum(exposures) + overhead * len(exposures))
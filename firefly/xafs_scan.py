@@ -1,9 +1,20 @@
-from qtpy import QtWidgets
+import datetime as dt
+import logging
+from typing import Optional
+
+from qtpy import QtWidgets, QtCore
 
 from firefly import display
+from firefly.xray_edges import load_edge_index
+from firefly.xafs_grid import XafsRegion, energy_grid, validate_regions, scan_duration
+
+
+log = logging.getLogger(__name__)
 
 
 class XafsScanRegion:
+    default_exposure = 1.0
+
     def __init__(self):
         self.setup_ui()
 
@@ -21,6 +32,10 @@ class XafsScanRegion:
         self.step_line_edit = QtWidgets.QLineEdit()
         self.step_line_edit.setPlaceholderText("Step…")
         self.layout.addWidget(self.step_line_edit)
+        # Exposure time box
+        self.exposure_line_edit = QtWidgets.QLineEdit()
+        self.exposure_line_edit.setPlaceholderText(f"Exposure ({self.default_exposure} s)…")
+        self.layout.addWidget(self.exposure_line_edit)
         # K-space checkbox
         self.k_space_checkbox = QtWidgets.QCheckBox()
         self.k_space_checkbox.setText("K-space")
@@ -35,6 +50,28 @@ class XafsScanRegion:
         self.k_space_checkbox.stateChanged.connect(
             self.k_weight_line_edit.setEnabled)
 
+    def line_edits(self):
+        return [self.start_line_edit, self.stop_line_edit, self.step_line_edit,
+                self.exposure_line_edit, self.k_weight_line_edit]
+
+    def is_empty(self) -> bool:
+        return not any(edit.text().strip() for edit in self.line_edits())
+
+    def region(self) -> Optional[XafsRegion]:
+        """Build the scan region from the UI, or ``None`` if incomplete."""
+        k_space = self.k_space_checkbox.isChecked()
+        try:
+            return XafsRegion(
+                start=float(self.start_line_edit.text()),
+                stop=float(self.stop_line_edit.text()),
+                step=float(self.step_line_edit.text()),
+                exposure=float(self.exposure_line_edit.text() or self.default_exposure),
+                k_space=k_space,
+                k_weight=float(self.k_weight_line_edit.text() or 0) if k_space else 0,
+            )
+        except ValueError:
+            return None
+
     def update_edge_enabled(self, is_checked: int):
         # Go back to real space if k-space was enabled
         if not is_checked:
@@ -45,8 +82,25 @@ class XafsScanRegion:
 
 
 class XafsScanDisplay(display.FireflyDisplay):
+    min_energy = 4000
+    max_energy = 27000
+    stylesheet_danger = "color: rgb(220, 53, 69)"
+    stylesheet_normal = ""
+    energies = None
+    exposures = None
+
     def customize_ui(self):
         self.reset_default_regions()
+        # Set up the combo box with X-ray edges
+        self.edges = load_edge_index().filter(self.min_energy, self.max_energy)
+        self.ui.edge_combo_box.addItems(self.edges.labels())
+        # Label for showing the size of the scan
+        self.ui.scan_summary_label = QtWidgets.QLabel()
+        self.ui.buttons_layout.insertWidget(0, self.ui.scan_summary_label)
+        # Update the energy points when the scan parameters change
+        self.ui.edge_combo_box.currentIndexChanged.connect(self.update_energies)
+        self.ui.use_edge_checkbox.stateChanged.connect(self.update_energies)
+        self.update_energies()
         # Connect the E0 checkbox to the E0 combobox
         self.ui.use_edge_checkbox.stateChanged.connect(
             self.edge_combo_box.setEnabled)
@@ -64,8 +118,47 @@ class XafsScanDisplay(display.FireflyDisplay):
             # Connect the E0 checkbox to each of the regions
             self.ui.use_edge_checkbox.stateChanged.connect(
                 region.update_edge_enabled)
+            # Connect the region's widgets to recalculate the energies
+            for line_edit in region.line_edits():
+                line_edit.textChanged.connect(self.update_energies)
+            region.k_space_checkbox.stateChanged.connect(self.update_energies)
             # Save it to the list
             self.regions.append(region)
         
+    def E0(self) -> Optional[float]:
+        """The energy of the selected edge, if one is being used."""
+        if not self.ui.use_edge_checkbox.isChecked():
+            return None
+        idx = self.ui.edge_combo_box.currentIndex()
+        if idx < 0:
+            return None
+        return float(self.edges[idx]["energy"])
+
+    @QtCore.Slot()
+    def update_energies(self, *args):
+        """Recalculate the scan's energies and check the regions."""
+        label = self.ui.scan_summary_label
+        rows = [r for r in self.regions if not r.is_empty()]
+        regions = [r.region() for r in rows]
+        # Check that the regions are usable
+        if None in regions:
+            problems = ["Regions are incomplete."]
+        elif len(regions) == 0:
+            problems = ["No regions."]
+        else:
+            problems = validate_regions(regions, E0=self.E0())
+        if len(problems) > 0:
+            self.energies, self.exposures = None, None
+            label.setText(" ".join(problems))
+            label.setStyleSheet(self.stylesheet_danger)
+            self.ui.run_scan_button.setEnabled(False)
+            return
+        # Calculate the energy points
+        self.energies, self.exposures = energy_grid(regions, E0=self.E0())
+        duration = dt.timedelta(seconds=round(scan_duration(self.exposures)))
+        label.setText(f"{len(self.energies)} points, ~{duration}")
+        label.setStyleSheet(self.stylesheet_normal)
+        self.ui.run_scan_button.setEnabled(True)
+
     def ui_filename(self):
         return "xafs_scan.ui"
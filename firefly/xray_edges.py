@@ -0,0 +1,151 @@
+"""A shared, pre-computed index of X-ray absorption edges.
+
+Querying the xraydb SQLite database is slow enough to notice when
+opening a window, so the edges are read once, cached to disk as a
+compact NumPy array, and shared by every window in the process.
+
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+log = logging.getLogger(__name__)
+
+
+edge_dtype = np.dtype([
+    ("element", "U2"),
+    ("edge", "U4"),
+    ("energy", "f8"),
+    ("fluorescence_yield", "f8"),
+    ("jump_ratio", "f8"),
+])
+
+default_cache_dir = Path("~/.cache/firefly").expanduser()
+
+
+class EdgeIndex:
+    """Absorption edges, in the order they appear in xraydb.
+
+    Edges can be looked up by position in constant time, by
+    (element, edge) name, or by energy using a binary search.
+
+    Parameters
+    ==========
+    edges
+      Structured array with dtype *edge_dtype*.
+
+    """
+    def __init__(self, edges: np.ndarray):
+        self.edges = edges
+        # Sorted view of the energies for binary searching
+        self._energy_order = np.argsort(edges["energy"], kind="stable")
+        self._sorted_energies = edges["energy"][self._energy_order]
+        self._names = None
+
+    def __len__(self):
+        return len(self.edges)
+
+    def __getitem__(self, idx: int):
+        return self.edges[idx]
+
+    def labels(self) -> list:
+        """Human-readable labels, e.g. "Ni K (8333 eV)"."""
+        return [f"{e['element']} {e['edge']} ({int(e['energy'])} eV)" for e in self.edges]
+
+    def filter(self, min_energy: float = -np.inf, max_energy: float = np.inf):
+        """A new index with only edges between *min_energy* and *max_energy*."""
+        energies = self.edges["energy"]
+        mask = (energies > min_energy) & (energies < max_energy)
+        return type(self)(self.edges[mask])
+
+    def find(self, element: str, edge: str):
+        """Look up an edge by name, or ``None`` if it doesn't exist."""
+        if self._names is None:
+            self._names = {(e["element"], e["edge"]): idx for idx, e in enumerate(self.edges)}
+        idx = self._names.get((element, edge))
+        return None if idx is None else self.edges[idx]
+
+    def nearest(self, energy: float):
+        """The edge with the energy closest to *energy*."""
+        if len(self) == 0:
+            return None
+        pos = np.searchsorted(self._sorted_energies, energy)
+        candidates = [p for p in (pos - 1, pos) if 0 <= p < len(self)]
+        best = min(candidates, key=lambda p: abs(self._sorted_energies[p] - energy))
+        return self.edges[self._energy_order[best]]
+
+    def between(self, min_energy: float, max_energy: float) -> np.ndarray:
+        """Edges with energies in [*min_energy*, *max_energy*], sorted by energy."""
+        lo = np.searchsorted(self._sorted_energies, min_energy, side="left")
+        hi = np.searchsorted(self._sorted_energies, max_energy, side="right")
+        return self.edges[self._energy_order[lo:hi]]
+
+
+def build_edges() -> np.ndarray:
+    """Read all the absorption edges from xraydb."""
+    from xraydb.xraydb import XrayDB
+    xraydb = XrayDB()
+    ltab = xraydb.tables['xray_levels']
+    rows = xraydb.query(ltab).all()
+    def to_float(value):
+        return np.nan if value is None else float(value)
+    return np.array([(r.element, r.iupac_symbol, to_float(r.absorption_edge),
+                      to_float(r.fluorescence_yield), to_float(r.jump_ratio))
+                     for r in rows], dtype=edge_dtype)
+
+
+def xraydb_version() -> str:
+    import xraydb
+    return getattr(xraydb, "__version__", "unknown")
+
+
+_edge_index = None
+_edge_index_lock = threading.Lock()
+
+
+def load_edge_index(cache_dir: Optional[Path] = None) -> EdgeIndex:
+    """Get the process-wide index of absorption edges.
+
+    The first call reads the edges from the on-disk cache, building
+    the cache from xraydb if needed. The cache is keyed by the
+    version of xraydb. Later calls return the same index.
+
+    Parameters
+    ==========
+    cache_dir
+      Where to store the cached edges. Defaults to
+      *default_cache_dir*.
+
+    """
+    global _edge_index
+    with _edge_index_lock:
+        if _edge_index is None:
+            cache_dir = default_cache_dir if cache_dir is None else cache_dir
+            _edge_index = EdgeIndex(_load_edges(cache_dir))
+        return _edge_index
+
+
+def _load_edges(cache_dir: Optional[Path]) -> np.ndarray:
+    if cache_dir is None:
+        return build_edges()
+    cache_file = Path(cache_dir) / f"xray_edges-{xraydb_version()}.npy"
+    try:
+        edges = np.load(cache_file, allow_pickle=False)
+    except (OSError, ValueError):
+        pass
+    else:
+        if edges.dtype == edge_dtype:
+            return edges
+    # Cache is missing or invalid, so rebuild it
+    log.info(f"Building X-ray edge cache: {cache_file}")
+    edges = build_edges()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        np.save(cache_file, edges, allow_pickle=False)
+    except OSError as e:
+        log.warning(f"Could not save X-ray edge cache: {e}")
+    return edges
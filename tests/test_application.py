@@ -1,5 +1,6 @@
 import time
 import pytest
+from unittest import mock
 from unittest.mock import MagicMock
 import asyncio
 
@@ -11,6 +12,7 @@ from bluesky_queueserver_api.zmq import REManagerAPI
 from firefly.queue_client import QueueClient
 from firefly.application import REManagerAPI
 from firefly.main_window import FireflyMainWindow
+from firefly.instrument_loader import InstrumentLoader
 
 
 def test_setup(ffapp):
@@ -29,3 +31,41 @@ def test_setup2(ffapp):
     FireflyMainWindow()
     ffapp.prepare_queue_client(api=api)
     # qapp._queue_thread.quit()
+
+
+def test_instrument_loader_stages(qtbot, sim_registry):
+    """Check that the instrument gets loaded in stages."""
+    loader = InstrumentLoader()
+    stages = []
+    loader.stage_finished.connect(lambda stage, duration: stages.append(stage))
+    with mock.patch("firefly.instrument_loader.haven.load_instrument") as load_instrument:
+        with qtbot.waitSignal(loader.finished, timeout=1000):
+            loader.load()
+    load_instrument.assert_called_once()
+    assert stages == ["registry", "connections"]
+
+
+def test_hide_window_on_close(ffapp, qtbot):
+    """Check that some windows are hidden, not destroyed, when closed."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    ffapp.max_hidden_windows = 1
+    # Open a window that should be kept around
+    window = ffapp.show_window(FireflyMainWindow, "log_viewer.ui", name="logs_1", hide_on_close=True)
+    window.close()
+    assert not window.isVisible()
+    assert "logs_1" in ffapp.windows.keys()
+    assert "logs_1" in ffapp.hidden_windows.keys()
+    # Re-opening the window should use the same window
+    assert ffapp.show_window(FireflyMainWindow, "log_viewer.ui", name="logs_1") is window
+    assert "logs_1" not in ffapp.hidden_windows.keys()
+    # Hiding too many windows destroys the oldest one
+    window.close()
+    window2 = ffapp.show_window(FireflyMainWindow, "log_viewer.ui", name="logs_2", hide_on_close=True)
+    window2.close()
+    qtbot.waitUntil(lambda: "logs_1" not in ffapp.windows.keys(), timeout=1000)
+    assert list(ffapp.hidden_windows.keys()) == ["logs_2"]
+    # Clean up
+    del ffapp.max_hidden_windows
+    window2.hide_on_close = False
+    window2.close()
@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+
+from firefly.auto_range import AutoRanger, AutoRangeController
+
+
+def test_bands_too_close():
+    with pytest.raises(ValueError):
+        AutoRanger(lower=1.0, upper=2.0)
+
+
+def test_step_after_settling():
+    ranger = AutoRanger(lower=0.5, upper=4.5, min_dwell=2, settle_samples=3)
+    ranger.counting = False
+    # Low voltages should increase the gain once they settle
+    assert [ranger.update(0.1, now=t) for t in [0, 0.1, 0.2]] == [0, 0, 1]
+    # High voltages decrease it, but only after the dwell time
+    assert [ranger.update(5.0, now=t) for t in [0.3, 0.4, 0.5]] == [0, 0, 0]
+    # The voltage has already settled, so step as soon as the dwell is over
+    assert [ranger.update(5.0, now=t) for t in [2.3, 2.4, 2.5]] == [-1, 0, 0]
+
+
+def test_in_range_resets():
+    ranger = AutoRanger(settle_samples=3, min_dwell=0)
+    ranger.counting = False
+    # An in-range reading in between means nothing changes
+    steps = [ranger.update(v, now=0) for v in [0.1, 0.1, 2.0, 0.1, 0.1]]
+    assert steps == [0, 0, 0, 0, 0]
+
+
+def test_no_ranging_while_counting():
+    ranger = AutoRanger(settle_samples=1, min_dwell=0)
+    # Unknown counting state is treated like counting
+    assert ranger.update(0.01, now=0) == 0
+    ranger.counting = True
+    assert ranger.update(0.01, now=1) == 0
+    ranger.counting = False
+    assert ranger.update(0.01, now=2) == 1
+
+
+def test_range_limits():
+    ranger = AutoRanger(settle_samples=1, min_dwell=0)
+    ranger.counting = False
+    ranger.level = 0  # Already at most gain
+    assert ranger.update(0.01, now=0) == 0
+    assert ranger.update(10, now=1) == -1
+
+
+def test_controller_steps_gain(qtbot):
+    device = mock.MagicMock()
+    controller = AutoRangeController(
+        device=device, voltage_address="ca://ic:calc.VAL", count_address="ca://scaler.CNT",
+        gain_address="ca://preamp:sens_num.VAL", unit_address="ca://preamp:sens_unit.VAL",
+        ranger=AutoRanger(settle_samples=1, min_dwell=0))
+    # Disabled controllers don't touch the gain
+    controller.update_counting(0)
+    controller.update_voltage(0.01)
+    assert not device.increase_gain.called
+    controller.set_enabled(True)
+    assert len(controller.channels()) == 4
+    controller.update_counting(0)
+    with qtbot.waitSignal(controller.gain_stepped) as blocker:
+        controller.update_voltage(0.01)
+    assert blocker.args == [1]
+    assert device.increase_gain.called
+    # Not while counting
+    controller.update_counting(1)
+    controller.update_voltage(10)
+    assert not device.decrease_gain.called
+    controller.set_enabled(False)
+    assert controller.channels() == []
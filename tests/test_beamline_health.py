@@ -0,0 +1,75 @@
+from firefly.beamline_health import BeamlineHealth, Severity, StatusSignal
+from firefly.status_tiles import StatusTileGrid
+
+
+def make_health():
+    signals = [
+        StatusSignal("ring_current", "ca://S:SRcurrentAI", "Stored Beam",
+                     kind="ring_current", role="beam", units="mA"),
+        StatusSignal("shutter_a", "ca://shutter_a", "Shutter A", kind="shutter", role="beam"),
+        StatusSignal("shutter_cd", "ca://shutter_cd", "Shutter C/D", kind="shutter", role="hutch"),
+        StatusSignal("vacuum_ion_pump", "ca://ion_pump", "ion_pump", kind="vacuum", threshold=1e-6),
+        StatusSignal("heartbeat_vme", "ca://vme:HEARTBEAT", "vme", kind="heartbeat"),
+    ]
+    return BeamlineHealth(signals)
+
+
+def set_value(health, key, value):
+    health.update_connection(key, True)
+    health.update_value(key, value)
+
+
+def test_beam_available():
+    health = make_health()
+    set_value(health, "ring_current", 102.3)
+    set_value(health, "shutter_a", 0)
+    states = health.evaluate()
+    assert states["ring_current"].text == "102.3 mA"
+    assert states["beam_available"].text == "No"
+    set_value(health, "shutter_a", 1)
+    assert health.evaluate()["beam_available"].severity == Severity.OK
+    # No stored beam
+    set_value(health, "ring_current", 0.1)
+    assert health.evaluate()["beam_available"].text == "No"
+
+
+def test_hutch_searchable():
+    health = make_health()
+    assert health.evaluate()["hutch_searchable"].severity == Severity.DISCONNECTED
+    set_value(health, "shutter_cd", 1)
+    assert health.evaluate()["hutch_searchable"].text == "No"
+    set_value(health, "shutter_cd", 0)
+    assert health.evaluate()["hutch_searchable"].text == "Yes"
+
+
+def test_vacuum_and_iocs():
+    health = make_health()
+    set_value(health, "vacuum_ion_pump", 1e-5)
+    set_value(health, "heartbeat_vme", 1)
+    now = health._heartbeat_times["heartbeat_vme"]
+    states = health.evaluate(now=now + 1)
+    assert states["vacuum_ion_pump"].severity == Severity.ALARM
+    assert states["iocs_down"].text == "None"
+    # The heartbeat stops changing
+    states = health.evaluate(now=now + health.heartbeat_timeout + 1)
+    assert states["heartbeat_vme"].text == "Down"
+    assert states["iocs_down"].text == "vme"
+    assert states["iocs_down"].severity == Severity.ALARM
+
+
+def test_refresh_emits_changes(qtbot):
+    health = make_health()
+    grid = StatusTileGrid()
+    qtbot.addWidget(grid)
+    health.states_changed.connect(grid.update_tiles)
+    with qtbot.waitSignal(health.states_changed):
+        health.refresh()
+    assert len(grid.tiles) == len(health.states)
+    # Only changed states get emitted
+    set_value(health, "shutter_cd", 0)
+    with qtbot.waitSignal(health.states_changed) as blocker:
+        health.refresh()
+    assert set(blocker.args[0].keys()) == {"shutter_cd", "hutch_searchable"}
+    assert "Yes" in grid.tiles["hutch_searchable"].text()
+    with qtbot.assertNotEmitted(health.states_changed):
+        health.refresh()
@@ -0,0 +1,34 @@
+from firefly.benchmark import BenchmarkRecorder, compare, load_history, main
+
+
+def test_recorder_history(tmp_path):
+    history_file = tmp_path / "history.json"
+    for duration in [1.0, 1.1]:
+        recorder = BenchmarkRecorder()
+        recorder.record("show_window.status.cold", duration)
+        recorder.save(history_file)
+    history = load_history(history_file)
+    assert len(history) == 2
+    assert history[1]["results"] == {"show_window.status.cold": 1.1}
+
+
+def test_compare():
+    history = [
+        {"results": {"load_instrument": 2.0, "show_window.energy.cold": 1.0}},
+        {"results": {"load_instrument": 2.2, "show_window.energy.cold": 1.0}},
+        {"results": {"load_instrument": 2.1, "show_window.energy.cold": 1.5}},
+    ]
+    regressions = compare(history, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].name == "show_window.energy.cold"
+    assert regressions[0].ratio == 1.5
+
+
+def test_compare_command(tmp_path):
+    history_file = tmp_path / "history.json"
+    for duration in [1.0, 3.0]:
+        recorder = BenchmarkRecorder()
+        recorder.record("load_instrument", duration)
+        recorder.save(history_file)
+    assert main(["compare", str(history_file)]) == 1
+    assert main(["compare", str(history_file), "--threshold", "5"]) == 0
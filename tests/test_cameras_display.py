@@ -70,3 +70,30 @@ def test_set_status_byte(qtbot):
     display.update_camera_state(DetectorStates.ACQUIRE)
     assert bit._brush.color().getRgb() == (255, 255, 0, 255)
     assert not label.isVisible(), "State label should be hidden by default"
+
+
+def test_lazy_camera_displays(qtbot, sim_registry):
+    """Test that only cameras scrolled into view get loaded."""
+    FireflyMainWindow()
+    for idx in range(20):
+        camera = haven.Camera(prefix=f"camera_ioc{idx}:", name=f"Camera {idx:02d}", labels={"cameras"})
+        sim_registry.register(camera)
+    display = CamerasDisplay()
+    display.max_loaded_displays = 2
+    qtbot.addWidget(display)
+    # Nothing gets loaded until the window is shown
+    assert display.loaded_cameras == []
+    display.resize(400, 200)
+    display.show()
+    qtbot.waitExposed(display)
+    qtbot.waitUntil(lambda: 0 in display.loaded_cameras, timeout=1000)
+    num_visible = len(display.visible_cameras())
+    assert num_visible < len(display._camera_displays)
+    assert len(display.loaded_cameras) <= num_visible + 2
+    # Scroll to the bottom and check the first cameras get unloaded
+    scroll_bar = display.scroll_area.verticalScrollBar()
+    scroll_bar.setValue(scroll_bar.maximum())
+    last_idx = len(display._camera_displays) - 1
+    qtbot.waitUntil(lambda: last_idx in display.loaded_cameras, timeout=1000)
+    assert 0 not in display.loaded_cameras
+    assert len(display.loaded_cameras) <= len(display.visible_cameras()) + 2
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from firefly.channels import ChannelRegistry, SharedChannel
+
+
+def test_shared_subscription(qtbot):
+    """Test that two listeners on one address share a subscription."""
+    registry = ChannelRegistry()
+    slot_a, slot_b = mock.MagicMock(), mock.MagicMock()
+    ch_a = SharedChannel("fake_ioc:m1.RBV", value_slot=slot_a)
+    ch_b = SharedChannel("fake_ioc:m1.RBV", value_slot=slot_b)
+    ch_a.registry = ch_b.registry = registry
+    ch_a.connect()
+    ch_b.connect()
+    ch_b.connect()  # Connecting twice should not add a second listener
+    stats = registry.stats()
+    assert stats.num_pvs == 1
+    assert stats.num_listeners == 2
+    # Check that a new value gets sent to both listeners
+    source = registry._sources["fake_ioc:m1.RBV"]
+    source.fan_out("value_slot", 3.5)
+    slot_a.assert_called_once_with(3.5)
+    slot_b.assert_called_once_with(3.5)
+    assert registry.stats().pv_rates["fake_ioc:m1.RBV"] > 0
+
+
+def test_late_listener(qtbot):
+    """Test that a new listener gets the latest value right away."""
+    registry = ChannelRegistry()
+    ch_a = SharedChannel("fake_ioc:m1.RBV", value_slot=mock.MagicMock())
+    ch_a.registry = registry
+    ch_a.connect()
+    registry._sources["fake_ioc:m1.RBV"].fan_out("value_slot", 7)
+    slot = mock.MagicMock()
+    ch_b = SharedChannel("fake_ioc:m1.RBV", value_slot=slot)
+    ch_b.registry = registry
+    ch_b.connect()
+    slot.assert_called_once_with(7)
+
+
+def test_close_last_listener(qtbot):
+    """Test that the subscription closes when the last listener leaves."""
+    registry = ChannelRegistry()
+    ch_a = SharedChannel("fake_ioc:m1.RBV", value_slot=mock.MagicMock())
+    ch_b = SharedChannel("fake_ioc:m1.RBV", value_slot=mock.MagicMock())
+    ch_a.registry = ch_b.registry = registry
+    ch_a.connect()
+    ch_b.connect()
+    source = registry._sources["fake_ioc:m1.RBV"]
+    source.channel = mock.MagicMock()
+    ch_a.disconnect()
+    assert not source.channel.disconnect.called
+    assert registry.listeners("fake_ioc:m1.RBV") == [ch_b]
+    ch_b.disconnect()
+    assert source.channel.disconnect.called
+    assert registry.stats().num_pvs == 0
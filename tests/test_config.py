@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from firefly.config import ConfigService, config_files, freeze
+
+
+def test_frozen_config():
+    config = freeze({"beamline": {"name": "SPC Beamline"}, "motors": [1, 2]})
+    assert config["beamline"]["name"] == "SPC Beamline"
+    with pytest.raises(TypeError):
+        config["beamline"]["name"] = "Other beamline"
+    assert config["motors"] == (1, 2)
+
+
+def test_reload_on_file_change(qtbot, tmp_path):
+    config_file = tmp_path / "iconfig.toml"
+    config_file.write_text("[beamline]\nname = 'SPC Beamline'\n")
+    names = iter(["SPC Beamline", "Other Beamline"])
+    service = ConfigService(files=[config_file],
+                            loader=lambda: {"beamline": {"name": next(names)}})
+    assert service.config["beamline"]["name"] == "SPC Beamline"
+    # Changing the file should reload the configuration
+    with qtbot.waitSignal(service.config_changed, timeout=3000) as blocker:
+        config_file.write_text("[beamline]\nname = 'Other Beamline'\n")
+    assert blocker.args[0]["beamline"]["name"] == "Other Beamline"
+    assert service.config["beamline"]["name"] == "Other Beamline"
+
+
+def test_no_signal_if_unchanged(qtbot, tmp_path):
+    service = ConfigService(files=[], loader=lambda: {"beamline": {"name": "SPC"}})
+    with qtbot.assertNotEmitted(service.config_changed):
+        service.reload()
+
+
+def test_config_files(monkeypatch, tmp_path):
+    monkeypatch.delenv("FIREFLY_CONFIG_FILES", raising=False)
+    assert config_files() == []
+    files = [tmp_path / "iconfig.toml", tmp_path / "local.toml"]
+    monkeypatch.setenv("FIREFLY_CONFIG_FILES", os.pathsep.join(str(fp) for fp in files))
+    assert config_files() == files
+
+
+def test_ignore_other_files(qtbot, tmp_path):
+    config_file = tmp_path / "iconfig.toml"
+    config_file.write_text("[beamline]\nname = 'SPC Beamline'\n")
+    calls = []
+    def loader():
+        calls.append(1)
+        return {"beamline": {"name": "SPC Beamline"}}
+    service = ConfigService(files=[config_file], loader=loader)
+    # Changes to other files in the same directory shouldn't reload
+    (tmp_path / "notes.txt").write_text("spam")
+    qtbot.wait(service.reload_delay + 500)
+    assert len(calls) == 1
@@ -0,0 +1,18 @@
+import os
+
+from firefly.display import compile_ui_file
+from firefly.application import ui_dir
+
+
+def test_compile_ui_file_cache(tmp_path):
+    """Check that compiled .ui files are reused until they change."""
+    ui_file = tmp_path / "voltmeter.ui"
+    ui_file.write_text((ui_dir / "voltmeter.ui").read_text())
+    code, class_name = compile_ui_file(ui_file)
+    assert "setupUi" in code
+    # Compiling again should give back the same (cached) code
+    assert compile_ui_file(ui_file)[0] is code
+    # Modifying the file should cause it to be recompiled
+    mtime = ui_file.stat().st_mtime_ns
+    os.utime(ui_file, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+    assert compile_ui_file(ui_file)[0] is not code
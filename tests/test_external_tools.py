@@ -0,0 +1,89 @@
+import sys
+
+import pytest
+
+from firefly.external_tools import ToolLauncher, process_key
+
+
+@pytest.fixture()
+def fake_tool(tmp_path):
+    """An executable that stands in for caQtDM, ImageJ, etc."""
+    script = tmp_path / "fake_tool"
+    script.write_text(f"#!{sys.executable}\n"
+                      "import sys, time\n"
+                      "time.sleep(float(sys.argv[1]) if len(sys.argv) > 1 else 30)\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.fixture()
+def launcher(qtbot):
+    launcher = ToolLauncher(reap_interval=50)
+    yield launcher
+    launcher.terminate_all()
+
+
+def test_process_key():
+    assert process_key("caqtdm", {"P": "25idc:", "M": "m1"}) == process_key("caqtdm", {"M": "m1", "P": "25idc:"})
+    assert process_key("caqtdm", {"P": "25idc:"}) != process_key("imagej", {"P": "25idc:"})
+
+
+def test_dedupe_running_tool(launcher, fake_tool):
+    proc = launcher.launch("caqtdm", [fake_tool], macros={"P": "25idc:"})
+    assert proc.running
+    # Launching again should re-use the running process
+    again = launcher.launch("caqtdm", [fake_tool], macros={"P": "25idc:"})
+    assert again is proc
+    # Different macros get their own process
+    other = launcher.launch("caqtdm", [fake_tool], macros={"P": "25idd:"})
+    assert other.pid != proc.pid
+    assert len(launcher.processes()) == 2
+    stats = launcher.stats("caqtdm")
+    assert stats.launches == 2
+    assert stats.reuses == 1
+    assert stats.last_latency > 0
+
+
+def test_reap_finished_tool(launcher, fake_tool, qtbot):
+    with qtbot.waitSignal(launcher.process_finished, timeout=5000) as blocker:
+        proc = launcher.launch("caqtdm", [fake_tool, "0"])
+    assert blocker.args == ["caqtdm", 0]
+    assert launcher.processes() == []
+    assert proc.popen.returncode == 0
+    # A new process gets started once the old one is gone
+    new_proc = launcher.launch("caqtdm", [fake_tool])
+    assert new_proc is not proc
+
+
+def test_missing_tool(launcher, tmp_path, qtbot):
+    with qtbot.waitSignal(launcher.launch_failed):
+        proc = launcher.launch("imagej", [str(tmp_path / "not_a_program")])
+    assert proc is None
+    assert launcher.stats("imagej").failures == 1
+
+
+def test_warm_tool(launcher, fake_tool):
+    warm = launcher.prewarm("imagej", [fake_tool])
+    assert warm.warm
+    # Launches get handed to the warm instance
+    proc = launcher.launch("imagej", [fake_tool, "0"], macros={"PREFIX": "25idgigeB:"})
+    assert proc is warm
+    assert launcher.find("imagej", macros={"PREFIX": "25idgigeB:"}) is warm
+    assert launcher.processes() == [warm]
+    # The warm instance now shows a different camera
+    other = launcher.launch("imagej", [fake_tool, "0"], macros={"PREFIX": "25idgigeA:"})
+    assert other is warm
+    assert launcher.find("imagej", macros={"PREFIX": "25idgigeA:"}) is warm
+    assert launcher.find("imagej", macros={"PREFIX": "25idgigeB:"}) is None
+
+
+def test_dead_warm_tool(launcher, fake_tool):
+    warm = launcher.prewarm("imagej", [fake_tool, "0"])
+    warm.popen.wait(timeout=5)
+    # The warm instance has exited, so a regular process is started
+    proc = launcher.launch("imagej", [fake_tool], macros={"PREFIX": "25idgigeB:"})
+    assert proc is not warm
+    assert not proc.warm
+    assert proc.running
+    assert launcher.find("imagej", macros={"PREFIX": "25idgigeB:"}) is proc
+    assert launcher.processes() == [proc]
@@ -0,0 +1,70 @@
+import numpy as np
+
+from firefly.image_processing import (frame_from_array, downsample, to_uint8,
+                                      make_thumbnail, FrameDecoder, FrameStore)
+
+
+def test_frame_from_array():
+    data = np.arange(24, dtype=np.uint16)
+    # Monochrome, 6 wide by 4 tall
+    frame = frame_from_array(data, dimensions=2, sizes=[6, 4, 0])
+    assert frame.shape == (4, 6)
+    assert frame[1, 0] == 6
+    assert np.shares_memory(frame, data)
+    # RGB1, 4 wide by 2 tall
+    frame = frame_from_array(data, dimensions=3, sizes=[3, 4, 2])
+    assert frame.shape == (2, 4, 3)
+    assert list(frame[0, 1]) == [3, 4, 5]
+
+
+def test_downsample():
+    frame = np.zeros((1024, 2000))
+    thumb = downsample(frame, max_size=256)
+    assert max(thumb.shape) <= 256
+    assert np.shares_memory(thumb, frame)
+    # Small frames are left alone
+    assert downsample(frame[:10, :10]).shape == (10, 10)
+
+
+def test_to_uint8():
+    frame = np.array([[100, 200], [300, 500]], dtype=np.uint16)
+    scaled = to_uint8(frame)
+    assert scaled.dtype == np.uint8
+    assert scaled.min() == 0
+    assert scaled.max() == 255
+    # Flat frames shouldn't divide by zero
+    assert to_uint8(np.full((2, 2), 7.)).max() == 0
+
+
+def test_make_thumbnail():
+    data = np.random.randint(0, 4096, size=1024 * 1280, dtype=np.uint16)
+    thumb = make_thumbnail(data, dimensions=2, sizes=[1280, 1024, 0], max_size=256)
+    assert thumb.shape == (205, 256)
+    assert thumb.dtype == np.uint8
+
+
+def test_frame_decoder_drops_frames(qtbot):
+    decoder = FrameDecoder()
+    decoder.max_fps = 1000
+    data = np.zeros(100 * 100, dtype=np.uint16)
+    with qtbot.waitSignal(decoder.frame_ready, timeout=1000) as blocker:
+        # Only the first and last frames should get decoded
+        for i in range(5):
+            decoder.submit(data, dimensions=2, sizes=[100, 100, 0])
+    assert blocker.args[0].shape == (100, 100)
+    assert decoder.dropped == 3
+    qtbot.waitUntil(lambda: decoder.decoded == 2, timeout=1000)
+
+
+def test_frame_store():
+    store = FrameStore()
+    assert store.read() is None
+    first = store.write(np.ones((4, 4)))
+    assert store.read() is first
+    second = store.write(np.full((4, 4), 2.))
+    assert store.read() is second
+    assert second is not first
+    # The buffers get re-used once both have been allocated
+    third = store.write(np.full((4, 4), 3.))
+    assert third is first
+    assert store.frame_number == 3
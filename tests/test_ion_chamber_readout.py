@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+import pytest
+
+from firefly.ion_chamber_readout import IonChamberReadout
+
+
+def test_currents():
+    readout = IonChamberReadout(["I0", "It", "Iref"])
+    readout.set_voltage(0, 2.23)
+    readout.set_gain(0, 3)  # 10
+    readout.set_unit(0, 2)  # µA/V
+    readout.set_voltage(1, 1.0)
+    readout.set_gain(1, 0)  # 1
+    readout.set_unit(1, 1)  # nA/V
+    # Iref never gets a gain, so has no current
+    readout.set_voltage(2, 4.0)
+    changed = readout.update()
+    np.testing.assert_equal(changed, [0, 1])
+    assert readout.currents[0] == pytest.approx(0.223)
+    assert readout.unit(0) == "µA"
+    np.testing.assert_allclose(readout.amps[:2], [0.223e-6, 1e-9])
+    assert math.isnan(readout.amps[2])
+    # Nothing changed, so nothing to update
+    assert len(readout.update()) == 0
+
+
+def test_ratios():
+    readout = IonChamberReadout(["I0", "It"])
+    readout.add_ratio("I0/It", "I0", "It")
+    readout.add_ratio("ln(I0/It)", "I0", "It", log=True)
+    for idx, voltage in enumerate([4.0, 1.0]):
+        readout.set_voltage(idx, voltage)
+        readout.set_gain(idx, 0)
+        readout.set_unit(idx, 0)
+    readout.update()
+    ratios = readout.ratios()
+    assert ratios["I0/It"] == pytest.approx(4)
+    assert ratios["ln(I0/It)"] == pytest.approx(math.log(4))
@@ -0,0 +1,78 @@
+import logging
+
+from firefly.log_model import LogFilterProxy, LogModel, RecordRing
+from firefly.log_viewer import LogViewerDisplay
+
+
+def test_record_ring():
+    ring = RecordRing(capacity=3)
+    assert ring.extend([1, 2]) == 0
+    assert ring.extend([3, 4, 5]) == 2
+    assert [ring[i] for i in range(len(ring))] == [3, 4, 5]
+    ring.drop_oldest(1)
+    assert [ring[i] for i in range(len(ring))] == [4, 5]
+
+
+def make_logger(model):
+    logger = logging.getLogger("firefly.tests.log_viewer")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(model.handler)
+    return logger
+
+
+def test_batched_records(qtbot):
+    model = LogModel(capacity=1000, max_batch=400)
+    logger = make_logger(model)
+    try:
+        # A burst of messages is only queued by the handler
+        for idx in range(10000):
+            logger.debug("Message %d", idx)
+        assert model.rowCount() == 0
+        # Batches move into the model without going over capacity
+        assert model.flush() == 400
+        qtbot.waitUntil(lambda: len(model.handler.pending) == 0, timeout=5000)
+        assert model.rowCount() == 1000
+        assert model.entry(999).message == "Message 9999"
+        assert model.entry(0).message == "Message 9000"
+    finally:
+        logger.removeHandler(model.handler)
+
+
+def test_filter_proxy():
+    model = LogModel(capacity=100)
+    logger = make_logger(model)
+    try:
+        logger.debug("Polling queue status")
+        logger.warning("Queue server not responding")
+        logging.getLogger("firefly.tests.other").addHandler(model.handler)
+        logging.getLogger("firefly.tests.other").warning("Motor disconnected")
+        model.flush()
+    finally:
+        logger.removeHandler(model.handler)
+        logging.getLogger("firefly.tests.other").removeHandler(model.handler)
+    proxy = LogFilterProxy()
+    proxy.setSourceModel(model)
+    assert proxy.rowCount() == 3
+    proxy.set_min_level(logging.WARNING)
+    assert proxy.rowCount() == 2
+    proxy.set_logger_prefix("firefly.tests.log_viewer")
+    assert proxy.rowCount() == 1
+    proxy.set_logger_prefix("")
+    proxy.set_pattern("motor|pump")
+    assert proxy.rowCount() == 1
+    assert proxy.data(proxy.index(0, 4)) == "Motor disconnected"
+
+
+def test_log_viewer_display(qtbot):
+    display = LogViewerDisplay()
+    qtbot.addWidget(display)
+    logging.getLogger("firefly.tests").warning("Shown in the log viewer")
+    display.log_model.flush()
+    texts = [display.proxy.data(display.proxy.index(row, 4))
+             for row in range(display.proxy.rowCount())]
+    assert "Shown in the log viewer" in texts
+    # Invalid regular expressions don't break the filter
+    display.ui.filter_line_edit.setText("[unclosed")
+    display.update_text_filters()
+    assert "Invalid" in display.ui.filter_line_edit.toolTip()
@@ -50,3 +50,16 @@ def test_add_menu_action(qapp):
 def test_customize_ui(qapp):
     window = FireflyMainWindow()
     assert hasattr(window.ui, "menuScans")
+
+
+def test_shared_menus(ffapp):
+    """Check that windows share the application's menus."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    window1 = FireflyMainWindow()
+    window2 = PlanMainWindow()
+    assert window1.ui.menuScans is window2.ui.menuScans
+    assert window1.ui.menuScans is ffapp.menuScans
+    assert window1.actionShow_Xafs_Scan is ffapp.show_xafs_scan_window_action
+    # Opening windows shouldn't add more items to the shared menus
+    assert len(ffapp.menuScans.actions()) == 1
@@ -0,0 +1,59 @@
+import time
+from types import SimpleNamespace
+
+from firefly.motor_index import MotorIndex, fuzzy_score, parse_prefix
+
+
+def make_motor(name, prefix, labels={"motors"}):
+    return SimpleNamespace(name=name, prefix=prefix, _ophyd_labels_=labels)
+
+
+def test_parse_prefix():
+    assert parse_prefix("25idcVME:m1") == ("25idc", "25idcVME")
+    assert parse_prefix("vme_crate_ioc:m1") == ("Other", "vme_crate_ioc")
+    assert parse_prefix("") == ("Other", "Other")
+
+
+def test_groups():
+    index = MotorIndex([
+        make_motor("sample_x", "25idcVME:m1"),
+        make_motor("slit_top", "25idaVME:m3"),
+        make_motor("sample_y", "25idcVME:m2"),
+        make_motor("table_z", "25idcSoft:m1"),
+    ])
+    groups = index.groups()
+    assert list(groups.keys()) == ["25ida", "25idc"]
+    assert list(groups["25idc"].keys()) == ["25idcSoft", "25idcVME"]
+    assert [e.name for e in groups["25idc"]["25idcVME"]] == ["sample_x", "sample_y"]
+
+
+def test_fuzzy_score():
+    assert fuzzy_score("smx", "sample_x") is not None
+    assert fuzzy_score("xms", "sample_x") is None
+    # Consecutive characters beat scattered ones
+    assert fuzzy_score("sam", "sample_x") > fuzzy_score("sam", "slit_arm_m")
+
+
+def test_search():
+    index = MotorIndex([
+        make_motor("sample_x", "25idcVME:m1"),
+        make_motor("sample_y", "25idcVME:m2"),
+        make_motor("slit_top", "25idaVME:m3", labels={"motors", "slits"}),
+    ])
+    assert [e.name for e in index.search("samy")] == ["sample_y"]
+    # Labels and PV prefixes are searchable too
+    assert [e.name for e in index.search("slits")] == ["slit_top"]
+    assert [e.name for e in index.search("25idaVME:m3")] == ["slit_top"]
+    # Empty searches give everything
+    assert len(index.search("", limit=None)) == 3
+
+
+def test_search_many_motors():
+    motors = [make_motor(f"motor_{i:04d}", f"25id{'abcd'[i % 4]}VME{i // 100}:m{i % 100}")
+              for i in range(2000)]
+    t0 = time.perf_counter()
+    index = MotorIndex(motors)
+    index.groups()
+    results = index.search("mtr1999")
+    assert time.perf_counter() - t0 < 1
+    assert results[0].name == "motor_1999"
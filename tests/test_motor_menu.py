@@ -41,3 +41,52 @@ def test_open_motor_window(haven_motors, ffapp):
     motor_1_name = "FireflyMainWindow_motor_SLT_H_Inb"
     assert motor_1_name in ffapp.windows.keys()
     # assert app.windows[motor_1_name].macros["PREFIX"] == ":m1"
+
+
+def test_motor_menu_update(haven_motors, ffapp):
+    """Check that the shared motor menu is updated, not rebuilt."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    menu_actions = ffapp.menuMotors.actions()
+    ioc_menu = menu_actions[-1].menu()
+    ioc_menu.aboutToShow.emit()
+    old_actions = list(ffapp.motor_actions)
+    assert ioc_menu.actions() == old_actions
+    # Remove a motor from the registry
+    removed = haven_motors.find(name=old_actions[0].text())
+    haven_motors.components.remove(removed)
+    ffapp.prepare_motor_windows()
+    # Existing actions are re-used for the motors that are left
+    assert len(ffapp.motor_actions) == 2
+    assert all(new is old for new, old in zip(ffapp.motor_actions, old_actions[1:]))
+    # Only the removed motor's action is taken out of the menus
+    assert ffapp.menuMotors.actions() == menu_actions
+    assert ioc_menu.actions() == ffapp.motor_actions
+
+
+def test_lazy_motor_submenus(haven_motors, ffapp):
+    """Check that motor sub-menus are only filled in when shown."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    menu = ffapp.menuMotors
+    assert ffapp.find_motor_action in menu.actions()
+    # All the test motors are on the same IOC
+    ioc_menus = [action.menu() for action in menu.actions() if action.menu() is not None]
+    assert [m.title() for m in ioc_menus] == ["vme_crate_ioc"]
+    ioc_menu = ioc_menus[0]
+    assert ioc_menu.isEmpty()
+    ioc_menu.aboutToShow.emit()
+    assert [a.text() for a in ioc_menu.actions()] == [a.text() for a in ffapp.motor_actions]
+
+
+def test_motor_palette(haven_motors, ffapp, qtbot):
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    ffapp.show_motor_palette()
+    palette = ffapp._motor_palette
+    qtbot.keyClicks(palette.search_line_edit, "inb")
+    assert palette.results_list.count() >= 1
+    assert palette.selected_entry().name == "SLT_H_Inb"
+    with qtbot.waitSignal(palette.motor_selected) as blocker:
+        palette.accept()
+    assert blocker.args[0].name == "SLT_H_Inb"
@@ -0,0 +1,61 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QLabel
+
+from firefly.profiling import EventLoopMonitor, RepaintProbe, ResourceSampler
+
+
+def test_event_loop_lag(qtbot):
+    monitor = EventLoopMonitor(interval=10)
+    monitor.start()
+    qtbot.wait(50)
+    # Block the event loop so the monitor's timer fires late
+    QTimer.singleShot(0, lambda: time.sleep(0.2))
+    qtbot.wait(100)
+    monitor.stop()
+    assert len(monitor.lags) > 2
+    assert monitor.max_lag >= 0.15
+    assert monitor.percentile(50) < monitor.max_lag
+
+
+def test_resource_sampler():
+    sampler = ResourceSampler()
+    sampler.start()
+    sum(i * i for i in range(100000))
+    usage = sampler.stop()
+    # CPU time is only updated every clock tick, so it may not have changed
+    assert usage["cpu"] >= 0
+    assert usage["rss"] > 0
+
+
+def test_resource_sampler_usage():
+    process = mock.MagicMock()
+    process.cpu_times.side_effect = [
+        SimpleNamespace(user=1.0, system=0.5),
+        SimpleNamespace(user=1.75, system=0.75),
+    ]
+    process.memory_info.return_value = SimpleNamespace(rss=200e6)
+    sampler = ResourceSampler(process=process)
+    with mock.patch("firefly.profiling.time.perf_counter", side_effect=[10.0, 12.0]):
+        sampler.start()
+        usage = sampler.stop()
+    # 1 s of CPU time over 2 s
+    assert usage["cpu"] == pytest.approx(0.5)
+    assert usage["rss"] == 200e6
+
+
+def test_repaint_probe(qtbot):
+    label = QLabel("0 V")
+    qtbot.addWidget(label)
+    label.show()
+    qtbot.waitExposed(label)
+    probe = RepaintProbe(label, predicate=lambda lbl: lbl.text() == "5 V")
+    t0 = probe.arm()
+    label.setText("5 V")
+    qtbot.waitUntil(probe.fired)
+    assert probe.paint_time > t0
@@ -1,11 +1,12 @@
 import time
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, AsyncMock
 import asyncio
 
 from bluesky import RunEngine, plans as bp
 from qtpy.QtCore import QThread
 from qtpy.QtTest import QSignalSpy
+from bluesky_queueserver_api import BPlan
 from bluesky_queueserver_api.zmq import REManagerAPI
 
 from firefly.queue_client import QueueClient
@@ -94,3 +95,123 @@ def test_check_queue_length(ffapp, qtbot):
     with qtbot.waitSignal(ffapp.queue_length_changed, timeout=1000,
                           check_params_cb=lambda l: l == 2):
         ffapp._queue_client.check_queue_length()
+
+
+def test_check_status(ffapp, qtbot):
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    FireflyMainWindow()
+    api = MagicMock()
+    ffapp.prepare_queue_client(api=api)
+    # Stop polling so we can check the status by hand
+    ffapp._queue_thread.timer.stop()
+    client = ffapp._queue_client
+    api.status.return_value = {
+        'items_in_queue': 2,
+        'plan_queue_uid': 'f682e6fa-983c-4bd8-b643-b3baec2ec764',
+    }
+    api.queue_get.return_value = {
+        'success': True,
+        'msg': '',
+        'items': ["hello", "world"],
+        'running_item': {},
+        'plan_queue_uid': 'f682e6fa-983c-4bd8-b643-b3baec2ec764'
+    }
+    # Check that the queue length is changed
+    with qtbot.waitSignal(ffapp.queue_length_changed, timeout=1000,
+                          check_params_cb=lambda l: l == 2):
+        client.check_status().result(timeout=1)
+    # The full queue is only fetched when the queue UID changes
+    api.queue_get.reset_mock()
+    client.check_status().result(timeout=1)
+    assert not api.queue_get.called
+    api.status.return_value = {
+        'items_in_queue': 2,
+        'plan_queue_uid': '5b3c71b8-35d5-4c8e-9b1e-8e8b0a3f8c1a',
+    }
+    with qtbot.waitSignal(client.queue_changed, timeout=1000):
+        client.check_status().result(timeout=1)
+    api.queue_get.assert_called_once()
+
+
+def test_control_priority(ffapp, qtbot):
+    """Check that pausing doesn't wait behind slow queue edits."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    FireflyMainWindow()
+    api = MagicMock()
+    async def slow_item_add(item):
+        await asyncio.sleep(0.5)
+        return {"success": True, "qsize": 1}
+    api.item_add = AsyncMock(side_effect=slow_item_add)
+    ffapp.prepare_queue_client(api=api)
+    client = ffapp._queue_client
+    # Fill up all the request slots with slow queue edits
+    edits = [client.add_queue_item({}) for i in range(client.max_requests + 1)]
+    # Pause the run engine, which should not have to wait
+    client.request_pause(defer=False).result(timeout=0.25)
+    api.re_pause.assert_called_once_with(option="immediate")
+    assert not any(edit.done() for edit in edits)
+
+
+def test_run_plans_batch(ffapp, qtbot):
+    """Test if several plans can be queued at once."""
+    ffapp.setup_window_actions()
+    ffapp.setup_runengine_actions()
+    FireflyMainWindow()
+    api = MagicMock()
+    api.item_add_batch.return_value = {
+        "success": False,
+        "msg": "Failed to add all items: validation of 1 out of 2 submitted items failed",
+        "qsize": 0,
+        "items": [{}, {}],
+        "results": [{"success": True, "msg": ""},
+                    {"success": False, "msg": "Plan 'eggs' is not allowed"}],
+    }
+    ffapp.prepare_queue_client(api=api)
+    items = [BPlan("xafs_scan"), BPlan("eggs")]
+    # Send the plans
+    with qtbot.waitSignal(ffapp.queue_batch_added, timeout=1000) as blocker:
+        ffapp.add_queue_items(items)
+    api.item_add_batch.assert_called_once_with(items=items)
+    # Check the per-item results
+    result = blocker.args[0]
+    assert not result.success
+    assert result.successes == [True, False]
+    assert result.failures == [(items[1], "Plan 'eggs' is not allowed")]
+    assert result.queue_length == 0
+
+
+def test_stop_cancels_requests(qtbot):
+    """Check that stopping the client doesn't leave callers waiting."""
+    api = MagicMock()
+    client = QueueClient(api=api)
+    client.max_requests = 1
+
+    async def run_client():
+        client.loop = asyncio.get_running_loop()
+        await client.start()
+        running = client.submit(asyncio.sleep(10))
+        waiting = client.submit(asyncio.sleep(10))
+        await asyncio.sleep(0.05)
+        await client.stop()
+        return running, waiting
+
+    running, waiting = asyncio.run(run_client())
+    assert running.cancelled()
+    assert waiting.cancelled()
+    assert client._requests.empty()
+
+
+def test_update_backoff(qtbot):
+    """Check that any failure to update slows down the polling."""
+    client = QueueClient(api=MagicMock())
+    client._check_status = AsyncMock(side_effect=ConnectionRefusedError("no server"))
+    asyncio.run(client._update())
+    assert client.timeout == 1
+    asyncio.run(client._update())
+    assert client.timeout == 2
+    # A successful update goes back to regular polling
+    client._check_status = AsyncMock()
+    asyncio.run(client._update())
+    assert client.timeout == client.poll_period
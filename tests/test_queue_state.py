@@ -0,0 +1,51 @@
+from firefly.queue_state import QueueState
+
+
+def make_items(*uids):
+    return [{"item_uid": uid, "name": "xafs_scan"} for uid in uids]
+
+
+def replay(items, state):
+    """Apply the signals from *state* to a copy of *items*."""
+    items = list(items)
+    state.item_removed.connect(lambda idx, item: items.pop(idx))
+    state.item_inserted.connect(lambda idx, item: items.insert(idx, item))
+    state.item_moved.connect(lambda old, new: items.insert(new, items.pop(old)))
+    state.item_changed.connect(lambda idx, item: items.__setitem__(idx, item))
+    return items
+
+
+def test_update_items(qtbot):
+    state = QueueState()
+    state.update_queue({"items": make_items("a", "b", "c", "d"), "running_item": {}})
+    assert len(state) == 4
+    # Make sure the signals reproduce the new queue
+    items = replay(state.items, state)
+    new_items = make_items("d", "b", "e", "a")
+    new_items[1]["name"] = "energy_scan"
+    removed = []
+    state.item_removed.connect(lambda idx, item: removed.append(item["item_uid"]))
+    with qtbot.assertNotEmitted(state.length_changed):
+        state.update_queue({"items": new_items, "running_item": {}})
+    assert removed == ["c"]
+    assert state.items == new_items
+    assert items == new_items
+
+
+def test_update_status(qtbot):
+    state = QueueState()
+    status = {
+        "manager_state": "executing_queue",
+        "items_in_history": 5,
+        "worker_environment_exists": True,
+    }
+    with qtbot.waitSignals([state.manager_state_changed,
+                            state.history_length_changed,
+                            state.environment_changed], timeout=1000):
+        state.update_status(status)
+    assert state.manager_state == "executing_queue"
+    assert state.history_length == 5
+    assert state.environment_open
+    # No signals when nothing changes
+    with qtbot.assertNotEmitted(state.manager_state_changed):
+        state.update_status(status)
@@ -0,0 +1,47 @@
+import numpy as np
+
+from firefly.ring_buffer import RingBuffer, min_max_decimate
+
+
+def test_append_wraps_around():
+    buff = RingBuffer(capacity=4)
+    nbytes = buff.nbytes
+    for idx in range(6):
+        buff.append(float(idx), idx * 10)
+    assert len(buff) == 4
+    times, values = buff.data()
+    np.testing.assert_equal(times, [2, 3, 4, 5])
+    np.testing.assert_equal(values, [20, 30, 40, 50])
+    assert buff.latest() == (5, 50)
+    # Memory doesn't grow with more points
+    assert buff.nbytes == nbytes
+
+
+def test_window():
+    buff = RingBuffer(capacity=100)
+    for idx in range(150):
+        buff.append(float(idx), idx)
+    times, values = buff.window(start=120, stop=129.5)
+    np.testing.assert_equal(times, np.arange(120, 130))
+
+
+def test_min_max_decimate():
+    times = np.arange(36000, dtype=float)
+    values = np.zeros(36000)
+    values[12345] = 5  # A spike that should survive decimation
+    values[23456] = -3
+    new_times, new_values = min_max_decimate(times, values, max_points=1000)
+    assert len(new_values) <= 1000
+    assert new_values.max() == 5
+    assert new_values.min() == -3
+    assert new_times[np.argmax(new_values)] == 12345
+    # Points stay in time order
+    assert np.all(np.diff(new_times) >= 0)
+
+
+def test_window_decimates():
+    buff = RingBuffer(capacity=36000)
+    for idx in range(36000):
+        buff.append(float(idx), np.sin(idx / 100))
+    times, values = buff.window(max_points=1000)
+    assert len(times) <= 1000
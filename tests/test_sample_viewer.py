@@ -0,0 +1,69 @@
+import numpy as np
+
+from firefly.main_window import FireflyMainWindow
+from firefly.sample_viewer import SampleViewerDisplay
+
+
+macros = {"PREFIX": "camera_ioc:"}
+
+
+def test_channels(qtbot):
+    FireflyMainWindow()
+    display = SampleViewerDisplay(macros=macros)
+    addresses = [ch.address for ch in display.channels()]
+    assert "camera_ioc:image1:ArrayData" in addresses
+    assert "camera_ioc:ROI1:BinX" in addresses
+    assert display.ui.camera_combobox.currentData() == "camera_ioc:"
+
+
+def test_roi_available(qtbot):
+    FireflyMainWindow()
+    display = SampleViewerDisplay(macros=macros)
+    assert not display.roi_available
+    display.update_roi_connection(True)
+    display.update_port("roi", "ROI1")
+    display.update_port("image_source", "CAM")
+    assert not display.roi_available
+    display.update_port("image_source", "ROI1")
+    assert display.roi_available
+    assert display.ui.roi_status_label.text() == "Available"
+
+
+def test_client_decimation(qtbot):
+    FireflyMainWindow()
+    display = SampleViewerDisplay(macros=macros)
+    data = np.arange(200 * 100, dtype=np.uint16)
+    frame, rect = display.process_frame(data, dimensions=2, sizes=[200, 100, 0], decimation=4)
+    assert frame.shape == (25, 50)
+    # The frame still covers the whole sensor
+    assert rect == (0, 0, 200, 100)
+    assert display.frames.read() is frame
+
+
+def test_stats_label(qtbot):
+    FireflyMainWindow()
+    display = SampleViewerDisplay(macros=macros)
+    frame = display.frames.write(np.zeros((10, 20), dtype=np.uint8))
+    display.show_frame((frame, (0, 0, 20, 10)))
+    assert display.frames_shown == 1
+    display.update_stats()
+    assert "fps" in display.ui.stats_label.text()
+    assert "0 frames dropped" in display.ui.stats_label.text()
+
+
+def test_hardware_roi_opt_in(qtbot):
+    """The detector's ROI plugin must not change unless the user asks."""
+    FireflyMainWindow()
+    display = SampleViewerDisplay(macros=macros)
+    display.update_roi_connection(True)
+    display.update_port("roi", "ROI1")
+    display.update_port("image_source", "ROI1")
+    display.update_sensor_size(0, 200)
+    display.update_sensor_size(1, 100)
+    display.frames_shown = 1
+    assert not display.ui.hardware_roi_checkbox.isChecked()
+    with qtbot.assertNotEmitted(display.roi_bin_changed):
+        display.update_roi()
+    display.ui.hardware_roi_checkbox.setChecked(True)
+    with qtbot.waitSignal(display.roi_bin_changed):
+        display.update_roi()
@@ -0,0 +1,64 @@
+import json
+import asyncio
+
+import pytest
+
+from firefly import tracing
+
+
+@pytest.fixture()
+def tracer():
+    tracing.clear()
+    tracing.enable()
+    yield tracing
+    tracing.disable()
+    tracing.clear()
+
+
+def test_disabled_trace():
+    tracing.clear()
+    with tracing.trace("spam"):
+        pass
+    assert tracing._events == []
+
+
+def test_trace_file(tracer, tmp_path):
+    @tracer.traced(category="eggs")
+    def cook_eggs():
+        tracer.instant("cracked")
+    with tracer.trace("breakfast", category="meals", servings=2):
+        cook_eggs()
+    # Save the events
+    fp = tmp_path / "trace.json"
+    tracer.save(fp)
+    with open(fp) as fd:
+        events = json.load(fd)["traceEvents"]
+    names = [ev["name"] for ev in events]
+    assert "thread_name" in names
+    # Check the events
+    breakfast = events[names.index("breakfast")]
+    assert breakfast["ph"] == "X"
+    assert breakfast["cat"] == "meals"
+    assert breakfast["args"] == {"servings": 2}
+    eggs = events[names.index("test_trace_file.<locals>.cook_eggs")]
+    assert eggs["cat"] == "eggs"
+    assert eggs["ts"] >= breakfast["ts"]
+    assert eggs["dur"] <= breakfast["dur"]
+    assert events[names.index("cracked")]["ph"] == "i"
+
+
+def test_trace_async(tracer):
+    @tracer.traced(category="queue")
+    async def fetch(delay):
+        await asyncio.sleep(delay)
+
+    async def main():
+        await asyncio.gather(fetch(0.02), fetch(0.01))
+
+    asyncio.run(main())
+    events = [ev for ev in tracer._events if ev["name"].endswith("fetch")]
+    # Overlapping coroutines get async begin/end pairs with their own IDs
+    assert [ev["ph"] for ev in events] == ["b", "b", "e", "e"]
+    first, second = events[0]["id"], events[1]["id"]
+    assert first != second
+    assert [ev["id"] for ev in events[2:]] == [second, first]
@@ -84,3 +84,74 @@ def test_embedded_display_widgets(qtbot, registry):
     assert len(vms_display._ion_chamber_displays) == 2
     assert vms_display.voltmeters_layout.count() == 2
     # import pdb; pdb.set_trace()
+
+
+def test_current_refresh_rate(qtbot):
+    """Test that fast voltage updates are merged into fewer redraws."""
+    window = FireflyMainWindow()
+    display = VoltmeterDisplay(macros={"IOC_VME": "40idc", "CHANNEL_NUMBER": 1})
+    display._ch_gain_value.value_slot(3)  # 10
+    display._ch_gain_unit.value_slot(2)  # µA/V
+    # Send a burst of voltages faster than the label gets redrawn
+    for voltage in [1.0, 2.0, 3.0, 4.0]:
+        display._ch_voltage.value_slot(voltage)
+    # Only the first and last voltages should be drawn
+    assert display.ui.ion_chamber_current.text() == "(0.1 µA)"
+    assert display.dropped_updates == 2
+    qtbot.waitUntil(lambda: display.ui.ion_chamber_current.text() == "(0.4 µA)", timeout=1000)
+    # The redraw timer is deleted along with the display
+    assert display._current_updater.parent() is display
+
+
+def test_current_history(qtbot):
+    """Test that drawn currents are added to the history plot."""
+    window = FireflyMainWindow()
+    display = VoltmeterDisplay(macros={"IOC_VME": "40idc", "CHANNEL_NUMBER": 1})
+    display._ch_gain_value.value_slot(3)  # 10
+    display._ch_gain_unit.value_slot(2)  # µA/V
+    display._ch_voltage.value_slot(2.0)
+    times, currents = display.history_plot.buffer.data()
+    assert len(currents) == 1
+    assert currents[0] == pytest.approx(0.2e-6)
+
+
+def test_shared_readout(qtbot, registry):
+    """Test that the voltmeters window calculates all the currents."""
+    window = FireflyMainWindow()
+    I0 = haven.IonChamber(prefix="eggs_ioc", ch_num=2, name="I0", labels={"ion_chambers"})
+    registry.register(I0)
+    It = haven.IonChamber(prefix="eggs_ioc", ch_num=3, name="It", labels={"ion_chambers"})
+    registry.register(It)
+    vms_display = VoltmetersDisplay()
+    readout = vms_display.readout
+    assert readout.names == ["I0", "It"]
+    # Fake updates from the pre-amps and scaler
+    for idx, voltage in enumerate([4.0, 2.0]):
+        readout.set_gain(idx, 3)  # 10
+        readout.set_unit(idx, 2)  # µA/V
+        readout.set_voltage(idx, voltage)
+    with qtbot.waitSignal(vms_display.ratios_changed) as blocker:
+        vms_display.update_readout()
+    assert blocker.args[0]["I0/It"] == pytest.approx(2)
+
+
+def test_shared_readout_updates_voltmeters(qtbot, registry):
+    """Test that loaded voltmeters show the currents from the shared readout."""
+    I0 = haven.IonChamber(prefix="eggs_ioc", ch_num=2, name="I0", labels={"ion_chambers"})
+    registry.register(I0)
+    vms_display = VoltmetersDisplay()
+    qtbot.addWidget(vms_display)
+    vms_display.show()
+    qtbot.waitExposed(vms_display)
+    embedded = vms_display._ion_chamber_displays[0]
+    qtbot.waitUntil(lambda: embedded.embedded_widget is not None, timeout=5000)
+    voltmeter = embedded.embedded_widget
+    readout = vms_display.readout
+    readout.set_gain(0, 3)  # 10
+    readout.set_unit(0, 2)  # µA/V
+    readout.set_voltage(0, 2.0)
+    vms_display.update_readout()
+    assert voltmeter.external_readout
+    assert voltmeter.ui.ion_chamber_current.text() == "(0.2\u2009µA)"
+    times, currents = voltmeter.history_plot.buffer.data()
+    assert currents[-1] == pytest.approx(0.2e-6)
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+import pytest
+
+from firefly.xafs_grid import (XafsRegion, energy_grid, validate_regions,
+                               scan_duration, k_to_energy, energy_to_k)
+
+
+def test_k_conversion():
+    # 10 Å⁻¹ is about 381 eV above the edge
+    assert k_to_energy(10, E0=8333) == pytest.approx(8333 + 380.998, abs=1e-2)
+    ks = np.linspace(0, 15, 50)
+    np.testing.assert_allclose(energy_to_k(k_to_energy(ks, E0=8333), E0=8333), ks)
+
+
+def test_energy_grid():
+    regions = [
+        XafsRegion(start=-200, stop=-50, step=10),
+        XafsRegion(start=-50, stop=50, step=0.5, exposure=2),
+        XafsRegion(start=float(energy_to_k(50)), stop=14, step=0.05,
+                   k_space=True, exposure=1, k_weight=2),
+    ]
+    energies, exposures = energy_grid(regions, E0=8333)
+    # Duplicated boundary points are removed
+    assert np.all(np.diff(energies) > 0)
+    assert len(energies) == 16 + 200 + regions[2].num_points() - 1
+    assert energies[0] == 8133
+    # K-weighted exposures get longer at higher k
+    last_k = regions[2].points()[-1]
+    assert exposures[-1] == pytest.approx((last_k / regions[2].start) ** 2)
+    assert scan_duration(exposures) == pytest.approx(np.sum(exposures))
+    assert scan_duration(exposures, overhead=0.1) == pytest.approx(
+        np.sum(exposures) + 0.1 * len(exposures))
+    assert validate_regions(regions, E0=8333) == []
+
+
+def test_large_grid_is_fast():
+    regions = [XafsRegion(start=0, stop=4999, step=1)]
+    t0 = time.perf_counter()
+    energies, exposures = energy_grid(regions, E0=None)
+    # Should be vectorized, so well under a second even on slow machines
+    assert time.perf_counter() - t0 < 0.5
+    assert len(energies) == 5000
+    assert len(exposures) == 5000
+
+
+def test_validate_regions():
+    # Overlapping regions
+    regions = [XafsRegion(start=-200, stop=-40, step=10),
+               XafsRegion(start=-50, stop=50, step=0.5)]
+    assert validate_regions(regions) == ["Region 2 overlaps region 1."]
+    # Gaps between regions
+    regions = [XafsRegion(start=-200, stop=-100, step=10),
+               XafsRegion(start=-50, stop=50, step=0.5)]
+    assert "Gap" in validate_regions(regions)[0]
+    # K-space needs an edge
+    regions = [XafsRegion(start=3, stop=14, step=0.05, k_space=True)]
+    assert validate_regions(regions, E0=None) == ["Region 1: k-space requires an edge (E0)."]
+    # Bad steps
+    assert validate_regions([XafsRegion(start=0, stop=10, step=0)]) == ["Region 1: step must be positive."]
@@ -45,3 +45,29 @@ def test_E0_checkbox(qtbot):
     disp.ui.use_edge_checkbox.setChecked(False)
     disp.regions[0].k_space_checkbox.setChecked(False)
     assert not disp.regions[0].k_space_checkbox.isChecked()
+
+
+def test_energy_points(qtbot):
+    """Does typing in the regions update the scan's energies?"""
+    window = FireflyMainWindow()
+    qtbot.addWidget(window)
+    disp = XafsScanDisplay()
+    qtbot.addWidget(disp)
+    # Empty regions should not allow a scan
+    assert disp.energies is None
+    assert not disp.ui.run_scan_button.isEnabled()
+    # Fill in a region
+    region = disp.regions[0]
+    qtbot.keyClicks(region.start_line_edit, "8300")
+    qtbot.keyClicks(region.stop_line_edit, "8400")
+    qtbot.keyClicks(region.step_line_edit, "0.5")
+    assert len(disp.energies) == 201
+    assert disp.ui.run_scan_button.isEnabled()
+    # Overlapping regions are not allowed
+    region = disp.regions[1]
+    qtbot.keyClicks(region.start_line_edit, "8350")
+    qtbot.keyClicks(region.stop_line_edit, "8500")
+    qtbot.keyClicks(region.step_line_edit, "1")
+    assert disp.energies is None
+    assert "overlaps" in disp.ui.scan_summary_label.text()
+    assert not disp.ui.run_scan_button.isEnabled()
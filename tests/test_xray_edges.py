@@ -0,0 +1,37 @@
+import numpy as np
+
+from firefly import xray_edges
+from firefly.xray_edges import EdgeIndex, load_edge_index, _load_edges, xraydb_version
+
+
+def test_edge_cache(tmp_path):
+    edges = _load_edges(cache_dir=tmp_path)
+    # Check that the cache file was written
+    cache_file = tmp_path / f"xray_edges-{xraydb_version()}.npy"
+    assert cache_file.exists()
+    # Check that the cached edges get loaded
+    cached = _load_edges(cache_dir=tmp_path)
+    np.testing.assert_array_equal(cached, edges)
+
+
+def test_edge_index(tmp_path, monkeypatch):
+    # Start with a fresh index, cached in a temporary directory
+    monkeypatch.setattr(xray_edges, "_edge_index", None)
+    index = load_edge_index(cache_dir=tmp_path)
+    assert (tmp_path / f"xray_edges-{xraydb_version()}.npy").exists()
+    assert load_edge_index() is index
+    # Lookup by name
+    ni_k = index.find("Ni", "K")
+    assert int(ni_k["energy"]) == 8333
+    assert index.find("Ni", "Q5") is None
+    # Lookup by energy
+    assert index.nearest(8340)["element"] == "Ni"
+    assert all(8000 <= e["energy"] <= 9000 for e in index.between(8000, 9000))
+    # Filtering and labels
+    filtered = index.filter(4000, 27000)
+    assert isinstance(filtered, EdgeIndex)
+    assert filtered.labels()[0] == "Ca K (4038 eV)"
+    filtered_ni_k = filtered.find("Ni", "K")
+    assert filtered_ni_k is not None
+    assert filtered_ni_k["energy"] == ni_k["energy"]
+    assert filtered.find("Ti", "L3") is None